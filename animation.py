@@ -0,0 +1,134 @@
+import collections
+
+from PyQt5 import QtCore
+
+class AAAnimationScheduler(QtCore.QObject):
+
+    # Emitted after each frame with the list of indices of the cells
+    # whose state changed during the frame.
+    frameApplied = QtCore.pyqtSignal( object )
+
+    # Frames per second to apply the queued states at.
+    # type: int
+    FPS_INT = 60
+
+    # Amount of states applied per frame for each speed,
+    # 0 applies everything queued in a single frame.
+    # type: tuple(int)
+    SPEEDS = ( 1 , 4 , 16 , 64 , 256 , 0 )
+
+    # Index in SPEEDS to start with.
+    # type: int
+    DEFAULT_SPEED_INDEX = 2
+
+    def __init__( self          ,
+                  inGrid        ,
+                  parent = None ):
+        '''
+        Apply queued node states to a grid with a delay, in batches
+        of one frame, to display the progress of a search.
+
+        Args:
+            inGrid (grid.AAGrid): Grid to apply the states to.
+
+            parent (QtCore.QObject|None): Parent of the scheduler.
+        '''
+        super( AAAnimationScheduler , self ).__init__( parent )
+
+        self.grid = inGrid
+
+        # Index in SPEEDS of the current speed.
+        # type: int
+        self.speedIndex = self.DEFAULT_SPEED_INDEX
+
+        # Cell indices and states waiting to be applied.
+        # type: collections.deque[tuple(int, int)]
+        self.pendingStates = collections.deque()
+
+        self.timer = QtCore.QTimer( self )
+        self.timer.setInterval( int( 1000 / self.FPS_INT ) )
+        self.timer.timeout.connect( self.applyFrame )
+
+    @property
+    def statesPerFrameInt( self ):
+        '''
+        Gets the amount of states applied per frame.
+
+        Returns:
+            int: states per frame, 0 if applying all of them at once.
+        '''
+        return self.SPEEDS[ self.speedIndex ]
+
+    def changeSpeed( self          ,
+                     inStepInt     ):
+        '''
+        Move to a faster or slower speed from SPEEDS.
+
+        Args:
+            inStepInt (int): Amount of speeds to move, positive is faster.
+
+        Returns:
+            int: states per frame of the new speed.
+        '''
+        self.speedIndex = max( 0 , min( len( self.SPEEDS ) - 1 , self.speedIndex + inStepInt ) )
+
+        return self.statesPerFrameInt
+
+    def schedule( self      ,
+                  inIndices ,
+                  inState   ):
+        '''
+        Queue a state to apply to cells and start applying them.
+
+        Args:
+            inIndices (list[int]): Indices of the cells.
+
+            inState (int): State to apply, one of the model *_STATE values.
+
+        Returns:
+            None: No return value.
+        '''
+        self.pendingStates.extend( ( nodeIndex , inState ) for nodeIndex in inIndices )
+
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def clear( self ):
+        '''
+        Drop the queued states and stop applying them.
+
+        Returns:
+            None: No return value.
+        '''
+        self.pendingStates.clear()
+        self.timer.stop()
+
+    def isPlaying( self ):
+        '''
+        Check if there are queued states left to apply.
+
+        Returns:
+            bool: True if states are waiting to be applied, False otherwise.
+        '''
+        return bool( self.pendingStates )
+
+    def applyFrame( self ):
+        '''
+        Apply the queued states of one frame.
+        It will stop after the queue is empty.
+
+        Returns:
+            None: No return value.
+        '''
+        pendingStates = self.pendingStates
+
+        if not pendingStates:
+            self.timer.stop()
+            return
+
+        statesCount = self.statesPerFrameInt or len( pendingStates )
+
+        frameStates = [ pendingStates.popleft()
+                        for _ in range( min( statesCount , len( pendingStates ) ) ) ]
+
+        self.frameApplied.emit( self.grid.applyStates( frameStates ) )
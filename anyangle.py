@@ -0,0 +1,322 @@
+import heapq
+import itertools
+import math
+import time
+
+import instrumentation
+import model
+import search
+
+class AAThetaStarSearch(search.AAAStarSearch):
+
+    # Name displayed when choosing the search algorithm.
+    # type: str
+    NAME = 'Theta*'
+
+    # Line of sight tests read cells that are not reported as explored.
+    # type: bool
+    LOCAL_READS_BOOL = False
+
+    # Assume every reached cell is in line of sight of the parent of the
+    # cell it was reached from and only check it once expanded.
+    # type: bool
+    LAZY_BOOL = False
+
+    def __init__( self    ,
+                  inModel ):
+        '''
+        Theta* search algorithm, an A* search whose cells take the parent
+        of the cell they are reached from as their own parent when it is
+        in line of sight, so paths are made of straight segments at any
+        angle instead of 8 directions.
+
+        Note:
+            Costs are the euclidean length of the segments times
+            model.AAGridModel.STRAIGHT_COST_INT, diagonal steps included,
+            so they are slightly higher than the grid costs. Segments
+            assume every cell costs the same, on grids with terrain
+            costs the search falls back to A*.
+
+        Args:
+            inModel (model.AAGridModel): Grid model to find paths on.
+        '''
+        super( AAThetaStarSearch , self ).__init__( inModel )
+
+        # Amount of line of sight tests of the last search.
+        # type: int
+        self.lineOfSightChecksInt = 0
+
+    def hasLineOfSight( self        ,
+                        inFromIndex ,
+                        inToIndex   ):
+        '''
+        Check if no wall is crossed by the segment between the centers
+        of two cells, walking model.AAGridModel.iterateLineIndices and
+        stopping at the first wall.
+
+        Args:
+            inFromIndex (int): Index of the cell the segment starts at.
+
+            inToIndex (int): Index of the cell the segment ends at.
+
+        Returns:
+            bool: True if every crossed cell can be moved to, False otherwise.
+        '''
+        self.lineOfSightChecksInt += 1
+
+        states    = self.model.states
+        lineCells = self.model.iterateLineIndices( inFromIndex , inToIndex )
+
+        # The start cell is the one being searched from, never a wall.
+        next( lineCells )
+
+        for cellIndex in lineCells:
+
+            if states[ cellIndex ] == model.WALL_STATE:
+                return False
+
+        return True
+
+    def getSegmentCost( self        ,
+                        inFromIndex ,
+                        inToIndex   ):
+        '''
+        Get the cost of moving in a straight line between two cells.
+
+        Args:
+            inFromIndex (int): Index of the cell the segment starts at.
+
+            inToIndex (int): Index of the cell the segment ends at.
+
+        Returns:
+            float: euclidean length of the segment times STRAIGHT_COST_INT.
+        '''
+        fromRow , fromColumn = divmod( inFromIndex , self.model.columnsInt )
+        toRow , toColumn     = divmod( inToIndex , self.model.columnsInt )
+
+        return self.model.STRAIGHT_COST_INT * math.hypot( toColumn - fromColumn ,
+                                                          toRow - fromRow       )
+
+    def findPath( self                      ,
+                  inStartIndex              ,
+                  inEndIndex                ,
+                  inExploredCallback = None ):
+        '''
+        Reimplementation of findPath, finds a path of straight segments
+        between the start and end cell.
+
+        Note:
+            Theta* tests the line of sight from the parent of the
+            expanded cell to each neighbour it reaches. With LAZY_BOOL
+            neighbours take that parent without a test and the test is
+            done once per expanded cell, falling back to its best closed
+            neighbour when it fails, so far less tests are done.
+            The corners of the segments are kept as
+            search.AASearchResult.waypointIndices and the path is the
+            cells crossed by the segments, see
+            model.AAGridModel.getLineIndices.
+
+        Args:
+            inStartIndex (int): Index of the cell to start from.
+
+            inEndIndex (int): Index of the cell to reach.
+
+            inExploredCallback (callable|None): Called with the indices
+                                                explored by each expansion
+                                                as soon as they are known.
+
+        Returns:
+            search.AASearchResult: Found path and explored cells.
+        '''
+        if self.model.weightedCellsInt:
+            return super( AAThetaStarSearch , self ).findPath( inStartIndex       ,
+                                                               inEndIndex         ,
+                                                               inExploredCallback )
+
+        self.lineOfSightChecksInt = 0
+
+        result = search.AASearchResult()
+
+        aaModel = self.model
+
+        states = aaModel.states
+
+        getSegmentCost = self.getSegmentCost
+        hasLineOfSight = self.hasLineOfSight
+        lazyBool       = self.LAZY_BOOL
+
+        searchInstrumentation = self.instrumentation
+
+        # Cost from the start to each reached cell.
+        # type: dict[int, float]
+        gCosts = { inStartIndex : 0.0 }
+
+        # Cell each reached cell was reached from in a straight line,
+        # model.NO_PARENT for the start.
+        # type: dict[int, int]
+        parentIndices = { inStartIndex : model.NO_PARENT }
+
+        closedIndices = set()
+
+        startHCost = getSegmentCost( inStartIndex ,
+                                     inEndIndex   )
+
+        if searchInstrumentation:
+            searchInstrumentation.countHeuristic()
+
+        insertionCount = itertools.count()
+
+        openHeap = [ ( startHCost             ,
+                       startHCost             ,
+                       next( insertionCount ) ,
+                       inStartIndex           ) ]
+
+        while openHeap:
+
+            if self.cancelledBool:
+                result.cancelledBool = True
+                return result
+
+            fCost , hCost , _ , currentIndex = heapq.heappop( openHeap )
+
+            if currentIndex in closedIndices:
+                continue
+
+            # Outdated entry, the cell was pushed again with a lower cost.
+            if fCost != gCosts[ currentIndex ] + hCost:
+                continue
+
+            closedIndices.add( currentIndex )
+
+            result.expandedNodesInt += 1
+
+            if searchInstrumentation:
+                searchInstrumentation.expand( currentIndex        ,
+                                              len( openHeap ) + 1 )
+
+            parentIndex = parentIndices[ currentIndex ]
+
+            if lazyBool and parentIndex != model.NO_PARENT and not hasLineOfSight( parentIndex  ,
+                                                                                   currentIndex ):
+
+                # Some closed neighbour reached the cell first, so there is one.
+                gCosts[ currentIndex ] , parentIndices[ currentIndex ] = min( ( gCosts[ neighbourIndex ] + getSegmentCost( neighbourIndex ,
+                                                                                                                           currentIndex   ) ,
+                                                                                neighbourIndex                                             )
+                                                                              for neighbourIndex in aaModel.getNeighbours( currentIndex )
+                                                                              if neighbourIndex in closedIndices                          )
+
+            if currentIndex == inEndIndex:
+
+                result.waypointIndices = self.retracePath( parentIndices ,
+                                                           inEndIndex    )
+                result.pathIndices     = self.getPathIndices( result.waypointIndices )
+                return result
+
+            exploredIndices = []
+
+            currentCost = gCosts[ currentIndex ]
+            parentIndex = parentIndices[ currentIndex ]
+
+            if parentIndex == model.NO_PARENT:
+                parentIndex = currentIndex
+
+            parentCost = gCosts[ parentIndex ]
+
+            for neighbourIndex in aaModel.getNeighbours( currentIndex ):
+
+                if states[ neighbourIndex ] == model.WALL_STATE:
+                    continue
+
+                exploredIndices.append( neighbourIndex )
+
+                if neighbourIndex in closedIndices:
+                    continue
+
+                if parentIndex != currentIndex and ( lazyBool or hasLineOfSight( parentIndex    ,
+                                                                                 neighbourIndex ) ):
+                    newParentIndex     = parentIndex
+                    newCostToNeighbour = parentCost + getSegmentCost( parentIndex    ,
+                                                                      neighbourIndex )
+                else:
+                    newParentIndex     = currentIndex
+                    newCostToNeighbour = currentCost + getSegmentCost( currentIndex   ,
+                                                                       neighbourIndex )
+
+                neighbourCost = gCosts.get( neighbourIndex )
+
+                if neighbourCost is None or newCostToNeighbour < neighbourCost:
+
+                    neighbourHCost = getSegmentCost( neighbourIndex ,
+                                                     inEndIndex     )
+
+                    if searchInstrumentation:
+                        searchInstrumentation.relax( currentIndex              ,
+                                                     neighbourIndex            ,
+                                                     newCostToNeighbour        ,
+                                                     neighbourCost is not None )
+                        searchInstrumentation.countHeuristic()
+
+                    gCosts[ neighbourIndex ]        = newCostToNeighbour
+                    parentIndices[ neighbourIndex ] = newParentIndex
+
+                    heapq.heappush( openHeap , ( newCostToNeighbour + neighbourHCost ,
+                                                 neighbourHCost                      ,
+                                                 next( insertionCount )              ,
+                                                 neighbourIndex                      ) )
+
+            result.exploredIndices.append( exploredIndices )
+
+            if inExploredCallback:
+                inExploredCallback( exploredIndices )
+
+        return result
+
+    def getPathIndices( self              ,
+                        inWaypointIndices ):
+        '''
+        Get the cells crossed by the segments between waypoints.
+
+        Args:
+            inWaypointIndices (list[int]): Indices of the corners of the
+                                           path from start to end.
+
+        Returns:
+            list[int]: Indices of the cells from start to end.
+        '''
+        startTime = time.time()
+
+        pathIndices = inWaypointIndices[ : 1 ]
+
+        for fromIndex , toIndex in zip( inWaypointIndices , inWaypointIndices[ 1 : ] ):
+            pathIndices.extend( self.model.getLineIndices( fromIndex ,
+                                                           toIndex   )[ 1 : ] )
+
+        if self.instrumentation:
+            self.instrumentation.addPhaseSeconds( instrumentation.RETRACE_PHASE ,
+                                                  time.time() - startTime       )
+
+        return pathIndices
+
+class AALazyThetaStarSearch(AAThetaStarSearch):
+
+    # Name displayed when choosing the search algorithm.
+    # type: str
+    NAME = 'Lazy Theta*'
+
+    # Assume every reached cell is in line of sight of the parent of the
+    # cell it was reached from and only check it once expanded.
+    # type: bool
+    LAZY_BOOL = True
+
+    def __init__( self    ,
+                  inModel ):
+        '''
+        Lazy Theta* search algorithm, a Theta* search testing the line
+        of sight once per expanded cell instead of once per reached
+        neighbour.
+
+        Args:
+            inModel (model.AAGridModel): Grid model to find paths on.
+        '''
+        super( AALazyThetaStarSearch , self ).__init__( inModel )
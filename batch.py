@@ -0,0 +1,230 @@
+import array
+import multiprocessing
+import multiprocessing.sharedctypes
+import time
+
+import components
+import model
+import search
+
+# Model, component labels and search of the current pool process,
+# set by initializeWorker.
+# type: dict[str, object]
+WORKER_MAPPING = {}
+
+# Queries sent to a pool process at once, when not given.
+# type: int
+DEFAULT_CHUNK_SIZE_INT = 64
+
+class AAQueryResult(object):
+
+    def __init__( self         ,
+                  inStartIndex ,
+                  inEndIndex   ):
+        '''
+        Path and statistics of one query of a batch.
+
+        Args:
+            inStartIndex (int): Index of the cell the query starts from.
+
+            inEndIndex (int): Index of the cell the query goes to.
+        '''
+        self.startIndex = inStartIndex
+        self.endIndex   = inEndIndex
+
+        # Indices of the cells of the path from start to end,
+        # empty if there is no path.
+        # type: list[int]
+        self.pathIndices = []
+
+        # Cost of the path, 0 if there is no path.
+        # type: int
+        self.pathCostInt = 0
+
+        # Amount of cells taken out of the open set during the search.
+        # type: int
+        self.expandedNodesInt = 0
+
+        # Seconds spent on the query, including the reachability check.
+        # type: float
+        self.secondsFloat = 0.0
+
+    @property
+    def foundBool( self ):
+        '''
+        Check if a path was found.
+
+        Returns:
+            bool: True if a path was found, False otherwise.
+        '''
+        return bool( self.pathIndices )
+
+def initializeWorker( inSharedStates ,
+                      inSharedCosts  ,
+                      inColumnsInt   ,
+                      inRowsInt      ,
+                      inSearchClass  ):
+    '''
+    Build the model of a pool process from the shared states and
+    costs, once per process instead of once per query.
+
+    Args:
+        inSharedStates (multiprocessing.sharedctypes.RawArray): States
+                                                                of the
+                                                                cells.
+
+        inSharedCosts (multiprocessing.sharedctypes.RawArray): Terrain
+                                                               costs of
+                                                               the cells.
+
+        inColumnsInt (int): Amount of cells in X axis.
+
+        inRowsInt (int): Amount of cells in Y axis.
+
+        inSearchClass (type): Search algorithm to run,
+                              see pathfinding.SEARCH_CLASSES.
+
+    Returns:
+        None: No return value.
+    '''
+    aaModel = model.AAGridModel( inColumnsInt ,
+                                 inRowsInt    )
+
+    aaModel.states = array.array( 'B' , bytearray( inSharedStates ) )
+    aaModel.setCosts( inSharedCosts )
+
+    WORKER_MAPPING[ 'model' ]      = aaModel
+    WORKER_MAPPING[ 'components' ] = components.AAComponentLabels( aaModel )
+    WORKER_MAPPING[ 'search' ]     = inSearchClass( aaModel )
+
+def runQueries( inQueries ):
+    '''
+    Solve queries in the current pool process.
+
+    Note:
+        Queries are expected sorted by end cell, the heuristic of each
+        end cell is computed once and kept while the end cell repeats.
+
+    Args:
+        inQueries (list[tuple(int, int, int)]): Position in the batch,
+                                                start and end cell indices
+                                                of each query.
+
+    Returns:
+        list[tuple(int, AAQueryResult)]: Position in the batch and result
+                                         of each query.
+    '''
+    aaModel    = WORKER_MAPPING[ 'model' ]
+    labels     = WORKER_MAPPING[ 'components' ]
+    pathSearch = WORKER_MAPPING[ 'search' ]
+
+    results = []
+
+    for position , startIndex , endIndex in inQueries:
+
+        if aaModel.goalIndices != [ endIndex ]:
+            aaModel.setGoalIndices( [ endIndex ] )
+
+        result = AAQueryResult( startIndex ,
+                                endIndex   )
+
+        startTime = time.time()
+
+        if labels.isConnected( startIndex ,
+                               endIndex   ):
+
+            searchResult = pathSearch.findPath( startIndex ,
+                                                endIndex   )
+
+            result.pathIndices      = searchResult.pathIndices
+            result.expandedNodesInt = searchResult.expandedNodesInt
+
+        result.secondsFloat = time.time() - startTime
+
+        result.pathCostInt = aaModel.getPathCost( result.pathIndices )
+
+        results.append( ( position , result ) )
+
+    return results
+
+def findPaths( inModel                                 ,
+               inQueries                               ,
+               inSearchClass  = search.AAAStarSearch   ,
+               inProcessesInt = None                   ,
+               inChunkSizeInt = DEFAULT_CHUNK_SIZE_INT ):
+    '''
+    Solve many queries on the same grid at once, across a pool of
+    processes sharing the states and costs of the cells.
+
+    Note:
+        The states and costs are copied once into shared memory and
+        each process builds its model from them when it starts, so
+        queries only send their cell indices. Queries are grouped by end
+        cell so each process computes the heuristic of an end cell once.
+        Walls or costs changed after the call starts are not seen by
+        the queries.
+        On platforms spawning processes call it under
+        if __name__ == "__main__".
+
+    Args:
+        inModel (model.AAGridModel): Grid model to find paths on,
+                                     grid.AAGrid.model for a grid.
+
+        inQueries (list[tuple(int, int)]): Start and end cell indices
+                                           of each query.
+
+        inSearchClass (type): Search algorithm to run,
+                              see pathfinding.SEARCH_CLASSES.
+
+        inProcessesInt (int|None): Amount of processes, None for one per
+                                   CPU, 1 to solve the queries in the
+                                   calling process.
+
+        inChunkSizeInt (int): Queries sent to a process at once.
+
+    Returns:
+        list[AAQueryResult]: Result of each query, in query order.
+    '''
+    sharedStates = multiprocessing.sharedctypes.RawArray( 'B'                      ,
+                                                          inModel.states.tobytes() )
+    sharedCosts  = multiprocessing.sharedctypes.RawArray( 'B'                      ,
+                                                          inModel.costs.tobytes()  )
+
+    initArgs = ( sharedStates       ,
+                 sharedCosts        ,
+                 inModel.columnsInt ,
+                 inModel.rowsInt    ,
+                 inSearchClass      )
+
+    sortedQueries = sorted( ( ( position , startIndex , endIndex )
+                              for position , ( startIndex , endIndex ) in enumerate( inQueries ) ) ,
+                            key = lambda query : query[ 2 ]                                         )
+
+    chunks = [ sortedQueries[ chunkStart : chunkStart + inChunkSizeInt ]
+               for chunkStart in range( 0 , len( sortedQueries ) , inChunkSizeInt ) ]
+
+    results = [ None ] * len( sortedQueries )
+
+    if inProcessesInt == 1:
+
+        initializeWorker( *initArgs )
+
+        chunkResults = [ runQueries( chunk ) for chunk in chunks ]
+
+    else:
+
+        pool = multiprocessing.Pool( inProcessesInt   ,
+                                     initializeWorker ,
+                                     initArgs         )
+
+        try:
+            chunkResults = pool.map( runQueries , chunks )
+        finally:
+            pool.close()
+            pool.join()
+
+    for chunkResult in chunkResults:
+        for position , result in chunkResult:
+            results[ position ] = result
+
+    return results
@@ -0,0 +1,407 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+import generators
+import grid
+import instrumentation
+import mapio
+import pathfinding
+
+# Amount of cells per side of the square grids to benchmark.
+# type: tuple(int)
+GRID_SIDES = ( 64 , 128 , 256 )
+
+# Names of the generated maps to benchmark, random-N has N percent of
+# walls, see createScenarioModel.
+# type: tuple(str)
+SCENARIOS = ( 'open'      ,
+              'random-10' ,
+              'random-25' ,
+              'random-40' ,
+              'maze'      ,
+              'division'  ,
+              'rooms'     ,
+              'caves'     )
+
+# Seed of the generated maps, the same seed gives the same maps.
+# type: int
+DEFAULT_SEED_INT = 0
+
+# Times each search is timed, the fastest time is reported.
+# type: int
+DEFAULT_REPEATS_INT = 3
+
+# Version of the layout of the results written by writeResults,
+# or of the maps generated from the same seed.
+# type: int
+RESULTS_VERSION_INT = 2
+
+def createScenarioModel( inScenarioStr ,
+                         inSideInt     ,
+                         inSeedInt     ):
+    '''
+    Create the map of a scenario with its goals placed,
+    see generators.generateModel.
+
+    Args:
+        inScenarioStr (str): Name of the scenario, one of SCENARIOS.
+
+        inSideInt (int): Amount of cells per side.
+
+        inSeedInt (int): Seed of the random scenarios.
+
+    Raises:
+        ValueError: Unknown scenario name.
+
+    Returns:
+        model.AAGridModel: created model.
+    '''
+    generatorStr = inScenarioStr
+    densityFloat = generators.DEFAULT_DENSITY_FLOAT
+
+    if inScenarioStr.startswith( 'random-' ):
+        generatorStr = 'random'
+        densityFloat = int( inScenarioStr.split( '-' )[ 1 ] ) / 100.0
+
+    if generatorStr not in generators.GENERATORS:
+        raise ValueError( 'Unknown scenario: {0}'.format( inScenarioStr ) )
+
+    return generators.generateModel( generatorStr              ,
+                                     inSideInt                 ,
+                                     inSideInt                 ,
+                                     inSeedInt                 ,
+                                     densityFloat              ,
+                                     grid.AAGrid.NODE_SIZE_INT )
+
+def runPathFinder( inModel                  ,
+                   inSearchClass            ,
+                   inInstrumentation = None ):
+    '''
+    Run a path finder without view on a fresh grid of a model.
+
+    Args:
+        inModel (model.AAGridModel): Grid model to find a path on.
+
+        inSearchClass (type): Search algorithm to run,
+                              one of pathfinding.SEARCH_CLASSES.
+
+        inInstrumentation (instrumentation.AASearchInstrumentation|None):
+            Counters to fill, None to run without them.
+
+    Returns:
+        tuple(pathfinding.AAPathFinder, float): finished path finder
+                                                and seconds it took.
+    '''
+    aaGrid = grid.AAGrid( inModel = inModel )
+    aaGrid.reset()
+    aaGrid.components.build()
+
+    pathSearch = inSearchClass( inModel )
+
+    startTime = time.time()
+    pathFinder = pathfinding.AAPathFinder( aaGrid            ,
+                                           None              ,
+                                           pathSearch        ,
+                                           inInstrumentation )
+    elapsedTime = time.time() - startTime
+
+    return pathFinder , elapsedTime
+
+def benchmarkModel( inModel                           ,
+                    inScenarioStr                     ,
+                    inSearchClasses = None            ,
+                    inRepeatsInt    = DEFAULT_REPEATS_INT ):
+    '''
+    Find the path between the goals of a model with each search.
+
+    Note:
+        Each run starts with a new grid and search, so searches
+        caching state between runs are measured cold. Peak memory and
+        the counters of instrumentation.AASearchInstrumentation are
+        measured on a separate run, as both slow it down. Peak memory
+        is None without tracemalloc.
+
+    Args:
+        inModel (model.AAGridModel): Grid model with two goals.
+
+        inScenarioStr (str): Name of the scenario to report.
+
+        inSearchClasses (tuple(type)|None): Searches to run,
+                                            None for every one of
+                                            pathfinding.SEARCH_CLASSES.
+
+        inRepeatsInt (int): Times each search is timed.
+
+    Returns:
+        list[dict]: Measures of each search.
+    '''
+    results = []
+
+    for searchClass in inSearchClasses or pathfinding.SEARCH_CLASSES:
+
+        peakMemoryBytes = None
+
+        searchInstrumentation = instrumentation.AASearchInstrumentation()
+
+        if tracemalloc:
+            tracemalloc.start()
+
+        runPathFinder( inModel               ,
+                       searchClass           ,
+                       searchInstrumentation )
+
+        if tracemalloc:
+            peakMemoryBytes = tracemalloc.get_traced_memory()[ 1 ]
+            tracemalloc.stop()
+
+        timings = [ runPathFinder( inModel     ,
+                                   searchClass ) for _ in range( max( inRepeatsInt , 1 ) ) ]
+
+        pathFinder = timings[ -1 ][ 0 ]
+
+        results.append( { 'scenario'        : inScenarioStr                                  ,
+                          'columns'         : inModel.columnsInt                             ,
+                          'rows'            : inModel.rowsInt                                ,
+                          'engine'          : searchClass.NAME                               ,
+                          'found'           : bool( pathFinder.pathIndices )                 ,
+                          'expandedNodes'   : pathFinder.expandedNodesInt                    ,
+                          'relaxedEdges'    : searchInstrumentation.relaxedEdgesInt          ,
+                          'openPeak'        : searchInstrumentation.openPeakInt              ,
+                          'heuristicCalls'  : searchInstrumentation.heuristicCallsInt        ,
+                          'reopenedNodes'   : searchInstrumentation.reopenedNodesInt         ,
+                          'seconds'         : min( timing[ 1 ] for timing in timings )       ,
+                          'peakMemoryBytes' : peakMemoryBytes                                ,
+                          'pathCost'        : inModel.getPathCost( pathFinder.pathIndices )  ,
+                          'pathLength'      : len( pathFinder.pathIndices )                  } )
+
+    return results
+
+def runBenchmark( inGridSides     = GRID_SIDES          ,
+                  inScenarios     = SCENARIOS           ,
+                  inSearchClasses = None                ,
+                  inSeedInt       = DEFAULT_SEED_INT    ,
+                  inRepeatsInt    = DEFAULT_REPEATS_INT ,
+                  inMapPaths      = ()                  ,
+                  inVerboseBool   = True                ):
+    '''
+    Benchmark the searches on the generated scenarios at each size
+    and on map files.
+
+    Args:
+        inGridSides (tuple(int)): Amount of cells per side of each
+                                  generated map.
+
+        inScenarios (tuple(str)): Scenarios to generate, see SCENARIOS.
+
+        inSearchClasses (tuple(type)|None): Searches to run,
+                                            None for every one of
+                                            pathfinding.SEARCH_CLASSES.
+
+        inSeedInt (int): Seed of the random scenarios.
+
+        inRepeatsInt (int): Times each search is timed.
+
+        inMapPaths (tuple(str)): Grid files or MovingAI maps to benchmark
+                                 too, see mapio.loadMap. Maps without two
+                                 goals get them with
+                                 generators.placeGoals.
+
+        inVerboseBool (bool): Print a line per measure while running.
+
+    Returns:
+        list[dict]: Measures of each search on each map.
+    '''
+    results = []
+
+    if inVerboseBool:
+        print( formatResult( None ) )
+
+    for scenarioStr , aaModel in iterateScenarioModels( inGridSides ,
+                                                        inScenarios ,
+                                                        inSeedInt   ,
+                                                        inMapPaths  ):
+
+        for result in benchmarkModel( aaModel         ,
+                                      scenarioStr     ,
+                                      inSearchClasses ,
+                                      inRepeatsInt    ):
+
+            results.append( result )
+
+            if inVerboseBool:
+                print( formatResult( result ) )
+
+    return results
+
+def iterateScenarioModels( inGridSides ,
+                           inScenarios ,
+                           inSeedInt   ,
+                           inMapPaths  ):
+    '''
+    Create the maps to benchmark one at a time, so only one is in
+    memory at once.
+
+    Args:
+        inGridSides (tuple(int)): Amount of cells per side of each
+                                  generated map.
+
+        inScenarios (tuple(str)): Scenarios to generate, see SCENARIOS.
+
+        inSeedInt (int): Seed of the random scenarios.
+
+        inMapPaths (tuple(str)): Grid files or MovingAI maps to read.
+
+    Yields:
+        tuple(str, model.AAGridModel): name of the scenario and its map.
+    '''
+    for scenarioStr in inScenarios:
+        for sideInt in inGridSides:
+            yield ( scenarioStr                       ,
+                    createScenarioModel( scenarioStr ,
+                                         sideInt     ,
+                                         inSeedInt   ) )
+
+    for mapPathStr in inMapPaths:
+        yield ( os.path.basename( mapPathStr ) ,
+                loadScenarioMap( mapPathStr )  )
+
+def loadScenarioMap( inMapPathStr ):
+    '''
+    Read a map file to benchmark, placing its goals if it has none.
+
+    Args:
+        inMapPathStr (str): Grid file or MovingAI map, see mapio.loadMap.
+
+    Returns:
+        model.AAGridModel: read model.
+    '''
+    aaModel = mapio.loadMap( inMapPathStr              ,
+                             grid.AAGrid.NODE_SIZE_INT )
+
+    if len( aaModel.goalIndices ) != 2:
+        generators.placeGoals( aaModel )
+
+    return aaModel
+
+def formatResult( inResult ):
+    '''
+    Format a measure as a line of a table.
+
+    Args:
+        inResult (dict|None): Measure of benchmarkModel,
+                              None for the table header.
+
+    Returns:
+        str: formatted line.
+    '''
+    if inResult is None:
+        return '{0:<14} {1:>11} {2:<16} {3:>10} {4:>10} {5:>12} {6:>10}'.format( 'scenario'  ,
+                                                                               'size'      ,
+                                                                               'engine'    ,
+                                                                               'expanded'  ,
+                                                                               'seconds'   ,
+                                                                               'peak KiB'  ,
+                                                                               'cost'      )
+
+    peakMemoryStr = '-' if inResult[ 'peakMemoryBytes' ] is None else str( inResult[ 'peakMemoryBytes' ] // 1024 )
+
+    return '{0:<14} {1:>11} {2:<16} {3:>10} {4:>10.4f} {5:>12} {6:>10}'.format( inResult[ 'scenario' ][ : 14 ]                                    ,
+                                                                              '{0}x{1}'.format( inResult[ 'columns' ] , inResult[ 'rows' ] ) ,
+                                                                              inResult[ 'engine' ]                                          ,
+                                                                              inResult[ 'expandedNodes' ]                                   ,
+                                                                              inResult[ 'seconds' ]                                         ,
+                                                                              peakMemoryStr                                                 ,
+                                                                              inResult[ 'pathCost' ] if inResult[ 'found' ] else '-'        )
+
+def writeResults( inResults    ,
+                  inOutputFile ,
+                  inSeedInt    ):
+    '''
+    Write measures as JSON, with the versions they were taken with,
+    to compare them with other runs.
+
+    Args:
+        inResults (list[dict]): Measures of runBenchmark.
+
+        inOutputFile (file): Opened text file to write to.
+
+        inSeedInt (int): Seed the scenarios were generated with.
+
+    Returns:
+        None: No return value.
+    '''
+    json.dump( { 'version'  : RESULTS_VERSION_INT         ,
+                 'time'     : time.time()                 ,
+                 'python'   : platform.python_version()   ,
+                 'platform' : platform.platform()         ,
+                 'seed'     : inSeedInt                   ,
+                 'results'  : inResults                   } ,
+               inOutputFile                                 ,
+               indent    = 1                                ,
+               sort_keys = True                             )
+
+    inOutputFile.write( '\n' )
+
+def main( inArgs = None ):
+    '''
+    Run the benchmark from the command line.
+
+    Args:
+        inArgs (list[str]|None): Command line arguments, None for sys.argv.
+
+    Returns:
+        list[dict]: Measures of runBenchmark.
+    '''
+    engineNames = [ searchClass.NAME for searchClass in pathfinding.SEARCH_CLASSES ]
+
+    parser = argparse.ArgumentParser( description = 'Benchmark the searches on generated and loaded maps.' )
+    parser.add_argument( '--sizes'     , type = int , nargs = '+' , default = list( GRID_SIDES ) ,
+                         help = 'cells per side of the generated maps' )
+    parser.add_argument( '--scenarios' , nargs = '*' , default = list( SCENARIOS ) ,
+                         help = 'generated maps, any of {0} or random-N'.format( ', '.join( SCENARIOS ) ) )
+    parser.add_argument( '--engines'   , nargs = '+' , choices = engineNames , default = engineNames ,
+                         help = 'searches to run' )
+    parser.add_argument( '--maps'      , nargs = '+' , default = [] ,
+                         help = 'grid files or MovingAI maps to benchmark too' )
+    parser.add_argument( '--seed'      , type = int , default = DEFAULT_SEED_INT )
+    parser.add_argument( '--repeats'   , type = int , default = DEFAULT_REPEATS_INT )
+    parser.add_argument( '--output'    ,
+                         help = 'JSON file to write the results to, - for the standard output' )
+
+    args = parser.parse_args( inArgs )
+
+    searchClasses = tuple( searchClass for searchClass in pathfinding.SEARCH_CLASSES
+                           if searchClass.NAME in args.engines )
+
+    results = runBenchmark( args.sizes                  ,
+                            args.scenarios              ,
+                            searchClasses               ,
+                            args.seed                   ,
+                            args.repeats                ,
+                            args.maps                   ,
+                            args.output != '-'          )
+
+    if args.output == '-':
+        writeResults( results    ,
+                      sys.stdout ,
+                      args.seed  )
+
+    elif args.output:
+        with open( args.output , 'w' ) as outputFile:
+            writeResults( results    ,
+                          outputFile ,
+                          args.seed  )
+
+    return results
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+import heapq
+import itertools
+import time
+
+import instrumentation
+import model
+import search
+
+class AASearchFrontier(object):
+
+    def __init__( self          ,
+                  inStartIndex  ,
+                  inHeuristic   ,
+                  inInsertCount ):
+        '''
+        State of one side of a bidirectional search.
+
+        Args:
+            inStartIndex (int): Index of the cell the side starts from.
+
+            inHeuristic (array.array): Distance of every cell to the cell
+                                       the side goes towards.
+
+            inInsertCount (itertools.count): Insertion order shared by
+                                             both sides to break ties.
+        '''
+        self.hCosts = inHeuristic
+
+        self.insertionCount = inInsertCount
+
+        # Cost from the start of the side to each reached cell.
+        # type: dict[int, int]
+        self.gCosts = { inStartIndex : 0 }
+
+        # Cell each reached cell was reached from.
+        # type: dict[int, int|None]
+        self.parentIndices = { inStartIndex : None }
+
+        self.closedIndices = set()
+
+        self.openHeap = [ ( inHeuristic[ inStartIndex ] ,
+                            inHeuristic[ inStartIndex ] ,
+                            next( inInsertCount )       ,
+                            inStartIndex                ) ]
+
+    def getMinFCost( self ):
+        '''
+        Drop the outdated entries on top of the open set and get the
+        lowest fCost left.
+
+        Returns:
+            int|None: lowest fCost of the open set, None if empty.
+        '''
+        openHeap = self.openHeap
+
+        while openHeap:
+
+            fCost , hCost , _ , cellIndex = openHeap[ 0 ]
+
+            if cellIndex not in self.closedIndices and fCost == self.gCosts[ cellIndex ] + hCost:
+                return fCost
+
+            heapq.heappop( openHeap )
+
+        return None
+
+    def push( self          ,
+              inIndex       ,
+              inGCost       ,
+              inParentIndex ):
+        '''
+        Add or improve a cell of the open set.
+
+        Args:
+            inIndex (int): Index of the cell.
+
+            inGCost (int): Cost from the start of the side to the cell.
+
+            inParentIndex (int): Index of the cell it was reached from.
+
+        Returns:
+            None: No return value.
+        '''
+        self.gCosts[ inIndex ]        = inGCost
+        self.parentIndices[ inIndex ] = inParentIndex
+
+        heapq.heappush( self.openHeap , ( inGCost + self.hCosts[ inIndex ] ,
+                                          self.hCosts[ inIndex ]           ,
+                                          next( self.insertionCount )      ,
+                                          inIndex                          ) )
+
+    def getChain( self    ,
+                  inIndex ):
+        '''
+        Follow the parents from a cell back to the start of the side.
+
+        Args:
+            inIndex (int): Index of the cell to start from.
+
+        Returns:
+            list[int]: Indices of the cells from inIndex to the start.
+        '''
+        chainIndices = []
+
+        while inIndex is not None:
+            chainIndices.append( inIndex )
+            inIndex = self.parentIndices[ inIndex ]
+
+        return chainIndices
+
+class AABidirectionalSearch(search.AAAStarSearch):
+
+    # Name displayed when choosing the search algorithm.
+    # type: str
+    NAME = 'Bidirectional A*'
+
+    def __init__( self    ,
+                  inModel ):
+        '''
+        A* search running from both the start and the end cells
+        at the same time until both searches meet.
+
+        Note:
+            Each step expands the side with the smallest open set. The
+            search stops once the lowest fCost of either side is not lower
+            than the best path found through a cell reached by both sides,
+            which keeps the path optimal.
+
+        Args:
+            inModel (model.AAGridModel): Grid model to find paths on.
+        '''
+        super( AABidirectionalSearch , self ).__init__( inModel )
+
+    def findPath( self                      ,
+                  inStartIndex              ,
+                  inEndIndex                ,
+                  inExploredCallback = None ):
+        '''
+        Find a path between the start and end cell.
+
+        Args:
+            inStartIndex (int): Index of the cell to start from.
+
+            inEndIndex (int): Index of the cell to reach.
+
+            inExploredCallback (callable|None): Called with the indices
+                                                explored by each expansion
+                                                of either side as soon as
+                                                they are known.
+
+        Returns:
+            search.AASearchResult: Found path and explored cells.
+        '''
+        result = search.AASearchResult()
+
+        aaModel = self.model
+
+        states = aaModel.states
+
+        insertionCount = itertools.count()
+
+        forwardFrontier  = AASearchFrontier( inStartIndex                      ,
+                                             aaModel.getHeuristic( inEndIndex ) ,
+                                             insertionCount                    )
+        backwardFrontier = AASearchFrontier( inEndIndex                          ,
+                                             aaModel.getHeuristic( inStartIndex ) ,
+                                             insertionCount                      )
+
+        searchInstrumentation = self.instrumentation
+
+        if searchInstrumentation:
+            searchInstrumentation.countHeuristic( 2 )
+
+        # Cost of the best path found and the cell both sides met at.
+        bestCost       = None
+        meetingIndex   = None
+
+        if inStartIndex == inEndIndex:
+            bestCost , meetingIndex = 0 , inStartIndex
+
+        while True:
+
+            if self.cancelledBool:
+                result.cancelledBool = True
+                return result
+
+            forwardMinFCost  = forwardFrontier.getMinFCost()
+            backwardMinFCost = backwardFrontier.getMinFCost()
+
+            if forwardMinFCost is None or backwardMinFCost is None:
+                break
+
+            if bestCost is not None and max( forwardMinFCost , backwardMinFCost ) >= bestCost:
+                break
+
+            if len( forwardFrontier.openHeap ) <= len( backwardFrontier.openHeap ):
+                frontier , otherFrontier = forwardFrontier , backwardFrontier
+            else:
+                frontier , otherFrontier = backwardFrontier , forwardFrontier
+
+            _ , _ , _ , currentIndex = heapq.heappop( frontier.openHeap )
+
+            frontier.closedIndices.add( currentIndex )
+
+            result.expandedNodesInt += 1
+
+            if searchInstrumentation:
+                searchInstrumentation.expand( currentIndex                                                  ,
+                                              len( frontier.openHeap ) + len( otherFrontier.openHeap ) + 1 )
+
+            exploredIndices = []
+
+            currentCost = frontier.gCosts[ currentIndex ]
+
+            for neighbourIndex , stepCost in aaModel.getNeighbourSteps( currentIndex ):
+
+                if states[ neighbourIndex ] == model.WALL_STATE:
+                    continue
+
+                exploredIndices.append( neighbourIndex )
+
+                if neighbourIndex in frontier.closedIndices:
+                    continue
+
+                newCostToNeighbour = currentCost + stepCost
+
+                if newCostToNeighbour < frontier.gCosts.get( neighbourIndex , newCostToNeighbour + 1 ):
+
+                    if searchInstrumentation:
+                        searchInstrumentation.relax( currentIndex                      ,
+                                                     neighbourIndex                    ,
+                                                     newCostToNeighbour                ,
+                                                     neighbourIndex in frontier.gCosts )
+                        searchInstrumentation.countHeuristic()
+
+                    frontier.push( neighbourIndex     ,
+                                   newCostToNeighbour ,
+                                   currentIndex       )
+
+                otherCost = otherFrontier.gCosts.get( neighbourIndex )
+
+                if otherCost is None:
+                    continue
+
+                pathCost = frontier.gCosts[ neighbourIndex ] + otherCost
+
+                if bestCost is None or pathCost < bestCost:
+                    bestCost , meetingIndex = pathCost , neighbourIndex
+
+            result.exploredIndices.append( exploredIndices )
+
+            if inExploredCallback:
+                inExploredCallback( exploredIndices )
+
+        if meetingIndex is not None:
+
+            startTime = time.time()
+
+            pathIndices = forwardFrontier.getChain( meetingIndex )
+            pathIndices.reverse()
+            pathIndices.extend( backwardFrontier.getChain( meetingIndex )[ 1 : ] )
+            result.pathIndices = pathIndices
+
+            if searchInstrumentation:
+                searchInstrumentation.addPhaseSeconds( instrumentation.RETRACE_PHASE ,
+                                                       time.time() - startTime       )
+
+        return result
@@ -0,0 +1,822 @@
+import array
+
+import components
+import model
+
+# Amount of cells per side of a chunk, a power of 2.
+# type: int
+CHUNK_SIZE_INT = 64
+
+# Bits to shift a column or row by to get the column or row of its
+# chunk, and mask of the column or row inside its chunk.
+# type: int
+CHUNK_SHIFT_INT = CHUNK_SIZE_INT.bit_length() - 1
+CHUNK_MASK_INT  = CHUNK_SIZE_INT - 1
+
+# Amount of cells of a chunk.
+# type: int
+CHUNK_CELLS_INT = CHUNK_SIZE_INT * CHUNK_SIZE_INT
+
+# Highest amount of cells of a chunked grid, indices are stored in
+# the signed 32 bit parents of the searches.
+# type: int
+MAX_CELL_COUNT_INT = 2 ** 31 - 1
+
+class AAChunkedArray(object):
+
+    def __init__( self           ,
+                  inColumnsInt   ,
+                  inRowsInt      ,
+                  inTypeStr      ,
+                  inDefaultValue ):
+        '''
+        Value of every cell of a grid, indexed by cell index like an
+        array.array, stored in square chunks of CHUNK_SIZE_INT cells per
+        side. Only the chunks with a cell set to a value other than the
+        default one are allocated.
+
+        Note:
+            The chunk of a cell is found from its column and row, so
+            neighbours across a chunk border cost the same to read as
+            neighbours inside it. Indices must be inside the grid.
+
+        Args:
+            inColumnsInt (int): Amount of cells in X axis.
+
+            inRowsInt (int): Amount of cells in Y axis.
+
+            inTypeStr (str): Type code of the values, see array.array.
+
+            inDefaultValue (int): Value of the cells never set.
+        '''
+        self.columnsInt = inColumnsInt
+        self.rowsInt    = inRowsInt
+
+        self.typeStr      = inTypeStr
+        self.defaultValue = inDefaultValue
+
+        # Amount of chunks in X and Y axis.
+        # type: int
+        self.chunkColumnsInt = -( -inColumnsInt // CHUNK_SIZE_INT )
+        self.chunkRowsInt    = -( -inRowsInt // CHUNK_SIZE_INT )
+
+        # Chunk with every cell at the default value, copied to allocate
+        # a chunk. Cells are stored row by row inside a chunk.
+        # type: array.array
+        self.defaultChunk = array.array( inTypeStr , [ inDefaultValue ] ) * CHUNK_CELLS_INT
+
+        # Allocated chunks by chunk row * chunkColumnsInt + chunk column.
+        # type: dict[int, array.array]
+        self.chunksMapping = {}
+
+    def __len__( self ):
+        '''
+        Get the amount of cells.
+
+        Returns:
+            int: amount of cells.
+        '''
+        return self.columnsInt * self.rowsInt
+
+    def __iter__( self ):
+        '''
+        Iterate the value of every cell, by cell index.
+
+        Yields:
+            int: value of a cell.
+        '''
+        for rowStart in range( 0 , len( self ) , self.columnsInt ):
+            for value in self[ rowStart : rowStart + self.columnsInt ]:
+                yield value
+
+    def __getitem__( self    ,
+                     inIndex ):
+        '''
+        Get the value of a cell, or of a range of cells.
+
+        Args:
+            inIndex (int|slice): Index of the cell, or slice of indices.
+
+        Returns:
+            int|array.array: value of the cell, values of the range.
+        '''
+        if isinstance( inIndex , slice ):
+            return self.getSlice( inIndex )
+
+        row , column = divmod( inIndex , self.columnsInt )
+
+        chunk = self.chunksMapping.get( ( row >> CHUNK_SHIFT_INT ) * self.chunkColumnsInt + ( column >> CHUNK_SHIFT_INT ) )
+
+        if chunk is None:
+            return self.defaultValue
+
+        return chunk[ ( ( row & CHUNK_MASK_INT ) << CHUNK_SHIFT_INT ) | ( column & CHUNK_MASK_INT ) ]
+
+    def __setitem__( self    ,
+                     inIndex ,
+                     inValue ):
+        '''
+        Set the value of a cell, allocating its chunk if needed.
+
+        Args:
+            inIndex (int): Index of the cell.
+
+            inValue (int): Value to set.
+
+        Returns:
+            None: No return value.
+        '''
+        row , column = divmod( inIndex , self.columnsInt )
+
+        chunkKey = ( row >> CHUNK_SHIFT_INT ) * self.chunkColumnsInt + ( column >> CHUNK_SHIFT_INT )
+
+        chunk = self.chunksMapping.get( chunkKey )
+
+        if chunk is None:
+
+            if inValue == self.defaultValue:
+                return
+
+            chunk = self.chunksMapping[ chunkKey ] = array.array( self.typeStr , self.defaultChunk )
+
+        chunk[ ( ( row & CHUNK_MASK_INT ) << CHUNK_SHIFT_INT ) | ( column & CHUNK_MASK_INT ) ] = inValue
+
+    def getSlice( self    ,
+                  inSlice ):
+        '''
+        Get the values of a range of cells, copied a run of cells of the
+        same chunk row at a time.
+
+        Args:
+            inSlice (slice): Slice of cell indices.
+
+        Returns:
+            array.array: values of the cells.
+        '''
+        start , stop , step = inSlice.indices( len( self ) )
+
+        if step != 1:
+            return array.array( self.typeStr , [ self[ cellIndex ] for cellIndex in range( start , stop , step ) ] )
+
+        values = array.array( self.typeStr )
+
+        while start < stop:
+
+            row , column = divmod( start , self.columnsInt )
+
+            chunkColumn = column >> CHUNK_SHIFT_INT
+
+            runEnd = min( stop , start - column + min( self.columnsInt , ( chunkColumn + 1 ) << CHUNK_SHIFT_INT ) )
+
+            chunk = self.chunksMapping.get( ( row >> CHUNK_SHIFT_INT ) * self.chunkColumnsInt + chunkColumn )
+
+            if chunk is None:
+                values.extend( self.defaultChunk[ : runEnd - start ] )
+            else:
+                offset = ( ( row & CHUNK_MASK_INT ) << CHUNK_SHIFT_INT ) | ( column & CHUNK_MASK_INT )
+                values.extend( chunk[ offset : offset + runEnd - start ] )
+
+            start = runEnd
+
+        return values
+
+    def count( self    ,
+               inValue ):
+        '''
+        Count the cells set to a value.
+
+        Args:
+            inValue (int): Value to count.
+
+        Returns:
+            int: amount of cells set to the value.
+        '''
+        if inValue != self.defaultValue:
+            return sum( chunk.count( inValue ) for chunk in self.chunksMapping.values() )
+
+        # Cells of the chunks outside the grid are never set.
+        return len( self ) - sum( CHUNK_CELLS_INT - chunk.count( inValue ) for chunk in self.chunksMapping.values() )
+
+    def tofile( self        ,
+                inFileObject ):
+        '''
+        Write the value of every cell to a file, by cell index,
+        like array.array.tofile.
+
+        Args:
+            inFileObject (file): Binary file to write to.
+
+        Returns:
+            None: No return value.
+        '''
+        for rowStart in range( 0 , len( self ) , self.columnsInt ):
+            self[ rowStart : rowStart + self.columnsInt ].tofile( inFileObject )
+
+    def discardDefaultChunks( self ):
+        '''
+        Drop the chunks whose cells are all back to the default value.
+
+        Returns:
+            int: amount of dropped chunks.
+        '''
+        defaultKeys = [ chunkKey for chunkKey , chunk in self.chunksMapping.items()
+                        if chunk == self.defaultChunk ]
+
+        for chunkKey in defaultKeys:
+            del self.chunksMapping[ chunkKey ]
+
+        return len( defaultKeys )
+
+class AADistanceHeuristic(object):
+
+    def __init__( self            ,
+                  inModel         ,
+                  inTargetIndices ):
+        '''
+        Lowest distance of every cell to any of some cells, indexed by
+        cell index like the arrays of model.AAGridModel.getHeuristic
+        but computed when read.
+
+        Args:
+            inModel (model.AAGridModel): Grid model of the cells.
+
+            inTargetIndices (list[int]): Indices of the cells to calculate
+                                         distances to, empty for a
+                                         distance of 0 everywhere.
+        '''
+        self.model = inModel
+
+        self.targetIndices = list( inTargetIndices )
+
+    def __len__( self ):
+        '''
+        Get the amount of cells.
+
+        Returns:
+            int: amount of cells.
+        '''
+        return self.model.cellCountInt
+
+    def __getitem__( self    ,
+                     inIndex ):
+        '''
+        Get the distance of a cell to the closest target.
+
+        Args:
+            inIndex (int): Index of the cell.
+
+        Returns:
+            int: distance to the closest target, see
+                 model.AAGridModel.distance.
+        '''
+        if not self.targetIndices:
+            return 0
+
+        return min( self.model.distance( inIndex     ,
+                                         targetIndex )
+                    for targetIndex in self.targetIndices )
+
+class AAChunkedGridModel(model.AAGridModel):
+
+    # Cells are stored in chunks allocated on demand instead of arrays
+    # of every cell.
+    # type: bool
+    CHUNKED_BOOL = True
+
+    # Most cells returned by getRegionIndices, larger regions are not
+    # filled.
+    # type: int
+    MAX_REGION_CELLS_INT = 100000
+
+    def __init__( self             ,
+                  inColumnsInt     ,
+                  inRowsInt        ,
+                  inCellSizeInt = 1 ):
+        '''
+        Grid model storing the cells in chunks, see AAChunkedArray, so
+        its memory grows with the walls, terrain costs and cells reached
+        by searches instead of with its size.
+
+        Note:
+            Heuristics are computed when read instead of for the whole
+            grid, and the search state is dropped by each search instead
+            of stamped, so searches only allocate the chunks they reach.
+            Reading a cell costs more than with a flat array.
+
+        Args:
+            inColumnsInt (int): Amount of cells in X axis.
+
+            inRowsInt (int): Amount of cells in Y axis.
+
+            inCellSizeInt (int): Width and height of a cell.
+
+        Raises:
+            ValueError: More cells than MAX_CELL_COUNT_INT.
+        '''
+        if inColumnsInt * inRowsInt > MAX_CELL_COUNT_INT:
+            raise ValueError( 'Grids are limited to {0} cells, got {1}x{2}.'.format( MAX_CELL_COUNT_INT ,
+                                                                                     inColumnsInt       ,
+                                                                                     inRowsInt          ) )
+
+        super( AAChunkedGridModel , self ).__init__( inColumnsInt  ,
+                                                     inRowsInt     ,
+                                                     inCellSizeInt )
+
+    def createCellArray( self           ,
+                         inTypeStr      ,
+                         inDefaultValue ):
+        '''
+        Reimplementation of createCellArray, values are stored in chunks.
+
+        Args:
+            inTypeStr (str): Type code of the values, see array.array.
+
+            inDefaultValue (int): Value of every cell.
+
+        Returns:
+            AAChunkedArray: value of each cell.
+        '''
+        return AAChunkedArray( self.columnsInt  ,
+                               self.rowsInt     ,
+                               inTypeStr        ,
+                               inDefaultValue   )
+
+    def getChunksCount( self ):
+        '''
+        Get the amount of chunks allocated by the cells of the grid
+        and the search state.
+
+        Returns:
+            int: amount of allocated chunks.
+        '''
+        return sum( len( cellArray.chunksMapping ) for cellArray in ( self.states        ,
+                                                                      self.costs         ,
+                                                                      self.searchStamps  ,
+                                                                      self.searchCosts   ,
+                                                                      self.searchParents )
+                    if cellArray is not None )
+
+    def setCosts( self    ,
+                  inCosts ):
+        '''
+        Reimplementation of setCosts, only the cells with a cost other
+        than model.DEFAULT_COST allocate chunks.
+
+        Args:
+            inCosts (bytes|bytearray|array.array): Cost of each cell.
+
+        Returns:
+            None: No return value.
+        '''
+        self.costs = self.createCellArray( 'B'                ,
+                                           model.DEFAULT_COST )
+
+        self.weightedCellsInt = 0
+
+        for cellIndex , cost in enumerate( bytearray( inCosts ) ):
+
+            if cost == model.DEFAULT_COST:
+                continue
+
+            self.costs[ cellIndex ] = cost
+            self.weightedCellsInt  += 1
+
+    def resetSearchStates( self ):
+        '''
+        Reimplementation of resetSearchStates, the chunks left without
+        walls, goals or search states are dropped.
+
+        Returns:
+            list[int]: indices of the cells that were reset.
+        '''
+        states = self.states
+
+        resetIndices = [ cellIndex for cellIndex in self.searchIndices
+                         if states[ cellIndex ] in model.SEARCH_STATES ]
+
+        self.searchIndices = set()
+
+        for cellIndex in resetIndices:
+            states[ cellIndex ] = model.BLANK_STATE
+
+        states.discardDefaultChunks()
+
+        return resetIndices
+
+    def beginSearch( self ):
+        '''
+        Reimplementation of beginSearch, the state of the previous search
+        is dropped instead of invalidated by the stamp, so its chunks
+        are released.
+
+        Returns:
+            int: stamp of the cells reached by the search,
+                 cells stamped with the next value are closed.
+        '''
+        self.searchStamps = None
+
+        return super( AAChunkedGridModel , self ).beginSearch()
+
+    def getHeuristic( self        ,
+                      inGoalIndex ):
+        '''
+        Reimplementation of getHeuristic, distances are computed when read.
+
+        Args:
+            inGoalIndex (int): Index of the cell to calculate distances to.
+
+        Returns:
+            AADistanceHeuristic: distance of each cell to the goal,
+                                 by cell index.
+        '''
+        return AADistanceHeuristic( self            ,
+                                    [ inGoalIndex ] )
+
+    def getTargetsHeuristic( self            ,
+                             inTargetIndices ):
+        '''
+        Reimplementation of getTargetsHeuristic, distances are computed
+        when read.
+
+        Args:
+            inTargetIndices (list[int]): Indices of the cells to calculate
+                                         distances to, empty for a
+                                         distance of 0 everywhere.
+
+        Returns:
+            AADistanceHeuristic: lowest distance of each cell to a target,
+                                 by cell index.
+        '''
+        return AADistanceHeuristic( self            ,
+                                    inTargetIndices )
+
+    def getRegionIndices( self    ,
+                          inIndex ):
+        '''
+        Reimplementation of getRegionIndices, the cells are walked one
+        by one instead of over a mask of the whole grid.
+
+        Args:
+            inIndex (int): Index of the cell to fill from.
+
+        Returns:
+            list[int]: Indices of the cells of the region, empty if the
+                       cell is a goal or the region has more than
+                       MAX_REGION_CELLS_INT cells.
+        '''
+        states = self.states
+
+        if states[ inIndex ] == model.GOAL_POINT_STATE:
+            return []
+
+        # 0 for the states of the cells of the region.
+        # type: bytearray
+        regionTable = bytearray( model.WALL_REGION_TABLE if self.isWall( inIndex ) else model.OPEN_REGION_TABLE )
+
+        columnsInt = self.columnsInt
+
+        regionIndices = [ inIndex ]
+
+        reachedIndices = set( regionIndices )
+
+        # The list grows while walking it, each cell is walked once.
+        for cellIndex in regionIndices:
+
+            row , column = divmod( cellIndex , columnsInt )
+
+            for neighbourIndex , insideBool in ( ( cellIndex - 1          , column > 0                  ) ,
+                                                 ( cellIndex + 1          , column < self.lastColumnInt ) ,
+                                                 ( cellIndex - columnsInt , row > 0                     ) ,
+                                                 ( cellIndex + columnsInt , row < self.lastRowInt       ) ):
+
+                if ( not insideBool or neighbourIndex in reachedIndices or
+                     regionTable[ states[ neighbourIndex ] ]                ):
+                    continue
+
+                reachedIndices.add( neighbourIndex )
+                regionIndices.append( neighbourIndex )
+
+            if len( regionIndices ) > self.MAX_REGION_CELLS_INT:
+                return []
+
+        return regionIndices
+
+class AAChunkedComponentLabels(object):
+
+    def __init__( self    ,
+                  inModel ):
+        '''
+        Connected regions of the cells of a chunked grid, with the same
+        queries as components.AAComponentLabels.
+
+        Note:
+            The regions inside each chunk with walls are labelled on their
+            own and kept until a cell of the chunk changes. Chunks without
+            walls are labelled as cells of a grid of chunks, then the
+            regions touching across chunk borders are joined. Memory and
+            time grow with the chunks with walls, plus a cell per chunk.
+
+        Args:
+            inModel (AAChunkedGridModel): Grid model to label.
+        '''
+        self.model = inModel
+
+        # Labels of the cells of each chunk with walls, by chunk key.
+        # type: dict[int, components.AAComponentLabels]
+        self.chunkLabelsMapping = {}
+
+        # Label of each chunk without walls, 0 for the chunks with walls,
+        # by chunk key. None until the next query.
+        # type: array.array|None
+        self.blankChunkLabels = None
+
+        # First region id of the regions of each chunk with walls,
+        # the ids of the chunks without walls are their labels.
+        # type: dict[int, int]
+        self.regionIdsMapping = {}
+
+        # Region each region was joined to, see getRoot.
+        # type: list[int]
+        self.parentRegions = []
+
+    def invalidate( self ):
+        '''
+        Drop the labels, they are computed again on the next query.
+
+        Returns:
+            None: No return value.
+        '''
+        self.chunkLabelsMapping = {}
+        self.blankChunkLabels   = None
+
+    def updateCell( self    ,
+                    inIndex ):
+        '''
+        Drop the labels of the chunk of a cell that switched between
+        wall and not wall, the joins between chunks are computed again
+        on the next query.
+
+        Args:
+            inIndex (int): Index of the changed cell.
+
+        Returns:
+            None: No return value.
+        '''
+        row , column = divmod( inIndex , self.model.columnsInt )
+
+        self.chunkLabelsMapping.pop( ( row >> CHUNK_SHIFT_INT ) * self.model.states.chunkColumnsInt + ( column >> CHUNK_SHIFT_INT ) ,
+                                     None                                                                                         )
+
+        self.blankChunkLabels = None
+
+    def labelChunk( self       ,
+                    inChunkKey ):
+        '''
+        Label the cells of a chunk as a grid of its own.
+
+        Args:
+            inChunkKey (int): Key of the chunk, see AAChunkedArray.
+
+        Returns:
+            components.AAComponentLabels: labels of the cells of the chunk,
+                                          by row then column in the chunk.
+        '''
+        states = self.model.states
+
+        chunk = states.chunksMapping[ inChunkKey ]
+
+        chunkRow , chunkColumn = divmod( inChunkKey , states.chunkColumnsInt )
+
+        # Chunks at the right and bottom borders may be cut by the grid.
+        widthInt  = min( CHUNK_SIZE_INT , self.model.columnsInt - ( chunkColumn << CHUNK_SHIFT_INT ) )
+        heightInt = min( CHUNK_SIZE_INT , self.model.rowsInt - ( chunkRow << CHUNK_SHIFT_INT ) )
+
+        chunkModel = model.AAGridModel( widthInt  ,
+                                        heightInt )
+
+        chunkModel.states = array.array( 'B' )
+
+        for localRow in range( heightInt ):
+            chunkModel.states.extend( chunk[ localRow << CHUNK_SHIFT_INT : ( localRow << CHUNK_SHIFT_INT ) + widthInt ] )
+
+        chunkLabels = components.AAComponentLabels( chunkModel )
+        chunkLabels.build()
+
+        return chunkLabels
+
+    def build( self ):
+        '''
+        Label the chunks with walls that changed since the last query
+        and join the regions touching across chunk borders.
+
+        Returns:
+            None: No return value.
+        '''
+        states = self.model.states
+
+        chunkColumnsInt = states.chunkColumnsInt
+
+        # Grid of chunks, the chunks with walls are walls of it.
+        # type: model.AAGridModel
+        chunksModel = model.AAGridModel( chunkColumnsInt     ,
+                                         states.chunkRowsInt )
+
+        wallChunkKeys = [ chunkKey for chunkKey , chunk in states.chunksMapping.items()
+                          if model.WALL_STATE in chunk ]
+
+        chunkLabelsMapping = {}
+
+        for chunkKey in wallChunkKeys:
+
+            chunksModel.states[ chunkKey ] = model.WALL_STATE
+
+            chunkLabelsMapping[ chunkKey ] = self.chunkLabelsMapping.get( chunkKey ) or self.labelChunk( chunkKey )
+
+        self.chunkLabelsMapping = chunkLabelsMapping
+
+        blankLabels = components.AAComponentLabels( chunksModel )
+        blankLabels.build()
+
+        self.blankChunkLabels = blankLabels.labels
+
+        regionIdInt = blankLabels.nextLabelInt
+
+        self.regionIdsMapping = {}
+
+        for chunkKey in wallChunkKeys:
+            self.regionIdsMapping[ chunkKey ] = regionIdInt
+            regionIdInt += chunkLabelsMapping[ chunkKey ].nextLabelInt - 1
+
+        self.parentRegions = list( range( regionIdInt ) )
+
+        for chunkKey in wallChunkKeys:
+            self.joinBorders( chunkKey )
+
+    def joinBorders( self       ,
+                     inChunkKey ):
+        '''
+        Join the regions of a chunk with walls to the regions of the
+        chunks around it they touch by a side or a corner.
+
+        Args:
+            inChunkKey (int): Key of the chunk.
+
+        Returns:
+            None: No return value.
+        '''
+        aaModel = self.model
+
+        chunkRow , chunkColumn = divmod( inChunkKey , aaModel.states.chunkColumnsInt )
+
+        firstColumn = chunkColumn << CHUNK_SHIFT_INT
+        firstRow    = chunkRow << CHUNK_SHIFT_INT
+        lastColumn  = min( firstColumn + CHUNK_SIZE_INT , aaModel.columnsInt ) - 1
+        lastRow     = min( firstRow + CHUNK_SIZE_INT , aaModel.rowsInt ) - 1
+
+        borderCells = set( ( column , row ) for column in range( firstColumn , lastColumn + 1 )
+                                            for row in ( firstRow , lastRow )                    )
+        borderCells.update( ( column , row ) for column in ( firstColumn , lastColumn )
+                                             for row in range( firstRow , lastRow + 1 )   )
+
+        for column , row in borderCells:
+
+            regionId = self.getRegionId( column ,
+                                         row    )
+
+            if not regionId:
+                continue
+
+            for offsetX , offsetY in aaModel.NEIGHBOUR_OFFSETS:
+
+                neighbourColumn = column + offsetX
+                neighbourRow    = row + offsetY
+
+                if ( firstColumn <= neighbourColumn <= lastColumn and
+                     firstRow <= neighbourRow <= lastRow               ):
+                    continue
+
+                if not ( 0 <= neighbourColumn < aaModel.columnsInt and
+                         0 <= neighbourRow < aaModel.rowsInt           ):
+                    continue
+
+                neighbourRegionId = self.getRegionId( neighbourColumn ,
+                                                      neighbourRow    )
+
+                if neighbourRegionId:
+                    self.parentRegions[ self.getRoot( regionId ) ] = self.getRoot( neighbourRegionId )
+
+    def getRegionId( self     ,
+                     inColumn ,
+                     inRow    ):
+        '''
+        Get the region of a cell, before joining the regions.
+
+        Args:
+            inColumn (int): Column of the cell.
+
+            inRow (int): Row of the cell.
+
+        Returns:
+            int: id of the region, 0 for walls.
+        '''
+        chunkKey = ( inRow >> CHUNK_SHIFT_INT ) * self.model.states.chunkColumnsInt + ( inColumn >> CHUNK_SHIFT_INT )
+
+        chunkLabels = self.chunkLabelsMapping.get( chunkKey )
+
+        if chunkLabels is None:
+            return self.blankChunkLabels[ chunkKey ]
+
+        label = chunkLabels.labels[ chunkLabels.model.indexOf( inColumn & CHUNK_MASK_INT ,
+                                                               inRow & CHUNK_MASK_INT    ) ]
+
+        if not label:
+            return 0
+
+        return self.regionIdsMapping[ chunkKey ] + label - 1
+
+    def getRoot( self       ,
+                 inRegionId ):
+        '''
+        Get the region a region was joined to, shortening the chain
+        of joins walked.
+
+        Args:
+            inRegionId (int): Id of the region.
+
+        Returns:
+            int: id of the region standing for every region joined to it.
+        '''
+        parentRegions = self.parentRegions
+
+        while parentRegions[ inRegionId ] != inRegionId:
+            parentRegions[ inRegionId ] = parentRegions[ parentRegions[ inRegionId ] ]
+            inRegionId = parentRegions[ inRegionId ]
+
+        return inRegionId
+
+    def getLabel( self    ,
+                  inIndex ):
+        '''
+        Get the label of a cell, labelling the grid if needed.
+
+        Args:
+            inIndex (int): Index of the cell.
+
+        Returns:
+            int: label of the cell, 0 for walls.
+        '''
+        if self.blankChunkLabels is None:
+            self.build()
+
+        column , row = self.model.coordinatesOf( inIndex )
+
+        regionId = self.getRegionId( column ,
+                                     row    )
+
+        return regionId and self.getRoot( regionId )
+
+    def isConnected( self         ,
+                     inFromIndex  ,
+                     inToIndex    ):
+        '''
+        Check if there is a path between two cells.
+
+        Args:
+            inFromIndex (int): Index of a cell.
+
+            inToIndex (int): Index of the other cell.
+
+        Returns:
+            bool: True if a path exists, False otherwise.
+        '''
+        label = self.getLabel( inFromIndex )
+
+        return bool( label ) and label == self.getLabel( inToIndex )
+
+def createChunkedModel( inModel ):
+    '''
+    Copy a grid model into a chunked grid model.
+
+    Args:
+        inModel (model.AAGridModel): Grid model to copy, as read by
+                                     mapio.loadMap.
+
+    Returns:
+        AAChunkedGridModel: chunked copy of the model.
+    '''
+    chunkedModel = AAChunkedGridModel( inModel.columnsInt  ,
+                                       inModel.rowsInt     ,
+                                       inModel.cellSizeInt )
+
+    states = chunkedModel.states
+
+    for cellIndex , state in enumerate( inModel.states ):
+        if state != model.BLANK_STATE:
+            states[ cellIndex ] = state
+
+    chunkedModel.setCosts( inModel.costs )
+    chunkedModel.setGoalIndices( inModel.goalIndices )
+
+    chunkedModel.searchIndices = set( inModel.searchIndices )
+
+    return chunkedModel
@@ -1,17 +1,62 @@
+import argparse
+
 from PyQt5 import QtCore, QtWidgets
 
+import chunks
+import grid
+import mapio
 import view
 
-def createGridEditor():
+def createGridEditor( inColumnsInt    = None                       ,
+                      inRowsInt       = None                       ,
+                      inRenderModeInt = view.View.NODE_RENDER_MODE ,
+                      inMapPathStr    = None                       ,
+                      inChunkedBool   = False                      ):
     '''
     Create the grid Editor and displays the window.
 
+    Args:
+        inColumnsInt (int|None): Amount of nodes in X axis,
+                                 None for the default grid width.
+
+        inRowsInt (int|None): Amount of nodes in Y axis,
+                              None for the default grid height.
+
+        inRenderModeInt (int): How to draw the nodes, one of the
+                               view.View *_RENDER_MODE values,
+                               use TILED_RENDER_MODE for large grids.
+
+        inMapPathStr (str|None): Grid file or MovingAI map to open,
+                                 see mapio.loadMap, None for a blank grid
+                                 of inColumnsInt by inRowsInt.
+
+        inChunkedBool (bool): Store the cells in chunks allocated on
+                              demand, see chunks.AAChunkedGridModel,
+                              for grids far larger than the window.
+
     Returns:
         None.
     '''
     app = QtWidgets.QApplication([])
 
-    aaView = view.View()
+    aaModel = None
+
+    if inMapPathStr:
+        aaModel = mapio.loadMap( inMapPathStr              ,
+                                 grid.AAGrid.NODE_SIZE_INT )
+
+        if inChunkedBool:
+            aaModel = chunks.createChunkedModel( aaModel )
+
+    elif inChunkedBool:
+        aaModel = chunks.AAChunkedGridModel( inColumnsInt or grid.AAGrid.WIDTH_INT // grid.AAGrid.NODE_SIZE_INT ,
+                                             inRowsInt or grid.AAGrid.HEIGHT_INT // grid.AAGrid.NODE_SIZE_INT   ,
+                                             grid.AAGrid.NODE_SIZE_INT                                          )
+
+    aaView = view.View( inColumnsInt    = inColumnsInt    ,
+                        inRowsInt       = inRowsInt       ,
+                        inRenderModeInt = inRenderModeInt ,
+                        inModel         = aaModel         )
 
     scene = aaView.scene()
 
@@ -19,4 +64,17 @@ def createGridEditor():
     app.exec_()
 
 if __name__ == "__main__":
-    gridEditor = createGridEditor()
+
+    parser = argparse.ArgumentParser( description = 'Grid editor to play with A* pathfinding.' )
+    parser.add_argument( 'map'       , nargs = '?' , help = 'grid file or MovingAI map to open' )
+    parser.add_argument( '--columns' , type = int )
+    parser.add_argument( '--rows'    , type = int )
+    parser.add_argument( '--chunked' , action = 'store_true' ,
+                         help = 'store the cells in chunks allocated on demand, for very large grids' )
+
+    args = parser.parse_args()
+
+    gridEditor = createGridEditor( inColumnsInt  = args.columns ,
+                                   inRowsInt     = args.rows    ,
+                                   inMapPathStr  = args.map     ,
+                                   inChunkedBool = args.chunked )
@@ -0,0 +1,419 @@
+import array
+
+import model
+
+# Translation table of the states to the bytes of a mask of the cells
+# to label, 0 for the cells that are not walls.
+# type: bytes
+LABEL_MASK_TABLE = bytearray( 256 )
+LABEL_MASK_TABLE[ model.WALL_STATE ] = 1
+LABEL_MASK_TABLE = bytes( LABEL_MASK_TABLE )
+
+class AAComponentLabels(object):
+
+    # Offsets in columns and rows of the cells around a cell, in order
+    # around it, N, NE, E, SE, S, SW, W and NW.
+    # type: tuple(tuple(int, int))
+    RING_OFFSETS = ( (  0 , -1 ) ,
+                     (  1 , -1 ) ,
+                     (  1 ,  0 ) ,
+                     (  1 ,  1 ) ,
+                     (  0 ,  1 ) ,
+                     ( -1 ,  1 ) ,
+                     ( -1 ,  0 ) ,
+                     ( -1 , -1 ) )
+
+    def __init__( self    ,
+                  inModel ):
+        '''
+        Label of the connected region of every cell that is not a wall,
+        two cells with the same label can reach each other.
+
+        Note:
+            Labels are computed on the first query and then updated with
+            each wall change, only walking the regions the change affects.
+
+        Args:
+            inModel (model.AAGridModel): Grid model to label.
+        '''
+        self.model = inModel
+
+        # Label of each cell, 0 for walls.
+        # type: array.array|None
+        self.labels = None
+
+        # Amount of cells of each label.
+        # type: dict[int, int]
+        self.sizesMapping = {}
+
+        # Next label to give to a new region.
+        # type: int
+        self.nextLabelInt = 1
+
+    def build( self ):
+        '''
+        Label every cell of the grid.
+
+        Note:
+            Regions are labelled a row span at a time over a mask of the
+            unlabelled cells, see labelSpans, so most of the work is
+            done by bytearray and array slices instead of a step per cell.
+
+        Returns:
+            None: No return value.
+        '''
+        self.labels = array.array( 'I' , [ 0 ] ) * self.model.cellCountInt
+        self.sizesMapping = {}
+        self.nextLabelInt = 1
+
+        # 0 for the cells that are not walls and have no label yet.
+        # type: bytearray
+        mask = bytearray( self.model.states ).translate( LABEL_MASK_TABLE )
+
+        seedIndex = mask.find( b'\x00' )
+
+        while seedIndex >= 0:
+
+            label = self.createLabel()
+
+            self.sizesMapping[ label ] = self.labelSpans( mask      ,
+                                                          seedIndex ,
+                                                          label     )
+
+            seedIndex = mask.find( b'\x00' , seedIndex )
+
+    def labelSpans( self        ,
+                    inMask      ,
+                    inSeedIndex ,
+                    inLabel     ):
+        '''
+        Set a label to the cells reachable from a cell, a row span of
+        cells at a time, marking them in the mask.
+
+        Note:
+            Spans of the rows above and below reach the cells touching
+            them by a side or a corner, one cell past each end.
+
+        Args:
+            inMask (bytearray): 0 for each cell to label, 1 otherwise.
+
+            inSeedIndex (int): Index of the cell to start from.
+
+            inLabel (int): Label to set.
+
+        Returns:
+            int: amount of labelled cells.
+        '''
+        labels = self.labels
+
+        columnsInt   = self.model.columnsInt
+        cellCountInt = self.model.cellCountInt
+
+        labelledInt = 0
+
+        seedIndices = [ inSeedIndex ]
+
+        while seedIndices:
+
+            seedIndex = seedIndices.pop()
+
+            if inMask[ seedIndex ]:
+                continue
+
+            rowStart = seedIndex - seedIndex % columnsInt
+            rowEnd   = rowStart + columnsInt
+
+            spanStart = max( inMask.rfind( b'\x01' , rowStart , seedIndex ) + 1 , rowStart )
+            spanEnd   = inMask.find( b'\x01' , seedIndex , rowEnd )
+
+            if spanEnd < 0:
+                spanEnd = rowEnd
+
+            inMask[ spanStart : spanEnd ] = b'\x01' * ( spanEnd - spanStart )
+            labels[ spanStart : spanEnd ] = array.array( 'I' , [ inLabel ] ) * ( spanEnd - spanStart )
+
+            labelledInt += spanEnd - spanStart
+
+            for neighbourRowStart in ( rowStart - columnsInt , rowStart + columnsInt ):
+
+                if neighbourRowStart < 0 or neighbourRowStart >= cellCountInt:
+                    continue
+
+                neighbourStart = spanStart - rowStart + neighbourRowStart
+                neighbourEnd   = spanEnd - rowStart + neighbourRowStart
+
+                if spanStart > rowStart:
+                    neighbourStart -= 1
+
+                if spanEnd < rowEnd:
+                    neighbourEnd += 1
+
+                runStart = inMask.find( b'\x00' , neighbourStart , neighbourEnd )
+
+                while runStart >= 0:
+
+                    seedIndices.append( runStart )
+
+                    runEnd = inMask.find( b'\x01' , runStart , neighbourEnd )
+
+                    if runEnd < 0:
+                        break
+
+                    runStart = inMask.find( b'\x00' , runEnd , neighbourEnd )
+
+        return labelledInt
+
+    def invalidate( self ):
+        '''
+        Drop the labels, they are computed again on the next query.
+        Cheaper than updating them cell by cell after large edits.
+
+        Returns:
+            None: No return value.
+        '''
+        self.labels = None
+
+    def createLabel( self ):
+        '''
+        Get an unused label.
+
+        Returns:
+            int: new label.
+        '''
+        label = self.nextLabelInt
+        self.nextLabelInt += 1
+
+        self.sizesMapping[ label ] = 0
+
+        return label
+
+    def labelRegion( self        ,
+                     inSeedIndex ,
+                     inLabel     ):
+        '''
+        Set a label to the cells reachable from a cell,
+        stopping at walls and cells already with that label.
+
+        Args:
+            inSeedIndex (int): Index of the cell to start from.
+
+            inLabel (int): Label to set.
+
+        Returns:
+            int: amount of labelled cells.
+        '''
+        states = self.model.states
+        labels = self.labels
+
+        getNeighbours = self.model.getNeighbours
+
+        labels[ inSeedIndex ] = inLabel
+
+        pendingIndices = [ inSeedIndex ]
+
+        labelledInt = 1
+
+        while pendingIndices:
+
+            for neighbourIndex in getNeighbours( pendingIndices.pop() ):
+
+                if labels[ neighbourIndex ] == inLabel or states[ neighbourIndex ] == model.WALL_STATE:
+                    continue
+
+                labels[ neighbourIndex ] = inLabel
+                labelledInt += 1
+
+                pendingIndices.append( neighbourIndex )
+
+        self.sizesMapping[ inLabel ] = self.sizesMapping.get( inLabel , 0 ) + labelledInt
+
+        return labelledInt
+
+    def getLabel( self    ,
+                  inIndex ):
+        '''
+        Get the label of a cell, labelling the grid if needed.
+
+        Args:
+            inIndex (int): Index of the cell.
+
+        Returns:
+            int: label of the cell, 0 for walls.
+        '''
+        if self.labels is None:
+            self.build()
+
+        return self.labels[ inIndex ]
+
+    def isConnected( self         ,
+                     inFromIndex  ,
+                     inToIndex    ):
+        '''
+        Check if there is a path between two cells.
+
+        Args:
+            inFromIndex (int): Index of a cell.
+
+            inToIndex (int): Index of the other cell.
+
+        Returns:
+            bool: True if a path exists, False otherwise.
+        '''
+        label = self.getLabel( inFromIndex )
+
+        return bool( label ) and label == self.getLabel( inToIndex )
+
+    def getRingGroups( self    ,
+                       inIndex ):
+        '''
+        Group the cells around a cell that are not walls by the ones
+        that can reach each other without passing through the cell.
+
+        Args:
+            inIndex (int): Index of the cell.
+
+        Returns:
+            list[list[int]]: indices of the cells of each group.
+        '''
+        aaModel = self.model
+
+        column , row = aaModel.coordinatesOf( inIndex )
+
+        ringIndices = []
+
+        for offsetX , offsetY in self.RING_OFFSETS:
+
+            ringColumn = column + offsetX
+            ringRow    = row + offsetY
+
+            if ( 0 <= ringColumn < aaModel.columnsInt and
+                 0 <= ringRow < aaModel.rowsInt           ):
+
+                ringIndex = aaModel.indexOf( ringColumn , ringRow )
+
+                if aaModel.states[ ringIndex ] != model.WALL_STATE:
+                    ringIndices.append( ringIndex )
+                    continue
+
+            ringIndices.append( None )
+
+        # Cells next on the ring touch, side cells also touch the side
+        # cell two positions away through the corner between them.
+        groupPositions = list( range( len( ringIndices ) ) )
+
+        def getGroupPosition( inPosition ):
+            while groupPositions[ inPosition ] != inPosition:
+                inPosition = groupPositions[ inPosition ]
+            return inPosition
+
+        for position , ringIndex in enumerate( ringIndices ):
+
+            if ringIndex is None:
+                continue
+
+            touchingPositions = [ ( position + 1 ) % len( ringIndices ) ]
+
+            if position % 2 == 0:
+                touchingPositions.append( ( position + 2 ) % len( ringIndices ) )
+
+            for touchingPosition in touchingPositions:
+                if ringIndices[ touchingPosition ] is not None:
+                    groupPositions[ getGroupPosition( position ) ] = getGroupPosition( touchingPosition )
+
+        groupsMapping = {}
+
+        for position , ringIndex in enumerate( ringIndices ):
+            if ringIndex is not None:
+                groupsMapping.setdefault( getGroupPosition( position ) , [] ).append( ringIndex )
+
+        return list( groupsMapping.values() )
+
+    def updateCell( self    ,
+                    inIndex ):
+        '''
+        Update the labels after a cell switched between wall and not wall.
+
+        Args:
+            inIndex (int): Index of the changed cell.
+
+        Returns:
+            None: No return value.
+        '''
+        if self.labels is None:
+            return
+
+        labels = self.labels
+
+        isWallBool = self.model.states[ inIndex ] == model.WALL_STATE
+
+        if isWallBool == ( not labels[ inIndex ] ):
+            return
+
+        if not isWallBool:
+            self.addCell( inIndex )
+            return
+
+        oldLabel = labels[ inIndex ]
+
+        labels[ inIndex ] = 0
+        self.sizesMapping[ oldLabel ] -= 1
+
+        groups = self.getRingGroups( inIndex )
+
+        if not groups:
+            del self.sizesMapping[ oldLabel ]
+            return
+
+        # Every group but the last gets a new label, the cells left
+        # with the old label are the ones reachable from the last group.
+        for group in groups[ : -1 ]:
+
+            if labels[ group[ 0 ] ] != oldLabel:
+                continue
+
+            self.sizesMapping[ oldLabel ] -= self.labelRegion( group[ 0 ]         ,
+                                                               self.createLabel() )
+
+        if not self.sizesMapping[ oldLabel ]:
+            del self.sizesMapping[ oldLabel ]
+
+    def addCell( self    ,
+                 inIndex ):
+        '''
+        Label a cell that stopped being a wall, merging the regions
+        around it into the largest one.
+
+        Args:
+            inIndex (int): Index of the cell.
+
+        Returns:
+            None: No return value.
+        '''
+        labels = self.labels
+
+        neighbourLabels = {}
+
+        for neighbourIndex in self.model.getNeighbours( inIndex ):
+            if labels[ neighbourIndex ]:
+                neighbourLabels[ labels[ neighbourIndex ] ] = neighbourIndex
+
+        if not neighbourLabels:
+            label = self.createLabel()
+            labels[ inIndex ] = label
+            self.sizesMapping[ label ] = 1
+            return
+
+        largestLabel = max( neighbourLabels , key = self.sizesMapping.get )
+
+        labels[ inIndex ] = largestLabel
+        self.sizesMapping[ largestLabel ] += 1
+
+        for label , neighbourIndex in neighbourLabels.items():
+
+            if label == largestLabel:
+                continue
+
+            del self.sizesMapping[ label ]
+
+            self.labelRegion( neighbourIndex ,
+                              largestLabel   )
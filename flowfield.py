@@ -0,0 +1,197 @@
+import array
+import heapq
+
+import model
+
+# Cost of the cells that cannot reach the goal.
+# type: int
+UNREACHED_COST = 2 ** 32 - 1
+
+class AAFlowField(object):
+
+    def __init__( self    ,
+                  inModel ):
+        '''
+        Cost to reach a goal cell and best next step towards it of every
+        cell of a grid, so any amount of agents can follow the field
+        with a lookup per step instead of searching a path each.
+
+        Note:
+            Walls or costs changed after build make the field outdated,
+            see validBool.
+
+        Args:
+            inModel (model.AAGridModel): Grid model to compute the field on.
+        '''
+        self.model = inModel
+
+        # Index of the goal cell of the field, None before the first build.
+        # type: int|None
+        self.goalIndex = None
+
+        # Cost from each cell to the goal, UNREACHED_COST if it cannot
+        # reach it.
+        # type: array.array
+        self.costs = array.array( 'I' )
+
+        # Neighbour to move to from each cell towards the goal,
+        # model.NO_PARENT for the goal and unreached cells.
+        # type: array.array
+        self.nextIndices = array.array( 'i' )
+
+        # Highest cost of a reached cell.
+        # type: int
+        self.maxCostInt = 0
+
+        # False once walls or costs changed since the last build.
+        # type: bool
+        self.validBool = False
+
+    def notifyCellChanged( self    ,
+                           inIndex ):
+        '''
+        Called after a cell switched between wall and not wall or
+        changed terrain cost, the field needs to be built again.
+
+        Args:
+            inIndex (int): Index of the changed cell.
+
+        Returns:
+            None: No return value.
+        '''
+        self.validBool = False
+
+    def build( self        ,
+               inGoalIndex ):
+        '''
+        Compute the field of a goal with a single Dijkstra expansion
+        from the goal over every cell that can reach it.
+
+        Note:
+            Moves cost the same both ways, so the cost from the goal
+            to a cell is also the cost from the cell to the goal.
+
+        Args:
+            inGoalIndex (int): Index of the cell to reach.
+
+        Returns:
+            None: No return value.
+        '''
+        aaModel = self.model
+
+        states = aaModel.states
+
+        costs       = array.array( 'I' , [ UNREACHED_COST ] ) * aaModel.cellCountInt
+        nextIndices = array.array( 'i' , [ model.NO_PARENT ] ) * aaModel.cellCountInt
+
+        costs[ inGoalIndex ] = 0
+
+        maxCostInt = 0
+
+        openHeap = [ ( 0 , inGoalIndex ) ]
+
+        while openHeap:
+
+            currentCost , currentIndex = heapq.heappop( openHeap )
+
+            # Outdated entry, the cell was pushed again with a lower cost.
+            if currentCost != costs[ currentIndex ]:
+                continue
+
+            maxCostInt = currentCost
+
+            for neighbourIndex , stepCost in aaModel.getNeighbourSteps( currentIndex ):
+
+                if states[ neighbourIndex ] == model.WALL_STATE:
+                    continue
+
+                newCost = currentCost + stepCost
+
+                if newCost < costs[ neighbourIndex ]:
+
+                    costs[ neighbourIndex ]       = newCost
+                    nextIndices[ neighbourIndex ] = currentIndex
+
+                    heapq.heappush( openHeap , ( newCost        ,
+                                                 neighbourIndex ) )
+
+        self.goalIndex   = inGoalIndex
+        self.costs       = costs
+        self.nextIndices = nextIndices
+        self.maxCostInt  = maxCostInt
+        self.validBool   = True
+
+    def getCost( self    ,
+                 inIndex ):
+        '''
+        Get the cost from a cell to the goal.
+
+        Args:
+            inIndex (int): Index of the cell.
+
+        Returns:
+            int|None: cost to the goal, None if the cell cannot reach it.
+        '''
+        cost = self.costs[ inIndex ]
+
+        return None if cost == UNREACHED_COST else cost
+
+    def getNextIndex( self    ,
+                      inIndex ):
+        '''
+        Get the cell to move to from a cell to get closer to the goal.
+
+        Args:
+            inIndex (int): Index of the cell.
+
+        Returns:
+            int|None: index of the next cell, None at the goal or
+                      if the cell cannot reach it.
+        '''
+        nextIndex = self.nextIndices[ inIndex ]
+
+        return None if nextIndex == model.NO_PARENT else nextIndex
+
+    def getPath( self         ,
+                 inStartIndex ):
+        '''
+        Follow the field from a cell to the goal.
+
+        Args:
+            inStartIndex (int): Index of the cell to start from.
+
+        Returns:
+            list[int]: Indices of the cells from start to goal,
+                       empty if the start cannot reach the goal.
+        '''
+        if self.costs[ inStartIndex ] == UNREACHED_COST:
+            return []
+
+        nextIndices = self.nextIndices
+
+        pathIndices = [ inStartIndex ]
+
+        while nextIndices[ pathIndices[ -1 ] ] != model.NO_PARENT:
+            pathIndices.append( nextIndices[ pathIndices[ -1 ] ] )
+
+        return pathIndices
+
+    def getHeatLevels( self        ,
+                       inLevelsInt ):
+        '''
+        Get the cost of every cell scaled to a level, to display the
+        field as a heatmap.
+
+        Args:
+            inLevelsInt (int): Amount of levels of the reached cells,
+                               the unreached cells get this value.
+
+        Returns:
+            bytearray: level of each cell, from 0 at the goal to
+                       inLevelsInt - 1 at the highest cost.
+        '''
+        maxCostInt = max( self.maxCostInt , 1 )
+        topLevel   = inLevelsInt - 1
+
+        return bytearray( inLevelsInt if cost == UNREACHED_COST else cost * topLevel // maxCostInt
+                          for cost in self.costs )
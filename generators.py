@@ -0,0 +1,620 @@
+import argparse
+import array
+import binascii
+import random
+
+import components
+import mapio
+import model
+
+# Names of the maps generateModel can create.
+# type: tuple(str)
+GENERATORS = ( 'open'     ,
+               'random'   ,
+               'division' ,
+               'maze'     ,
+               'rooms'    ,
+               'caves'    )
+
+# Chance of each cell to be a wall in random maps.
+# type: float
+DEFAULT_DENSITY_FLOAT = 0.25
+
+# Smallest and largest amount of cells per side of a room, walls
+# excluded, see createRoomsModel.
+# type: int
+MIN_ROOM_SIZE_INT = 4
+MAX_ROOM_SIZE_INT = 12
+
+# Chance of each cell to start as a wall in cave maps.
+# type: float
+CAVE_DENSITY_FLOAT = 0.45
+
+# Smoothing steps of the cave maps, see createCaveModel.
+# type: int
+CAVE_STEPS_INT = 4
+
+# Lowest amount of walls among a cell and its neighbours for the cell
+# to be a wall after a smoothing step of a cave map.
+# type: int
+CAVE_WALL_COUNT_INT = 5
+
+def getRandomBytes( inRandomGenerator ,
+                    inCountInt        ):
+    '''
+    Get random bytes from a seeded generator at once, without a call
+    per byte.
+
+    Args:
+        inRandomGenerator (random.Random): Generator to draw from.
+
+        inCountInt (int): Amount of bytes.
+
+    Returns:
+        bytes: random bytes.
+    '''
+    if not inCountInt:
+        return b''
+
+    return binascii.unhexlify( '{0:0{1}x}'.format( inRandomGenerator.getrandbits( 8 * inCountInt ) ,
+                                                   2 * inCountInt                                  ) )
+
+def createDensityTable( inDensityFloat ):
+    '''
+    Build a table for bytearray.translate mapping random bytes to walls
+    with a chance, in steps of 1 / 256.
+
+    Args:
+        inDensityFloat (float): Chance of a byte to map to a wall, from 0 to 1.
+
+    Returns:
+        bytes: translation table.
+    '''
+    wallBytesInt = max( 0 , min( 256 , int( round( inDensityFloat * 256 ) ) ) )
+
+    return bytes( bytearray( [ model.WALL_STATE ] * wallBytesInt +
+                             [ model.BLANK_STATE ] * ( 256 - wallBytesInt ) ) )
+
+# Translation table of the amount of walls among a cell and its
+# neighbours to the state of the cell after a smoothing step.
+# type: bytes
+CAVE_STATES_TABLE = bytes( bytearray( model.WALL_STATE if wallCount >= CAVE_WALL_COUNT_INT else model.BLANK_STATE
+                                      for wallCount in range( 256 ) ) )
+
+def createOpenModel( inColumnsInt      ,
+                     inRowsInt         ,
+                     inCellSizeInt = 1 ):
+    '''
+    Create a grid model without walls.
+
+    Args:
+        inColumnsInt (int): Amount of cells in X axis.
+
+        inRowsInt (int): Amount of cells in Y axis.
+
+        inCellSizeInt (int): Width and height of a cell.
+
+    Returns:
+        model.AAGridModel: created model, without goals.
+    '''
+    return model.AAGridModel( inColumnsInt  ,
+                              inRowsInt     ,
+                              inCellSizeInt )
+
+def createRandomModel( inColumnsInt      ,
+                       inRowsInt         ,
+                       inDensityFloat    ,
+                       inSeedInt         ,
+                       inCellSizeInt = 1 ):
+    '''
+    Create a grid model with walls at random cells.
+
+    Note:
+        A random byte is drawn per cell at once and mapped to a state
+        with bytearray.translate, see createDensityTable.
+
+    Args:
+        inColumnsInt (int): Amount of cells in X axis.
+
+        inRowsInt (int): Amount of cells in Y axis.
+
+        inDensityFloat (float): Chance of each cell to be a wall, from 0 to 1.
+
+        inSeedInt (int): Seed of the random walls.
+
+        inCellSizeInt (int): Width and height of a cell.
+
+    Returns:
+        model.AAGridModel: created model, without goals.
+    '''
+    aaModel = model.AAGridModel( inColumnsInt  ,
+                                 inRowsInt     ,
+                                 inCellSizeInt )
+
+    randomBytes = bytearray( getRandomBytes( random.Random( inSeedInt ) ,
+                                             aaModel.cellCountInt       ) )
+
+    aaModel.states = array.array( 'B' , randomBytes.translate( createDensityTable( inDensityFloat ) ) )
+
+    return aaModel
+
+def createDivisionModel( inColumnsInt      ,
+                         inRowsInt         ,
+                         inSeedInt         ,
+                         inCellSizeInt = 1 ):
+    '''
+    Create a grid model with a maze built by recursive division, each
+    chamber is split by a wall with a single gap until chambers are
+    corridors of one cell.
+
+    Note:
+        Walls are at odd columns and rows and gaps at even ones, so
+        later walls never block earlier gaps. Each wall is written with
+        a single slice assignment.
+
+    Args:
+        inColumnsInt (int): Amount of cells in X axis.
+
+        inRowsInt (int): Amount of cells in Y axis.
+
+        inSeedInt (int): Seed of the walls and gaps positions.
+
+        inCellSizeInt (int): Width and height of a cell.
+
+    Returns:
+        model.AAGridModel: created model, without goals.
+    '''
+    aaModel = model.AAGridModel( inColumnsInt  ,
+                                 inRowsInt     ,
+                                 inCellSizeInt )
+
+    randomGenerator = random.Random( inSeedInt )
+
+    states = aaModel.states
+
+    # First and last column and row of the chambers to split.
+    # type: list[tuple(int, int, int, int)]
+    pendingChambers = [ ( 0                ,
+                          0                ,
+                          inColumnsInt - 1 ,
+                          inRowsInt - 1    ) ]
+
+    while pendingChambers:
+
+        firstColumn , firstRow , lastColumn , lastRow = pendingChambers.pop()
+
+        widthInt  = lastColumn - firstColumn + 1
+        heightInt = lastRow - firstRow + 1
+
+        if widthInt < 3 and heightInt < 3:
+            continue
+
+        if widthInt > heightInt:
+            verticalBool = True
+        elif heightInt > widthInt:
+            verticalBool = False
+        else:
+            verticalBool = randomGenerator.random() < 0.5
+
+        if verticalBool:
+
+            wallColumn = firstColumn + 1 + 2 * int( randomGenerator.random() * ( ( widthInt - 1 ) // 2 ) )
+            gapRow     = firstRow + 2 * int( randomGenerator.random() * ( ( heightInt + 1 ) // 2 ) )
+
+            states[ firstRow * inColumnsInt + wallColumn : lastRow * inColumnsInt + wallColumn + 1 : inColumnsInt ] = \
+                array.array( 'B' , [ model.WALL_STATE ] ) * heightInt
+
+            states[ gapRow * inColumnsInt + wallColumn ] = model.BLANK_STATE
+
+            pendingChambers.append( ( firstColumn , firstRow , wallColumn - 1 , lastRow ) )
+            pendingChambers.append( ( wallColumn + 1 , firstRow , lastColumn , lastRow ) )
+
+        else:
+
+            wallRow   = firstRow + 1 + 2 * int( randomGenerator.random() * ( ( heightInt - 1 ) // 2 ) )
+            gapColumn = firstColumn + 2 * int( randomGenerator.random() * ( ( widthInt + 1 ) // 2 ) )
+
+            states[ wallRow * inColumnsInt + firstColumn : wallRow * inColumnsInt + lastColumn + 1 ] = \
+                array.array( 'B' , [ model.WALL_STATE ] ) * widthInt
+
+            states[ wallRow * inColumnsInt + gapColumn ] = model.BLANK_STATE
+
+            pendingChambers.append( ( firstColumn , firstRow , lastColumn , wallRow - 1 ) )
+            pendingChambers.append( ( firstColumn , wallRow + 1 , lastColumn , lastRow ) )
+
+    return aaModel
+
+def createMazeModel( inColumnsInt      ,
+                     inRowsInt         ,
+                     inSeedInt         ,
+                     inCellSizeInt = 1 ):
+    '''
+    Create a grid model with a maze carved by a depth first
+    walk, corridors of one cell with a single path between any two cells.
+
+    Args:
+        inColumnsInt (int): Amount of cells in X axis.
+
+        inRowsInt (int): Amount of cells in Y axis.
+
+        inSeedInt (int): Seed of the walk.
+
+        inCellSizeInt (int): Width and height of a cell.
+
+    Returns:
+        model.AAGridModel: created model, without goals.
+    '''
+    aaModel = model.AAGridModel( inColumnsInt  ,
+                                 inRowsInt     ,
+                                 inCellSizeInt )
+
+    randomGenerator = random.Random( inSeedInt )
+
+    aaModel.states = array.array( 'B' , [ model.WALL_STATE ] ) * aaModel.cellCountInt
+
+    states = aaModel.states
+
+    # Corridor cells are at odd columns and rows, the walk moves two
+    # cells at a time opening the wall between them.
+    lastColumnInt = inColumnsInt - 2
+    lastRowInt    = inRowsInt - 2
+
+    if lastColumnInt < 1 or lastRowInt < 1:
+        return aaModel
+
+    wallState  = model.WALL_STATE
+    blankState = model.BLANK_STATE
+
+    startIndex = aaModel.indexOf( 1 , 1 )
+
+    states[ startIndex ] = blankState
+
+    # Column, row and index of the cells of the walk.
+    # type: list[tuple(int, int, int)]
+    pendingCells = [ ( 1 , 1 , startIndex ) ]
+
+    while pendingCells:
+
+        column , row , cellIndex = pendingCells[ -1 ]
+
+        nextCells = []
+
+        if column + 2 <= lastColumnInt and states[ cellIndex + 2 ] == wallState:
+            nextCells.append( ( column + 2 , row , cellIndex + 2 , cellIndex + 1 ) )
+
+        if column >= 3 and states[ cellIndex - 2 ] == wallState:
+            nextCells.append( ( column - 2 , row , cellIndex - 2 , cellIndex - 1 ) )
+
+        if row + 2 <= lastRowInt and states[ cellIndex + 2 * inColumnsInt ] == wallState:
+            nextCells.append( ( column , row + 2 , cellIndex + 2 * inColumnsInt , cellIndex + inColumnsInt ) )
+
+        if row >= 3 and states[ cellIndex - 2 * inColumnsInt ] == wallState:
+            nextCells.append( ( column , row - 2 , cellIndex - 2 * inColumnsInt , cellIndex - inColumnsInt ) )
+
+        if not nextCells:
+            pendingCells.pop()
+            continue
+
+        nextColumn , nextRow , nextIndex , betweenIndex = nextCells[ int( randomGenerator.random() * len( nextCells ) ) ]
+
+        states[ betweenIndex ] = blankState
+        states[ nextIndex ]    = blankState
+
+        pendingCells.append( ( nextColumn , nextRow , nextIndex ) )
+
+    return aaModel
+
+def createRoomsModel( inColumnsInt      ,
+                      inRowsInt         ,
+                      inSeedInt         ,
+                      inCellSizeInt = 1 ):
+    '''
+    Create a grid model with rooms at random positions joined by
+    corridors, each room to the next one along rows of rooms.
+
+    Note:
+        Rooms do not touch each other, a room is only placed where
+        it and the cells around it are still walls. Rooms and corridors
+        are carved with a slice assignment per row or column.
+
+    Args:
+        inColumnsInt (int): Amount of cells in X axis.
+
+        inRowsInt (int): Amount of cells in Y axis.
+
+        inSeedInt (int): Seed of the rooms positions and sizes.
+
+        inCellSizeInt (int): Width and height of a cell.
+
+    Returns:
+        model.AAGridModel: created model, without goals.
+    '''
+    aaModel = model.AAGridModel( inColumnsInt  ,
+                                 inRowsInt     ,
+                                 inCellSizeInt )
+
+    randomGenerator = random.Random( inSeedInt )
+
+    aaModel.states = array.array( 'B' , [ model.WALL_STATE ] ) * aaModel.cellCountInt
+
+    states = aaModel.states
+
+    maxWidthInt  = min( MAX_ROOM_SIZE_INT , inColumnsInt - 2 )
+    maxHeightInt = min( MAX_ROOM_SIZE_INT , inRowsInt - 2 )
+
+    if maxWidthInt < MIN_ROOM_SIZE_INT or maxHeightInt < MIN_ROOM_SIZE_INT:
+        return aaModel
+
+    blankRow = array.array( 'B' , [ model.BLANK_STATE ] )
+
+    # Center column and row of each placed room.
+    # type: list[tuple(int, int)]
+    roomCenters = []
+
+    for _ in range( 2 * aaModel.cellCountInt // ( MAX_ROOM_SIZE_INT * MAX_ROOM_SIZE_INT ) + 1 ):
+
+        widthInt  = randomGenerator.randint( MIN_ROOM_SIZE_INT , maxWidthInt )
+        heightInt = randomGenerator.randint( MIN_ROOM_SIZE_INT , maxHeightInt )
+
+        firstColumn = randomGenerator.randint( 1 , inColumnsInt - widthInt - 1 )
+        firstRow    = randomGenerator.randint( 1 , inRowsInt - heightInt - 1 )
+
+        if any( model.BLANK_STATE in states[ aaModel.indexOf( firstColumn - 1 , row ) :
+                                             aaModel.indexOf( firstColumn + widthInt + 1 , row ) ]
+                for row in range( firstRow - 1 , firstRow + heightInt + 1 ) ):
+            continue
+
+        for row in range( firstRow , firstRow + heightInt ):
+            states[ aaModel.indexOf( firstColumn , row ) : aaModel.indexOf( firstColumn + widthInt , row ) ] = \
+                blankRow * widthInt
+
+        roomCenters.append( ( firstColumn + widthInt // 2 ,
+                              firstRow + heightInt // 2   ) )
+
+    # Snake through the rows of rooms so each corridor joins close rooms.
+    roomCenters.sort( key = lambda center : ( center[ 1 ] // MAX_ROOM_SIZE_INT ,
+                                              center[ 0 ] if ( center[ 1 ] // MAX_ROOM_SIZE_INT ) % 2 == 0 else -center[ 0 ] ) )
+
+    for ( fromColumn , fromRow ) , ( toColumn , toRow ) in zip( roomCenters , roomCenters[ 1 : ] ):
+
+        firstColumn , lastColumn = sorted( ( fromColumn , toColumn ) )
+        firstRow , lastRow       = sorted( ( fromRow , toRow ) )
+
+        states[ aaModel.indexOf( firstColumn , fromRow ) : aaModel.indexOf( lastColumn , fromRow ) + 1 ] = \
+            blankRow * ( lastColumn - firstColumn + 1 )
+
+        states[ aaModel.indexOf( toColumn , firstRow ) : aaModel.indexOf( toColumn , lastRow ) + 1 : inColumnsInt ] = \
+            blankRow * ( lastRow - firstRow + 1 )
+
+    return aaModel
+
+def createCaveModel( inColumnsInt                        ,
+                     inRowsInt                           ,
+                     inSeedInt                           ,
+                     inDensityFloat = CAVE_DENSITY_FLOAT ,
+                     inStepsInt     = CAVE_STEPS_INT     ,
+                     inCellSizeInt  = 1                  ):
+    '''
+    Create a grid model with caves, random walls smoothed by a cellular
+    automaton, a cell becomes a wall when at least CAVE_WALL_COUNT_INT
+    of it and its neighbours are walls.
+
+    Note:
+        The cells are packed a byte each into a single integer, so the
+        walls around every cell are counted at once by adding the
+        integer shifted by a cell and by a row. Counts are at most 9,
+        they never carry into the next byte. The border cells are kept
+        as walls, so counts wrapping between rows read walls like
+        cells outside the grid would.
+
+    Args:
+        inColumnsInt (int): Amount of cells in X axis.
+
+        inRowsInt (int): Amount of cells in Y axis.
+
+        inSeedInt (int): Seed of the random walls.
+
+        inDensityFloat (float): Chance of each cell to start as a wall.
+
+        inStepsInt (int): Smoothing steps.
+
+        inCellSizeInt (int): Width and height of a cell.
+
+    Returns:
+        model.AAGridModel: created model, without goals.
+    '''
+    aaModel = createRandomModel( inColumnsInt   ,
+                                 inRowsInt      ,
+                                 inDensityFloat ,
+                                 inSeedInt      ,
+                                 inCellSizeInt  )
+
+    # Walls as 1 and other cells as 0, the states are the same values.
+    # type: bytearray
+    cells = bytearray( aaModel.states )
+
+    cellCountInt = aaModel.cellCountInt
+    rowBitsInt   = 8 * inColumnsInt
+    cellsMask    = ( 1 << ( 8 * cellCountInt ) ) - 1
+
+    for stepInt in range( inStepsInt + 1 ):
+
+        cells[ : inColumnsInt ]                    = bytearray( [ model.WALL_STATE ] ) * inColumnsInt
+        cells[ cellCountInt - inColumnsInt : ]     = bytearray( [ model.WALL_STATE ] ) * inColumnsInt
+        cells[ : : inColumnsInt ]                  = bytearray( [ model.WALL_STATE ] ) * inRowsInt
+        cells[ inColumnsInt - 1 : : inColumnsInt ] = bytearray( [ model.WALL_STATE ] ) * inRowsInt
+
+        if stepInt == inStepsInt:
+            break
+
+        packedCells = int( binascii.hexlify( cells ) , 16 )
+
+        rowCounts = ( packedCells + ( packedCells << 8 ) + ( packedCells >> 8 ) ) & cellsMask
+        counts    = ( rowCounts + ( rowCounts << rowBitsInt ) + ( rowCounts >> rowBitsInt ) ) & cellsMask
+
+        cells = bytearray( binascii.unhexlify( '{0:0{1}x}'.format( counts           ,
+                                                                   2 * cellCountInt ) ) ).translate( CAVE_STATES_TABLE )
+
+    aaModel.states = array.array( 'B' , cells )
+
+    return aaModel
+
+def placeGoals( inModel                 ,
+                inConnectedBool = False ):
+    '''
+    Set as goals the first and last open cell of the largest connected
+    region, so a path always exists and crosses most of the grid.
+
+    Args:
+        inModel (model.AAGridModel): Grid model to place the goals on.
+
+        inConnectedBool (bool): True if every open cell can reach every
+                                other one, as in mazes, so the regions
+                                do not need to be labelled.
+
+    Returns:
+        None: No return value.
+    '''
+    if inConnectedBool:
+
+        if model.BLANK_STATE not in inModel.states:
+            return
+
+        startIndex = inModel.states.index( model.BLANK_STATE )
+        endIndex   = inModel.cellCountInt - 1 - inModel.states[ : : -1 ].index( model.BLANK_STATE )
+
+    else:
+
+        labels = components.AAComponentLabels( inModel )
+        labels.build()
+
+        if not labels.sizesMapping:
+            return
+
+        largestLabel = max( labels.sizesMapping , key = labels.sizesMapping.get )
+
+        startIndex = labels.labels.index( largestLabel )
+        endIndex   = inModel.cellCountInt - 1 - labels.labels[ : : -1 ].index( largestLabel )
+
+    for goalIndex in ( startIndex , endIndex ):
+        inModel.states[ goalIndex ] = model.GOAL_POINT_STATE
+
+    inModel.setGoalIndices( [ startIndex ,
+                              endIndex   ] )
+
+def generateModel( inGeneratorStr                        ,
+                   inColumnsInt                          ,
+                   inRowsInt                             ,
+                   inSeedInt                             ,
+                   inDensityFloat = DEFAULT_DENSITY_FLOAT ,
+                   inCellSizeInt  = 1                     ):
+    '''
+    Create a map with one of GENERATORS and place its goals.
+
+    Args:
+        inGeneratorStr (str): Name of the map, one of GENERATORS.
+
+        inColumnsInt (int): Amount of cells in X axis.
+
+        inRowsInt (int): Amount of cells in Y axis.
+
+        inSeedInt (int): Seed of the map, the same seed gives the same map.
+
+        inDensityFloat (float): Chance of each cell to be a wall,
+                                for random maps only.
+
+        inCellSizeInt (int): Width and height of a cell.
+
+    Raises:
+        ValueError: Unknown generator name.
+
+    Returns:
+        model.AAGridModel: created model.
+    '''
+    if inGeneratorStr == 'open':
+        aaModel = createOpenModel( inColumnsInt  ,
+                                   inRowsInt     ,
+                                   inCellSizeInt )
+
+        aaModel.setGoalIndices( [ 0                        ,
+                                  aaModel.cellCountInt - 1 ] )
+
+        for goalIndex in aaModel.goalIndices:
+            aaModel.states[ goalIndex ] = model.GOAL_POINT_STATE
+
+        return aaModel
+
+    if inGeneratorStr == 'random':
+        aaModel = createRandomModel( inColumnsInt   ,
+                                     inRowsInt      ,
+                                     inDensityFloat ,
+                                     inSeedInt      ,
+                                     inCellSizeInt  )
+
+    elif inGeneratorStr == 'division':
+        aaModel = createDivisionModel( inColumnsInt  ,
+                                       inRowsInt     ,
+                                       inSeedInt     ,
+                                       inCellSizeInt )
+
+    elif inGeneratorStr == 'maze':
+        aaModel = createMazeModel( inColumnsInt  ,
+                                   inRowsInt     ,
+                                   inSeedInt     ,
+                                   inCellSizeInt )
+
+    elif inGeneratorStr == 'rooms':
+        aaModel = createRoomsModel( inColumnsInt  ,
+                                    inRowsInt     ,
+                                    inSeedInt     ,
+                                    inCellSizeInt )
+
+    elif inGeneratorStr == 'caves':
+        aaModel = createCaveModel( inColumnsInt                  ,
+                                   inRowsInt                     ,
+                                   inSeedInt                     ,
+                                   inCellSizeInt = inCellSizeInt )
+
+    else:
+        raise ValueError( 'Unknown generator: {0}'.format( inGeneratorStr ) )
+
+    # Mazes and rooms joined by corridors have a single region.
+    placeGoals( aaModel                                                ,
+                inGeneratorStr in ( 'division' , 'maze' , 'rooms' ) )
+
+    return aaModel
+
+def main( inArgs = None ):
+    '''
+    Generate a map from the command line and write it to a grid file.
+
+    Args:
+        inArgs (list[str]|None): Command line arguments, None for sys.argv.
+
+    Returns:
+        model.AAGridModel: generated model.
+    '''
+    parser = argparse.ArgumentParser( description = 'Generate a map and write it to a grid file.' )
+    parser.add_argument( 'generator' , choices = GENERATORS )
+    parser.add_argument( 'output'    , help = 'grid file to write, see mapio.saveModel' )
+    parser.add_argument( '--columns' , type = int , default = 256 )
+    parser.add_argument( '--rows'    , type = int , default = 256 )
+    parser.add_argument( '--seed'    , type = int , default = 0 )
+    parser.add_argument( '--density' , type = float , default = DEFAULT_DENSITY_FLOAT ,
+                         help = 'chance of each cell to be a wall in random maps' )
+
+    args = parser.parse_args( inArgs )
+
+    aaModel = generateModel( args.generator ,
+                             args.columns   ,
+                             args.rows      ,
+                             args.seed      ,
+                             args.density   )
+
+    mapio.saveModel( aaModel     ,
+                     args.output )
+
+    return aaModel
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,7 @@
+import chunks
+import components
+import flowfield
+import model
 import node
 
 class AAGrid(object):
@@ -14,26 +18,81 @@ class AAGrid(object):
     # type: int
     HEIGHT_INT = 720
 
-    def __init__( self ):
+    # Most cells changed at once whose component labels are updated
+    # one by one, the labels are computed again for larger edits.
+    # type: int
+    MAX_RELABEL_CELLS_INT = 64
+
+    def __init__( self                ,
+                  inColumnsInt = None ,
+                  inRowsInt    = None ,
+                  inModel      = None ):
         '''
         Grid Class that will handle the creation and
         accessing of nodes among other methods.
-        '''
-        # Nodes with their hashes
-        # type: dict[node.AANode, str]
-        self.nodeHashesMapping = {}
 
-        # Hashes with their nodes.
-        # type: dict[str, node.AANode]
-        self.hashNodesMapping  = {}
-
-        # Complete set of nodes.
-        # type: dict[str, node.AANode]
-        self.gridNodes         = set()
+        Args:
+            inColumnsInt (int|None): Amount of nodes in X axis,
+                                     None to fill WIDTH_INT.
+
+            inRowsInt (int|None): Amount of nodes in Y axis,
+                                  None to fill HEIGHT_INT.
+
+            inModel (model.AAGridModel|None): Model of the grid, as read
+                                              by mapio.loadMap or a
+                                              chunks.AAChunkedGridModel
+                                              for very large grids, None
+                                              to create a blank one of
+                                              inColumnsInt by inRowsInt.
+        '''
+        if inColumnsInt is None:
+            inColumnsInt = self.WIDTH_INT // self.NODE_SIZE_INT
+
+        if inRowsInt is None:
+            inRowsInt = self.HEIGHT_INT // self.NODE_SIZE_INT
+
+        if inModel is None:
+            inModel = model.AAGridModel( inColumnsInt       ,
+                                         inRowsInt          ,
+                                         self.NODE_SIZE_INT )
+
+        # Storage of the state of every cell, nodes read and write on it.
+        # type: model.AAGridModel
+        self.model = inModel
+
+        # Connected regions of the cells, to know if a path can exist.
+        # type: components.AAComponentLabels|chunks.AAChunkedComponentLabels
+        if self.model.CHUNKED_BOOL:
+            self.components = chunks.AAChunkedComponentLabels( self.model )
+        else:
+            self.components = components.AAComponentLabels( self.model )
+
+        # Called with the index of each cell that switched between
+        # wall and not wall or changed terrain cost, after the component
+        # labels are updated.
+        # type: list[callable]
+        self.cellChangedCallbacks = []
+
+        # Cost to a goal and next step towards it of every cell,
+        # see buildFlowField.
+        # type: flowfield.AAFlowField
+        self.flowField = flowfield.AAFlowField( self.model )
+        self.cellChangedCallbacks.append( self.flowField.notifyCellChanged )
+
+        # Incremented by each change of a wall, terrain cost or goal,
+        # see pathcache.AAPathCache.
+        # type: int
+        self.versionInt = 0
+
+        # Highest amount of goal nodes, the oldest goal is removed when
+        # setting another one, None for no limit.
+        # type: int|None
+        self.maxGoalsInt = 2
+
+        # Nodes by the index of their cell, only the cells with a node.
+        # type: dict[int, node.AANode]
+        self.gridNodes = {}
 
-        # List of Nodes set as Start and destination
-        # type: list[node.AANode]
-        self.goalNodes = []
 
     def createNode( self       ,
                     inPosX     ,
@@ -41,7 +100,7 @@ class AAGrid(object):
                     inNodeSize ):
         '''
         Create a node with provided coordinates and size
-        and add it into our dictionaries.
+        and add it into the grid.
 
         Args:
             inPosX (int): Position in X axis to put the node at.
@@ -53,18 +112,32 @@ class AAGrid(object):
         Returns:
             node.AANode: created Node.
         '''
+        nodeIndex = self.model.indexOf( inPosX // self.NODE_SIZE_INT ,
+                                        inPosY // self.NODE_SIZE_INT )
+
         aaNode = node.AANode( inPosX     ,
                               inPosY     ,
-                              inNodeSize )
-
-        hashCode = '{0}{1}'.format( inPosX , inPosY )
+                              inNodeSize ,
+                              self.model ,
+                              nodeIndex  )
 
-        self.nodeHashesMapping[ aaNode ]  = hashCode
-        self.hashNodesMapping[ hashCode ] = aaNode
-        self.gridNodes.add( aaNode )
+        self.gridNodes[ nodeIndex ] = aaNode
 
         return aaNode
 
+    def getNode( self    ,
+                 inIndex ):
+        '''
+        Get the node of a cell.
+
+        Args:
+            inIndex (int): Index of the cell.
+
+        Returns:
+            node.AANode|None: node at the cell.
+        '''
+        return self.gridNodes.get( inIndex )
+
     def getNeighbours( self   ,
                        inNode ):
         '''
@@ -76,70 +149,358 @@ class AAGrid(object):
         Yields:
             node.AANode: neighbour node.
         '''
-        nodePosX = inNode.posX
-        nodePosY = inNode.posY
-
-        surroundingHashes = ( '{0}{1}'.format(nodePosX + self.NODE_SIZE_INT ,
-                                              nodePosY                      ) ,
-                              '{0}{1}'.format(nodePosX - self.NODE_SIZE_INT ,
-                                              nodePosY                      ) ,
-                              '{0}{1}'.format(nodePosX                      ,
-                                              nodePosY + self.NODE_SIZE_INT ) ,
-                              '{0}{1}'.format(nodePosX                      ,
-                                              nodePosY - self.NODE_SIZE_INT ) ,
-                              '{0}{1}'.format(nodePosX + self.NODE_SIZE_INT ,
-                                              nodePosY + self.NODE_SIZE_INT ) ,
-                              '{0}{1}'.format(nodePosX - self.NODE_SIZE_INT ,
-                                              nodePosY + self.NODE_SIZE_INT ) ,
-                              '{0}{1}'.format(nodePosX + self.NODE_SIZE_INT ,
-                                              nodePosY - self.NODE_SIZE_INT ) ,
-                              '{0}{1}'.format(nodePosX - self.NODE_SIZE_INT ,
-                                              nodePosY - self.NODE_SIZE_INT ) )
-
-        for nodeHash in surroundingHashes:
-
-            currentNode = self.hashNodesMapping.get( nodeHash )
+        for nodeIndex in self.model.getNeighbours( inNode.cellIndex ):
+
+            currentNode = self.gridNodes.get( nodeIndex )
 
             if not currentNode:
                 continue
 
             yield currentNode
 
-    def reset( self ):
+    def applyStates( self            ,
+                     inIndexStates   ):
         '''
-        Reset all Nodes to start finding a path again,
-        Will retain the nodes with walls and goal states.
+        Set the state of many cells without repainting their nodes,
+        following the same rules as node.AANode.setToExplored and
+        node.AANode.setToPath, except that walls are never set to path.
+
+        Note:
+            States of a search played back after the walls changed may
+            reach walls painted since, writing over them would leave the
+            walls out of the component labels and cell changed callbacks.
+
+        Args:
+            inIndexStates (list[tuple(int, int)]): Cell index and state
+                                                   to set to.
+
+        Returns:
+            list[int]: indices of the cells whose state changed.
+        '''
+        states = self.model.states
+
+        changedIndices = []
+
+        for nodeIndex , newState in inIndexStates:
+
+            currentState = states[ nodeIndex ]
+
+            if currentState == newState:
+                continue
+
+            if currentState in node.AANode.NON_EXPLORING_STATES:
+                continue
+
+            self.model.setSearchState( nodeIndex ,
+                                       newState  )
+
+            changedIndices.append( nodeIndex )
+
+        return changedIndices
+
+    def getCellsRect( self      ,
+                      inIndices ):
+        '''
+        Get the rectangle in scene coordinates containing cells.
+
+        Args:
+            inIndices (list[int]): Indices of the cells.
+
+        Returns:
+            tuple(int, int, int, int): x, y, width and height of the rectangle.
+        '''
+        columnsInt = self.model.columnsInt
+
+        columns = [ nodeIndex % columnsInt for nodeIndex in inIndices ]
+        rows    = [ nodeIndex // columnsInt for nodeIndex in inIndices ]
+
+        left = min( columns ) * self.NODE_SIZE_INT
+        top  = min( rows ) * self.NODE_SIZE_INT
+
+        return ( left                                               ,
+                 top                                                ,
+                 ( max( columns ) + 1 ) * self.NODE_SIZE_INT - left ,
+                 ( max( rows ) + 1 ) * self.NODE_SIZE_INT - top     )
+
+    def getIndexAt( self   ,
+                    inPosX ,
+                    inPosY ):
+        '''
+        Get the cell at a position in scene coordinates.
+
+        Args:
+            inPosX (float): Position in X axis.
+
+            inPosY (float): Position in Y axis.
+
+        Returns:
+            int|None: index of the cell, None if outside the grid.
+        '''
+        column = int( inPosX // self.NODE_SIZE_INT )
+        row    = int( inPosY // self.NODE_SIZE_INT )
+
+        if not 0 <= column < self.model.columnsInt:
+            return None
+
+        if not 0 <= row < self.model.rowsInt:
+            return None
+
+        return self.model.indexOf( column ,
+                                   row    )
+
+    def switchWallState( self    ,
+                         inIndex ):
+        '''
+        Switch a cell between a wall or blank state,
+        same rules as node.AANode.switchWallState except that
+        explored and path cells also become walls, so walls can be
+        drawn over the path displayed while live replanning.
+
+        Args:
+            inIndex (int): Index of the cell.
+
+        Returns:
+            bool: True if the state changed, False otherwise.
+        '''
+        states = self.model.states
+
+        if states[ inIndex ] in ( node.AANode.BLANK_STATE    ,
+                                  node.AANode.EXPLORED_STATE ,
+                                  node.AANode.PATH_STATE     ):
+            states[ inIndex ] = node.AANode.WALL_STATE
+
+        elif states[ inIndex ] == node.AANode.WALL_STATE:
+            states[ inIndex ] = node.AANode.BLANK_STATE
+
+        else:
+            return False
+
+        self.notifyCellChanged( inIndex )
+
+        return True
+
+    def setWallStates( self       ,
+                       inIndices  ,
+                       inWallBool ):
+        '''
+        Set many cells as walls or blank at once, same rules as
+        switchWallState, goals are left as they are.
+
+        Note:
+            Above MAX_RELABEL_CELLS_INT cells the component labels are
+            dropped and computed again on the next query instead of
+            updated cell by cell.
+
+        Args:
+            inIndices (list[int]): Indices of the cells.
+
+            inWallBool (bool): True to set as walls, False to set as blank.
+
+        Returns:
+            list[int]: indices of the cells whose state changed.
+        '''
+        states = self.model.states
+
+        if inWallBool:
+            changedIndices = [ cellIndex for cellIndex in inIndices
+                               if states[ cellIndex ] in ( node.AANode.BLANK_STATE    ,
+                                                           node.AANode.EXPLORED_STATE ,
+                                                           node.AANode.PATH_STATE     ) ]
+        else:
+            changedIndices = [ cellIndex for cellIndex in inIndices
+                               if states[ cellIndex ] == node.AANode.WALL_STATE ]
+
+        newState = node.AANode.WALL_STATE if inWallBool else node.AANode.BLANK_STATE
+
+        relabelBool = len( changedIndices ) <= self.MAX_RELABEL_CELLS_INT
+
+        for cellIndex in changedIndices:
+
+            states[ cellIndex ] = newState
+
+            # Each label update expects a single cell to have changed
+            # since the last one, so it runs before the next cell changes.
+            if relabelBool:
+                self.components.updateCell( cellIndex )
+
+        if not relabelBool:
+            self.components.invalidate()
+
+        self.notifyCellsChanged( changedIndices )
+
+        return changedIndices
+
+    def setCellCosts( self      ,
+                      inIndices ,
+                      inCost    ):
+        '''
+        Set the terrain cost of many cells at once.
+
+        Args:
+            inIndices (list[int]): Indices of the cells.
+
+            inCost (int): Cost, from model.DEFAULT_COST to model.MAX_COST.
+
+        Returns:
+            list[int]: indices of the cells whose cost changed.
+        '''
+        changedIndices = [ cellIndex for cellIndex in inIndices
+                           if self.model.setCost( cellIndex ,
+                                                  inCost    ) ]
+
+        self.notifyCellsChanged( changedIndices )
+
+        return changedIndices
+
+    def notifyCellChanged( self    ,
+                           inIndex ):
+        '''
+        Update the component labels and call the cell changed callbacks
+        after a cell switched between wall and not wall or changed
+        terrain cost.
+
+        Args:
+            inIndex (int): Index of the changed cell.
 
         Returns:
             None: No return value.
         '''
-        for aaNode in self.gridNodes:
-            aaNode.reset()
+        self.components.updateCell( inIndex )
 
+        self.notifyCellsChanged( [ inIndex ] )
 
-    def setGoalNode( self   ,
-                     inNode ):
+    def notifyCellsChanged( self      ,
+                            inIndices ):
         '''
-        Set inNode as Goal node state,
-        will delete a previous goal Node if there are two already.
+        Call the cell changed callbacks after cells switched between
+        wall and not wall or changed terrain cost, as a single change
+        of the grid version.
+
+        Note:
+            The component labels are not updated, they have to be
+            updated as each cell changes, see setWallStates.
 
         Args:
-            inNode (node.AANode): Node to set as Goal state.
+            inIndices (list[int]): Indices of the changed cells.
 
         Returns:
             None: No return value.
         '''
-        if inNode.currentState == node.AANode.GOAL_POINT_STATE:
-                return
+        if not inIndices:
+            return
+
+        self.versionInt += 1
+
+        for callback in self.cellChangedCallbacks:
+            for cellIndex in inIndices:
+                callback( cellIndex )
+
+    def setCost( self    ,
+                 inIndex ,
+                 inCost  ):
+        '''
+        Set the terrain cost of a cell.
+
+        Args:
+            inIndex (int): Index of the cell.
+
+            inCost (int): Cost, from model.DEFAULT_COST to model.MAX_COST.
+
+        Returns:
+            bool: True if the cost changed, False otherwise.
+        '''
+        if not self.model.setCost( inIndex ,
+                                   inCost  ):
+            return False
+
+        self.notifyCellChanged( inIndex )
+
+        return True
+
+    def reset( self ):
+        '''
+        Reset the Nodes displaying a search to start finding a path again,
+        Will retain the nodes with walls and goal states.
+
+        Returns:
+            list[int]: indices of the reset cells.
+        '''
+        return self.model.resetSearchStates()
+
+    @property
+    def goalNodes( self ):
+        '''
+        Gets the Nodes set as Start and destination.
+
+        Returns:
+            list[node.AANode|None]: goal nodes, None for cells without node.
+        '''
+        return [ self.gridNodes.get( goalIndex ) for goalIndex in self.model.goalIndices ]
+
+    def setGoalNode( self    ,
+                     inIndex ):
+        '''
+        Set a cell as Goal node state,
+        will delete the oldest goal Node if there are maxGoalsInt already.
+
+        Args:
+            inIndex (int): Index of the cell to set as Goal state.
+
+        Returns:
+            list[int]: indices of the cells whose state changed.
+        '''
+        states = self.model.states
 
-        inNode.switchGoalPointState()
+        if states[ inIndex ] == node.AANode.GOAL_POINT_STATE:
+            return []
+
+        wasWallBool = states[ inIndex ] == node.AANode.WALL_STATE
+
+        states[ inIndex ] = node.AANode.GOAL_POINT_STATE
+
+        if wasWallBool:
+            self.notifyCellChanged( inIndex )
+        else:
+            self.versionInt += 1
+
+        self.model.setGoalIndices( self.model.goalIndices + [ inIndex ] )
+
+        return [ inIndex ] + self.removeExtraGoals()
+
+    def setMaxGoals( self          ,
+                     inMaxGoalsInt ):
+        '''
+        Set the highest amount of goal nodes, removing the oldest
+        goals above it.
+
+        Args:
+            inMaxGoalsInt (int|None): Highest amount of goals,
+                                      None for no limit.
+
+        Returns:
+            list[int]: indices of the cells whose state changed.
+        '''
+        self.maxGoalsInt = inMaxGoalsInt
+
+        return self.removeExtraGoals()
+
+    def removeExtraGoals( self ):
+        '''
+        Set back to blank the oldest goals above maxGoalsInt.
+
+        Returns:
+            list[int]: indices of the removed goal cells.
+        '''
+        goalIndices = list( self.model.goalIndices )
 
-        if len( self.goalNodes ) == 2:
+        if self.maxGoalsInt is None or len( goalIndices ) <= self.maxGoalsInt:
+            return []
 
-            nodeToRemove = self.goalNodes[ 0 ]
+        removedIndices = goalIndices[ : len( goalIndices ) - self.maxGoalsInt ]
 
-            nodeToRemove.currentState = node.AANode.BLANK_STATE
+        for removedIndex in removedIndices:
+            self.model.states[ removedIndex ] = node.AANode.BLANK_STATE
 
-            self.goalNodes.remove( nodeToRemove )
+        self.model.setGoalIndices( goalIndices[ len( removedIndices ) : ] )
 
-        self.goalNodes.append( inNode )
+        return removedIndices
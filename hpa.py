@@ -0,0 +1,611 @@
+import heapq
+import itertools
+import time
+
+import instrumentation
+import model
+import search
+
+class AAHierarchicalSearch(search.AAAStarSearch):
+
+    # Name displayed when choosing the search algorithm.
+    # type: str
+    NAME = 'HPA*'
+
+    # Amount of cells per side of a cluster.
+    # type: int
+    CLUSTER_SIZE_INT = 10
+
+    # Shortest run of open cells along a cluster border that gets an
+    # entrance at each end instead of a single one at its middle.
+    # type: int
+    SPLIT_ENTRANCE_INT = 6
+
+    # Shortest distance between start and end, in clusters, searched on
+    # the graph of entrances, closer cells are searched with A* directly.
+    # type: int
+    ABSTRACT_CLUSTERS_INT = 2
+
+    # Reads the cells of every cluster it builds the graph of.
+    # type: bool
+    LOCAL_READS_BOOL = False
+
+    def __init__( self    ,
+                  inModel ):
+        '''
+        Hierarchical A* search, the grid is split into square clusters
+        connected through entrances along their borders. Searches run on
+        the graph of entrances first, then each step between entrances
+        is refined with a search inside its cluster.
+
+        Note:
+            Paths are near optimal, they cross cluster borders only at
+            entrances. Cells closer than ABSTRACT_CLUSTERS_INT clusters
+            are searched with A*, which is cheap at that distance. The
+            graph of each cluster is built the first time a search
+            reaches it and kept until a cell of the cluster changes, see
+            notifyCellChanged. When the graph finds no path, which can
+            happen with paths only crossing borders diagonally, the
+            search falls back to A*.
+
+        Args:
+            inModel (model.AAGridModel): Grid model to find paths on.
+        '''
+        super( AAHierarchicalSearch , self ).__init__( inModel )
+
+        # Amount of clusters in X and Y axis.
+        # type: int
+        self.clusterColumnsInt = -( -inModel.columnsInt // self.CLUSTER_SIZE_INT )
+        self.clusterRowsInt    = -( -inModel.rowsInt // self.CLUSTER_SIZE_INT )
+
+        # Entrances of each border by the ids of the clusters at both
+        # sides, lowest id first, as pairs of cells and the cost of moving
+        # from one to the other.
+        # type: dict[tuple(int, int), list[tuple(int, int, int)]]
+        self.borderEntrances = {}
+
+        # Graph of each built cluster, the cells of its entrances with
+        # the cost to the other entrances of the cluster and to the
+        # cells across its borders.
+        # type: dict[int, dict[int, list[tuple(int, int)]]]
+        self.clusterGraphs = {}
+
+    def getClusterId( self    ,
+                      inIndex ):
+        '''
+        Get the cluster a cell belongs to.
+
+        Args:
+            inIndex (int): Index of the cell.
+
+        Returns:
+            int: id of the cluster, by row of clusters then column.
+        '''
+        row , column = divmod( inIndex , self.model.columnsInt )
+
+        return ( ( row // self.CLUSTER_SIZE_INT ) * self.clusterColumnsInt +
+                 column // self.CLUSTER_SIZE_INT                            )
+
+    def getClusterBounds( self        ,
+                          inClusterId ):
+        '''
+        Get the cells covered by a cluster.
+
+        Args:
+            inClusterId (int): Id of the cluster.
+
+        Returns:
+            tuple(int, int, int, int): first column, first row, last column
+                                       and last row, last ones excluded.
+        '''
+        clusterRow , clusterColumn = divmod( inClusterId , self.clusterColumnsInt )
+
+        firstColumn = clusterColumn * self.CLUSTER_SIZE_INT
+        firstRow    = clusterRow * self.CLUSTER_SIZE_INT
+
+        return ( firstColumn                                                      ,
+                 firstRow                                                         ,
+                 min( firstColumn + self.CLUSTER_SIZE_INT , self.model.columnsInt ) ,
+                 min( firstRow + self.CLUSTER_SIZE_INT , self.model.rowsInt )       )
+
+    def notifyCellChanged( self    ,
+                           inIndex ):
+        '''
+        Drop the graph of the cluster of a changed cell, and the
+        entrances and graph of the clusters across the borders the
+        cell is on.
+
+        Args:
+            inIndex (int): Index of the changed cell.
+
+        Returns:
+            None: No return value.
+        '''
+        clusterId = self.getClusterId( inIndex )
+
+        self.clusterGraphs.pop( clusterId , None )
+
+        column , row = self.model.coordinatesOf( inIndex )
+
+        firstColumn , firstRow , lastColumn , lastRow = self.getClusterBounds( clusterId )
+
+        otherClusterIds = []
+
+        if column == firstColumn and firstColumn > 0:
+            otherClusterIds.append( clusterId - 1 )
+
+        if column == lastColumn - 1 and lastColumn < self.model.columnsInt:
+            otherClusterIds.append( clusterId + 1 )
+
+        if row == firstRow and firstRow > 0:
+            otherClusterIds.append( clusterId - self.clusterColumnsInt )
+
+        if row == lastRow - 1 and lastRow < self.model.rowsInt:
+            otherClusterIds.append( clusterId + self.clusterColumnsInt )
+
+        for otherClusterId in otherClusterIds:
+
+            self.clusterGraphs.pop( otherClusterId , None )
+
+            self.borderEntrances.pop( ( min( clusterId , otherClusterId ) ,
+                                        max( clusterId , otherClusterId ) ) , None )
+
+    def getBorderEntrances( self         ,
+                            inClusterId  ,
+                            inOtherId    ):
+        '''
+        Get the entrances between two clusters next to each other,
+        one or two per run of cells that are open at both sides.
+
+        Args:
+            inClusterId (int): Id of the cluster at the left or top.
+
+            inOtherId (int): Id of the cluster at the right or bottom.
+
+        Returns:
+            list[tuple(int, int, int)]: cell at the first cluster, cell
+                                        at the other cluster and cost of
+                                        moving between them.
+        '''
+        borderKey = ( inClusterId , inOtherId )
+
+        entrances = self.borderEntrances.get( borderKey )
+
+        if entrances is not None:
+            return entrances
+
+        aaModel = self.model
+
+        firstColumn , firstRow , lastColumn , lastRow = self.getClusterBounds( inClusterId )
+
+        # With a single column of clusters the next id is the cluster below.
+        if inOtherId == inClusterId + 1 and self.clusterColumnsInt > 1:
+            cellPairs = [ ( aaModel.indexOf( lastColumn - 1 , row ) ,
+                            aaModel.indexOf( lastColumn , row )     )
+                          for row in range( firstRow , lastRow ) ]
+        else:
+            cellPairs = [ ( aaModel.indexOf( column , lastRow - 1 ) ,
+                            aaModel.indexOf( column , lastRow )     )
+                          for column in range( firstColumn , lastColumn ) ]
+
+        states = aaModel.states
+
+        # Runs of pairs with both cells open, as positions in cellPairs.
+        runs = []
+
+        for position , ( cellIndex , otherIndex ) in enumerate( cellPairs ):
+
+            if states[ cellIndex ] == model.WALL_STATE or states[ otherIndex ] == model.WALL_STATE:
+                continue
+
+            if runs and runs[ -1 ][ 1 ] == position - 1:
+                runs[ -1 ][ 1 ] = position
+            else:
+                runs.append( [ position , position ] )
+
+        entrances = []
+
+        for runStart , runEnd in runs:
+
+            if runEnd - runStart + 1 >= self.SPLIT_ENTRANCE_INT:
+                positions = ( runStart , runEnd )
+            else:
+                positions = ( ( runStart + runEnd ) // 2 , )
+
+            for position in positions:
+
+                cellIndex , otherIndex = cellPairs[ position ]
+
+                stepCost = dict( aaModel.getNeighbourSteps( cellIndex ) )[ otherIndex ]
+
+                entrances.append( ( cellIndex  ,
+                                    otherIndex ,
+                                    stepCost   ) )
+
+        self.borderEntrances[ borderKey ] = entrances
+
+        return entrances
+
+    def getClusterCosts( self         ,
+                         inStartIndex ,
+                         inClusterId  ):
+        '''
+        Get the cost from a cell to every cell of its cluster it can
+        reach without leaving the cluster.
+
+        Args:
+            inStartIndex (int): Index of the cell to start from.
+
+            inClusterId (int): Id of the cluster of the cell.
+
+        Returns:
+            dict[int, int]: cost of each reached cell.
+        '''
+        aaModel = self.model
+
+        states = aaModel.states
+
+        firstColumn , firstRow , lastColumn , lastRow = self.getClusterBounds( inClusterId )
+
+        columnsInt = aaModel.columnsInt
+
+        costs = { inStartIndex : 0 }
+
+        openHeap = [ ( 0 , inStartIndex ) ]
+
+        while openHeap:
+
+            currentCost , currentIndex = heapq.heappop( openHeap )
+
+            if currentCost != costs[ currentIndex ]:
+                continue
+
+            for neighbourIndex , stepCost in aaModel.getNeighbourSteps( currentIndex ):
+
+                if states[ neighbourIndex ] == model.WALL_STATE:
+                    continue
+
+                row , column = divmod( neighbourIndex , columnsInt )
+
+                if not ( firstColumn <= column < lastColumn and firstRow <= row < lastRow ):
+                    continue
+
+                newCost = currentCost + stepCost
+
+                if newCost < costs.get( neighbourIndex , newCost + 1 ):
+                    costs[ neighbourIndex ] = newCost
+                    heapq.heappush( openHeap , ( newCost , neighbourIndex ) )
+
+        return costs
+
+    def getClusterGraph( self        ,
+                         inClusterId ):
+        '''
+        Get the graph of a cluster, building it if needed.
+
+        Args:
+            inClusterId (int): Id of the cluster.
+
+        Returns:
+            dict[int, list[tuple(int, int)]]: each entrance cell of the
+                                              cluster with the cells it
+                                              connects to and their cost.
+        '''
+        clusterGraph = self.clusterGraphs.get( inClusterId )
+
+        if clusterGraph is not None:
+            return clusterGraph
+
+        clusterRow , clusterColumn = divmod( inClusterId , self.clusterColumnsInt )
+
+        clusterGraph = {}
+
+        # Entrances of the four borders, seen from this cluster.
+        borders = []
+
+        if clusterColumn > 0:
+            borders.append( ( inClusterId - 1 , inClusterId , 1 ) )
+
+        if clusterColumn < self.clusterColumnsInt - 1:
+            borders.append( ( inClusterId , inClusterId + 1 , 0 ) )
+
+        if clusterRow > 0:
+            borders.append( ( inClusterId - self.clusterColumnsInt , inClusterId , 1 ) )
+
+        if clusterRow < self.clusterRowsInt - 1:
+            borders.append( ( inClusterId , inClusterId + self.clusterColumnsInt , 0 ) )
+
+        for clusterId , otherId , sideInt in borders:
+
+            for entrance in self.getBorderEntrances( clusterId ,
+                                                     otherId   ):
+
+                clusterGraph.setdefault( entrance[ sideInt ] , [] ).append( ( entrance[ 1 - sideInt ] ,
+                                                                              entrance[ 2 ]           ) )
+
+        entranceIndices = list( clusterGraph )
+
+        for entranceIndex in entranceIndices:
+
+            costs = self.getClusterCosts( entranceIndex ,
+                                          inClusterId   )
+
+            clusterGraph[ entranceIndex ].extend( ( otherIndex , costs[ otherIndex ] )
+                                                  for otherIndex in entranceIndices
+                                                  if otherIndex != entranceIndex and otherIndex in costs )
+
+        self.clusterGraphs[ inClusterId ] = clusterGraph
+
+        return clusterGraph
+
+    def findPath( self                      ,
+                  inStartIndex              ,
+                  inEndIndex                ,
+                  inExploredCallback = None ):
+        '''
+        Find a path between the start and end cell.
+
+        Args:
+            inStartIndex (int): Index of the cell to start from.
+
+            inEndIndex (int): Index of the cell to reach.
+
+            inExploredCallback (callable|None): Called with the entrance
+                                                cells reached by each
+                                                expansion as soon as they
+                                                are known.
+
+        Returns:
+            search.AASearchResult: Found path and explored entrances.
+        '''
+        result = search.AASearchResult()
+
+        if inStartIndex == inEndIndex:
+            result.pathIndices = [ inStartIndex ]
+            return result
+
+        aaModel = self.model
+
+        if ( aaModel.distance( inStartIndex , inEndIndex ) <
+             self.ABSTRACT_CLUSTERS_INT * self.CLUSTER_SIZE_INT * aaModel.STRAIGHT_COST_INT ):
+            return super( AAHierarchicalSearch , self ).findPath( inStartIndex       ,
+                                                                  inEndIndex         ,
+                                                                  inExploredCallback )
+
+        startClusterId = self.getClusterId( inStartIndex )
+        endClusterId   = self.getClusterId( inEndIndex )
+
+        # The start and end cells are linked to the entrances of their
+        # clusters, and to each other when in the same cluster.
+        startCosts = self.getClusterCosts( inStartIndex   ,
+                                           startClusterId )
+        endCosts   = self.getClusterCosts( inEndIndex   ,
+                                           endClusterId )
+
+        startSteps = [ ( entranceIndex , startCosts[ entranceIndex ] )
+                       for entranceIndex in self.getClusterGraph( startClusterId )
+                       if entranceIndex in startCosts ]
+
+        if startClusterId == endClusterId and inEndIndex in startCosts:
+            startSteps.append( ( inEndIndex               ,
+                                 startCosts[ inEndIndex ] ) )
+
+        endSteps = dict( ( entranceIndex , endCosts[ entranceIndex ] )
+                         for entranceIndex in self.getClusterGraph( endClusterId )
+                         if entranceIndex in endCosts )
+
+        gCosts        = { inStartIndex : 0 }
+        parentIndices = { inStartIndex : model.NO_PARENT }
+
+        closedIndices = set()
+
+        insertionCount = itertools.count()
+
+        searchInstrumentation = self.instrumentation
+
+        if searchInstrumentation:
+            searchInstrumentation.countHeuristic()
+
+        startHCost = aaModel.distance( inStartIndex , inEndIndex )
+
+        openHeap = [ ( startHCost             ,
+                       startHCost             ,
+                       next( insertionCount ) ,
+                       inStartIndex           ) ]
+
+        while openHeap:
+
+            if self.cancelledBool:
+                result.cancelledBool = True
+                return result
+
+            fCost , hCost , _ , currentIndex = heapq.heappop( openHeap )
+
+            if currentIndex in closedIndices:
+                continue
+
+            if fCost != gCosts[ currentIndex ] + hCost:
+                continue
+
+            closedIndices.add( currentIndex )
+
+            result.expandedNodesInt += 1
+
+            if searchInstrumentation:
+                searchInstrumentation.expand( currentIndex        ,
+                                              len( openHeap ) + 1 )
+
+            if currentIndex == inEndIndex:
+
+                abstractPath = self.retracePath( parentIndices ,
+                                                 inEndIndex    )
+
+                startTime = time.time()
+
+                result.pathIndices = self.refinePath( abstractPath )
+
+                if searchInstrumentation:
+                    searchInstrumentation.addPhaseSeconds( instrumentation.RETRACE_PHASE ,
+                                                           time.time() - startTime       )
+
+                return result
+
+            if currentIndex == inStartIndex:
+                steps = list( startSteps )
+                steps.extend( step for step in self.getClusterGraph( startClusterId ).get( currentIndex , [] )
+                              if self.getClusterId( step[ 0 ] ) != startClusterId )
+            else:
+                steps = list( self.getClusterGraph( self.getClusterId( currentIndex ) )[ currentIndex ] )
+
+            if currentIndex in endSteps:
+                steps.append( ( inEndIndex                  ,
+                                endSteps[ currentIndex ] ) )
+
+            exploredIndices = []
+
+            currentCost = gCosts[ currentIndex ]
+
+            for neighbourIndex , stepCost in steps:
+
+                exploredIndices.append( neighbourIndex )
+
+                if neighbourIndex in closedIndices:
+                    continue
+
+                newCostToNeighbour = currentCost + stepCost
+
+                if newCostToNeighbour < gCosts.get( neighbourIndex , newCostToNeighbour + 1 ):
+
+                    if searchInstrumentation:
+                        searchInstrumentation.relax( currentIndex             ,
+                                                     neighbourIndex           ,
+                                                     newCostToNeighbour       ,
+                                                     neighbourIndex in gCosts )
+                        searchInstrumentation.countHeuristic()
+
+                    neighbourHCost = aaModel.distance( neighbourIndex , inEndIndex )
+
+                    gCosts[ neighbourIndex ]        = newCostToNeighbour
+                    parentIndices[ neighbourIndex ] = currentIndex
+
+                    heapq.heappush( openHeap , ( newCostToNeighbour + neighbourHCost ,
+                                                 neighbourHCost                      ,
+                                                 next( insertionCount )              ,
+                                                 neighbourIndex                      ) )
+
+            result.exploredIndices.append( exploredIndices )
+
+            if inExploredCallback:
+                inExploredCallback( exploredIndices )
+
+        # Open cells only connected through diagonal moves across
+        # cluster borders, search the grid instead.
+        fallbackResult = super( AAHierarchicalSearch , self ).findPath( inStartIndex       ,
+                                                                        inEndIndex         ,
+                                                                        inExploredCallback )
+
+        fallbackResult.expandedNodesInt += result.expandedNodesInt
+        fallbackResult.exploredIndices   = result.exploredIndices + fallbackResult.exploredIndices
+
+        return fallbackResult
+
+    def refinePath( self            ,
+                    inAbstractPath  ):
+        '''
+        Get the cells between consecutive cells of a path through the
+        graph of entrances, searching inside the cluster of both cells.
+
+        Args:
+            inAbstractPath (list[int]): Indices of the start, entrance and
+                                        end cells of the path.
+
+        Returns:
+            list[int]: Indices of every cell of the path.
+        '''
+        pathIndices = inAbstractPath[ : 1 ]
+
+        for fromIndex , toIndex in zip( inAbstractPath , inAbstractPath[ 1 : ] ):
+
+            clusterId = self.getClusterId( fromIndex )
+
+            # Cells at both sides of a border are next to each other.
+            if clusterId != self.getClusterId( toIndex ):
+                pathIndices.append( toIndex )
+                continue
+
+            pathIndices.extend( self.findClusterPath( fromIndex ,
+                                                      toIndex   ,
+                                                      clusterId )[ 1 : ] )
+
+        return pathIndices
+
+    def findClusterPath( self         ,
+                         inStartIndex ,
+                         inEndIndex   ,
+                         inClusterId  ):
+        '''
+        Find a path between two cells without leaving their cluster.
+
+        Args:
+            inStartIndex (int): Index of the cell to start from.
+
+            inEndIndex (int): Index of the cell to reach.
+
+            inClusterId (int): Id of the cluster of both cells.
+
+        Returns:
+            list[int]: Indices of the cells from start to end,
+                       empty if there is no path inside the cluster.
+        '''
+        aaModel = self.model
+
+        states = aaModel.states
+
+        firstColumn , firstRow , lastColumn , lastRow = self.getClusterBounds( inClusterId )
+
+        columnsInt = aaModel.columnsInt
+
+        gCosts        = { inStartIndex : 0 }
+        parentIndices = { inStartIndex : model.NO_PARENT }
+
+        closedIndices = set()
+
+        openHeap = [ ( aaModel.distance( inStartIndex , inEndIndex ) ,
+                       0                                            ,
+                       inStartIndex                                 ) ]
+
+        while openHeap:
+
+            _ , currentCost , currentIndex = heapq.heappop( openHeap )
+
+            if currentIndex in closedIndices or currentCost != gCosts[ currentIndex ]:
+                continue
+
+            if currentIndex == inEndIndex:
+                return self.retracePath( parentIndices ,
+                                         inEndIndex    )
+
+            closedIndices.add( currentIndex )
+
+            for neighbourIndex , stepCost in aaModel.getNeighbourSteps( currentIndex ):
+
+                if states[ neighbourIndex ] == model.WALL_STATE or neighbourIndex in closedIndices:
+                    continue
+
+                row , column = divmod( neighbourIndex , columnsInt )
+
+                if not ( firstColumn <= column < lastColumn and firstRow <= row < lastRow ):
+                    continue
+
+                newCost = currentCost + stepCost
+
+                if newCost < gCosts.get( neighbourIndex , newCost + 1 ):
+
+                    gCosts[ neighbourIndex ]        = newCost
+                    parentIndices[ neighbourIndex ] = currentIndex
+
+                    heapq.heappush( openHeap , ( newCost + aaModel.distance( neighbourIndex , inEndIndex ) ,
+                                                 newCost                                                  ,
+                                                 neighbourIndex                                           ) )
+
+        return []
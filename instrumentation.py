@@ -0,0 +1,217 @@
+import time
+
+# Phase finding the path, without following its parents back.
+# type: str
+SEARCH_PHASE = 'search'
+
+# Phase following the parents from the end back to the start.
+# type: str
+RETRACE_PHASE = 'retrace'
+
+# Phase queuing the explored cells and the path to display them.
+# type: str
+PLAYBACK_PHASE = 'playback'
+
+# Phases timed by AASearchInstrumentation, in display order.
+# type: tuple(str)
+PHASES = ( SEARCH_PHASE   ,
+           RETRACE_PHASE  ,
+           PLAYBACK_PHASE )
+
+class AASearchInstrumentation(object):
+
+    def __init__( self ):
+        '''
+        Counters, phase timings and hooks of the searches run by a
+        pathfinding.AAPathFinder it is given to.
+
+        Note:
+            Searches only check for it once per expansion and once per
+            relaxed edge, so without it they run as fast as before.
+            Counters add up until reset is called.
+        '''
+        # Called with the index of each expanded cell.
+        # type: list[callable]
+        self.expandCallbacks = []
+
+        # Called with the index of the expanded cell, the index of the
+        # neighbour reached through a cheaper edge and its new cost.
+        # type: list[callable]
+        self.relaxCallbacks = []
+
+        self.reset()
+
+    def reset( self ):
+        '''
+        Set the counters and timings back to 0, keeping the hooks.
+
+        Returns:
+            None: No return value.
+        '''
+        # Amount of cells taken out of the open set.
+        # type: int
+        self.expandedNodesInt = 0
+
+        # Amount of edges that lowered the cost of the cell they reach.
+        # type: int
+        self.relaxedEdgesInt = 0
+
+        # Highest amount of entries of the open set when expanding a
+        # cell, outdated entries waiting to be skipped included.
+        # type: int
+        self.openPeakInt = 0
+
+        # Amount of heuristic values read or computed.
+        # type: int
+        self.heuristicCallsInt = 0
+
+        # Amount of times a cell already reached got a lower cost.
+        # type: int
+        self.reopenedNodesInt = 0
+
+        # Seconds spent in each of PHASES.
+        # type: dict[str, float]
+        self.phaseSecondsMapping = dict.fromkeys( PHASES , 0.0 )
+
+    def expand( self          ,
+                inIndex       ,
+                inOpenSizeInt ):
+        '''
+        Count the expansion of a cell and call the expand hooks.
+
+        Args:
+            inIndex (int): Index of the expanded cell.
+
+            inOpenSizeInt (int): Entries of the open set, the expanded
+                                 cell included.
+
+        Returns:
+            None: No return value.
+        '''
+        self.expandedNodesInt += 1
+
+        if inOpenSizeInt > self.openPeakInt:
+            self.openPeakInt = inOpenSizeInt
+
+        for callback in self.expandCallbacks:
+            callback( inIndex )
+
+    def relax( self           ,
+               inFromIndex    ,
+               inToIndex      ,
+               inCostInt      ,
+               inReopenedBool ):
+        '''
+        Count an edge lowering the cost of the cell it reaches and
+        call the relax hooks.
+
+        Args:
+            inFromIndex (int): Index of the expanded cell.
+
+            inToIndex (int): Index of the reached cell.
+
+            inCostInt (int): New cost from the start to the reached cell.
+
+            inReopenedBool (bool): True if the reached cell already had
+                                   a cost in this search.
+
+        Returns:
+            None: No return value.
+        '''
+        self.relaxedEdgesInt += 1
+
+        if inReopenedBool:
+            self.reopenedNodesInt += 1
+
+        for callback in self.relaxCallbacks:
+            callback( inFromIndex ,
+                      inToIndex   ,
+                      inCostInt   )
+
+    def countHeuristic( self            ,
+                        inCallsInt = 1 ):
+        '''
+        Count heuristic values read or computed.
+
+        Args:
+            inCallsInt (int): Amount of values.
+
+        Returns:
+            None: No return value.
+        '''
+        self.heuristicCallsInt += inCallsInt
+
+    def addPhaseSeconds( self       ,
+                         inPhaseStr ,
+                         inSeconds  ):
+        '''
+        Add time spent in a phase.
+
+        Args:
+            inPhaseStr (str): One of PHASES.
+
+            inSeconds (float): Seconds spent.
+
+        Returns:
+            None: No return value.
+        '''
+        self.phaseSecondsMapping[ inPhaseStr ] += inSeconds
+
+    def runSearch( self                      ,
+                   inPathSearch              ,
+                   inStartIndex              ,
+                   inEndIndex                ,
+                   inExploredCallback = None ):
+        '''
+        Run a search timing it as SEARCH_PHASE, without the time the
+        search spent in RETRACE_PHASE.
+
+        Args:
+            inPathSearch (search.AAAStarSearch): Search to run, using
+                                                 this instrumentation.
+
+            inStartIndex (int): Index of the cell to start from.
+
+            inEndIndex (int|list[int]): Index of the cell to reach, indices
+                                        of the target cells for multi
+                                        target searches.
+
+            inExploredCallback (callable|None): Called with the indices
+                                                explored by each expansion.
+
+        Returns:
+            search.AASearchResult: result of the search.
+        '''
+        retraceSeconds = self.phaseSecondsMapping[ RETRACE_PHASE ]
+
+        startTime = time.time()
+
+        result = inPathSearch.findPath( inStartIndex       ,
+                                        inEndIndex         ,
+                                        inExploredCallback )
+
+        self.addPhaseSeconds( SEARCH_PHASE                                                 ,
+                              time.time() - startTime -
+                              ( self.phaseSecondsMapping[ RETRACE_PHASE ] - retraceSeconds ) )
+
+        return result
+
+    def formatSummary( self ):
+        '''
+        Format the counters and timings to display them.
+
+        Returns:
+            str: a line of counters and a line of timings.
+        '''
+        countersStr = ( 'expanded {0}  relaxed {1}  open peak {2}  '
+                        'heuristic {3}  reopened {4}' ).format( self.expandedNodesInt  ,
+                                                                self.relaxedEdgesInt   ,
+                                                                self.openPeakInt       ,
+                                                                self.heuristicCallsInt ,
+                                                                self.reopenedNodesInt  )
+
+        timingsStr = '  '.join( '{0} {1:.2f} ms'.format( phaseStr                                       ,
+                                                         self.phaseSecondsMapping[ phaseStr ] * 1000.0 )
+                                for phaseStr in PHASES )
+
+        return countersStr + '\n' + timingsStr
@@ -0,0 +1,365 @@
+import heapq
+import itertools
+
+import model
+import search
+
+class AAJumpPointSearch(search.AAAStarSearch):
+
+    # Name displayed when choosing the search algorithm.
+    # type: str
+    NAME = 'Jump Point Search'
+
+    # Jumps read cells that are not reported as explored.
+    # type: bool
+    LOCAL_READS_BOOL = False
+
+    def __init__( self    ,
+                  inModel ):
+        '''
+        Jump Point Search algorithm, an A* search that skips the cells
+        along straight and diagonal lines until a cell with a forced
+        neighbour is found, on grids where every move has the same cost
+        per straight or diagonal step.
+
+        Note:
+            Finds paths of the same cost as search.AAAStarSearch
+            expanding far less cells, only jump points are expanded.
+            Jumps assume every cell costs the same, on grids with
+            terrain costs the search falls back to A*.
+
+        Args:
+            inModel (model.AAGridModel): Grid model to find paths on.
+        '''
+        super( AAJumpPointSearch , self ).__init__( inModel )
+
+    def isWalkable( self     ,
+                    inColumn ,
+                    inRow    ):
+        '''
+        Check if a cell is inside the grid and not a wall.
+
+        Args:
+            inColumn (int): Column of the cell.
+
+            inRow (int): Row of the cell.
+
+        Returns:
+            bool: True if the cell can be moved to, False otherwise.
+        '''
+        aaModel = self.model
+
+        if not 0 <= inColumn < aaModel.columnsInt:
+            return False
+
+        if not 0 <= inRow < aaModel.rowsInt:
+            return False
+
+        return aaModel.states[ inRow * aaModel.columnsInt + inColumn ] != model.WALL_STATE
+
+    def jump( self         ,
+              inColumn     ,
+              inRow        ,
+              inDirectionX ,
+              inDirectionY ,
+              inEndColumn  ,
+              inEndRow     ):
+        '''
+        Move from a cell in a direction until reaching a jump point,
+        the end cell or a cell that cannot be moved to.
+
+        Args:
+            inColumn (int): Column of the cell to move from.
+
+            inRow (int): Row of the cell to move from.
+
+            inDirectionX (int): Step in X axis, -1, 0 or 1.
+
+            inDirectionY (int): Step in Y axis, -1, 0 or 1.
+
+            inEndColumn (int): Column of the end cell.
+
+            inEndRow (int): Row of the end cell.
+
+        Returns:
+            tuple(int, int)|None: column and row of the jump point found,
+                                  None if there is none in that direction.
+        '''
+        isWalkable = self.isWalkable
+
+        column , row = inColumn , inRow
+        directionX , directionY = inDirectionX , inDirectionY
+
+        while True:
+
+            column += directionX
+            row    += directionY
+
+            if not isWalkable( column , row ):
+                return None
+
+            if column == inEndColumn and row == inEndRow:
+                return column , row
+
+            if directionX and directionY:
+
+                if ( ( not isWalkable( column - directionX , row ) and
+                       isWalkable( column - directionX , row + directionY ) ) or
+                     ( not isWalkable( column , row - directionY ) and
+                       isWalkable( column + directionX , row - directionY ) ) ):
+                    return column , row
+
+                if self.jump( column , row , directionX , 0 , inEndColumn , inEndRow ) is not None:
+                    return column , row
+
+                if self.jump( column , row , 0 , directionY , inEndColumn , inEndRow ) is not None:
+                    return column , row
+
+            elif directionX:
+
+                if ( ( not isWalkable( column , row + 1 ) and
+                       isWalkable( column + directionX , row + 1 ) ) or
+                     ( not isWalkable( column , row - 1 ) and
+                       isWalkable( column + directionX , row - 1 ) ) ):
+                    return column , row
+
+            else:
+
+                if ( ( not isWalkable( column + 1 , row ) and
+                       isWalkable( column + 1 , row + directionY ) ) or
+                     ( not isWalkable( column - 1 , row ) and
+                       isWalkable( column - 1 , row + directionY ) ) ):
+                    return column , row
+
+    def getDirections( self          ,
+                       inColumn      ,
+                       inRow         ,
+                       inParentIndex ):
+        '''
+        Get the directions to jump to from a cell, pruning the ones
+        reachable through its parent as fast as through the cell.
+
+        Args:
+            inColumn (int): Column of the cell.
+
+            inRow (int): Row of the cell.
+
+            inParentIndex (int): Index of the parent of the cell,
+                                 model.NO_PARENT for the start cell.
+
+        Returns:
+            list[tuple(int, int)]: steps in X and Y axis of each direction.
+        '''
+        if inParentIndex == model.NO_PARENT:
+            return list( model.AAGridModel.NEIGHBOUR_OFFSETS )
+
+        isWalkable = self.isWalkable
+
+        parentColumn , parentRow = self.model.coordinatesOf( inParentIndex )
+
+        directionX = ( inColumn > parentColumn ) - ( inColumn < parentColumn )
+        directionY = ( inRow > parentRow ) - ( inRow < parentRow )
+
+        if directionX and directionY:
+
+            directions = [ ( directionX , 0          ) ,
+                           ( 0          , directionY ) ,
+                           ( directionX , directionY ) ]
+
+            if not isWalkable( inColumn - directionX , inRow ):
+                directions.append( ( -directionX , directionY ) )
+
+            if not isWalkable( inColumn , inRow - directionY ):
+                directions.append( ( directionX , -directionY ) )
+
+        elif directionX:
+
+            directions = [ ( directionX , 0 ) ]
+
+            if not isWalkable( inColumn , inRow + 1 ):
+                directions.append( ( directionX , 1 ) )
+
+            if not isWalkable( inColumn , inRow - 1 ):
+                directions.append( ( directionX , -1 ) )
+
+        else:
+
+            directions = [ ( 0 , directionY ) ]
+
+            if not isWalkable( inColumn + 1 , inRow ):
+                directions.append( ( 1 , directionY ) )
+
+            if not isWalkable( inColumn - 1 , inRow ):
+                directions.append( ( -1 , directionY ) )
+
+        return directions
+
+    def findPath( self                      ,
+                  inStartIndex              ,
+                  inEndIndex                ,
+                  inExploredCallback = None ):
+        '''
+        Find a path between the start and end cell.
+
+        Args:
+            inStartIndex (int): Index of the cell to start from.
+
+            inEndIndex (int): Index of the cell to reach.
+
+            inExploredCallback (callable|None): Called with the indices of
+                                                the jump points found by each
+                                                expansion as soon as they
+                                                are known.
+
+        Returns:
+            search.AASearchResult: Found path and explored jump points.
+        '''
+        if self.model.weightedCellsInt:
+            return super( AAJumpPointSearch , self ).findPath( inStartIndex       ,
+                                                               inEndIndex         ,
+                                                               inExploredCallback )
+
+        result = search.AASearchResult()
+
+        aaModel = self.model
+
+        hCosts = aaModel.getHeuristic( inEndIndex )
+
+        searchInstrumentation = self.instrumentation
+
+        if searchInstrumentation:
+            searchInstrumentation.countHeuristic()
+
+        endColumn , endRow = aaModel.coordinatesOf( inEndIndex )
+
+        openStamp   = aaModel.beginSearch()
+        closedStamp = openStamp + 1
+
+        searchStamps  = aaModel.searchStamps
+        gCosts        = aaModel.searchCosts
+        parentIndices = aaModel.searchParents
+
+        searchStamps[ inStartIndex ]  = openStamp
+        gCosts[ inStartIndex ]        = 0
+        parentIndices[ inStartIndex ] = model.NO_PARENT
+
+        insertionCount = itertools.count()
+
+        openHeap = [ ( hCosts[ inStartIndex ] ,
+                       hCosts[ inStartIndex ] ,
+                       next( insertionCount ) ,
+                       inStartIndex           ) ]
+
+        while openHeap:
+
+            if self.cancelledBool:
+                result.cancelledBool = True
+                return result
+
+            fCost , hCost , _ , currentIndex = heapq.heappop( openHeap )
+
+            if searchStamps[ currentIndex ] != openStamp:
+                continue
+
+            if fCost != gCosts[ currentIndex ] + hCost:
+                continue
+
+            searchStamps[ currentIndex ] = closedStamp
+
+            result.expandedNodesInt += 1
+
+            if searchInstrumentation:
+                searchInstrumentation.expand( currentIndex        ,
+                                              len( openHeap ) + 1 )
+
+            if currentIndex == inEndIndex:
+                result.pathIndices = self.interpolatePath( self.retracePath( parentIndices ,
+                                                                             inEndIndex    ) )
+                return result
+
+            exploredIndices = []
+
+            currentCost = gCosts[ currentIndex ]
+
+            column , row = aaModel.coordinatesOf( currentIndex )
+
+            for directionX , directionY in self.getDirections( column                          ,
+                                                               row                             ,
+                                                               parentIndices[ currentIndex ] ):
+
+                jumpPoint = self.jump( column     ,
+                                       row        ,
+                                       directionX ,
+                                       directionY ,
+                                       endColumn  ,
+                                       endRow     )
+
+                if jumpPoint is None:
+                    continue
+
+                jumpIndex = aaModel.indexOf( *jumpPoint )
+
+                exploredIndices.append( jumpIndex )
+
+                jumpStamp = searchStamps[ jumpIndex ]
+
+                if jumpStamp == closedStamp:
+                    continue
+
+                newCostToJumpPoint = currentCost + aaModel.distance( currentIndex ,
+                                                                     jumpIndex    )
+
+                if jumpStamp != openStamp or newCostToJumpPoint < gCosts[ jumpIndex ]:
+
+                    if searchInstrumentation:
+                        searchInstrumentation.relax( currentIndex           ,
+                                                     jumpIndex              ,
+                                                     newCostToJumpPoint     ,
+                                                     jumpStamp == openStamp )
+                        searchInstrumentation.countHeuristic()
+
+                    searchStamps[ jumpIndex ]  = openStamp
+                    gCosts[ jumpIndex ]        = newCostToJumpPoint
+                    parentIndices[ jumpIndex ] = currentIndex
+
+                    heapq.heappush( openHeap , ( newCostToJumpPoint + hCosts[ jumpIndex ] ,
+                                                 hCosts[ jumpIndex ]                      ,
+                                                 next( insertionCount )                   ,
+                                                 jumpIndex                                ) )
+
+            result.exploredIndices.append( exploredIndices )
+
+            if inExploredCallback:
+                inExploredCallback( exploredIndices )
+
+        return result
+
+    def interpolatePath( self          ,
+                         inJumpIndices ):
+        '''
+        Fill the cells between consecutive jump points, which are
+        always on the same row, column or diagonal.
+
+        Args:
+            inJumpIndices (list[int]): Indices of the jump points of a path.
+
+        Returns:
+            list[int]: Indices of every cell of the path.
+        '''
+        pathIndices = inJumpIndices[ : 1 ]
+
+        for fromIndex , toIndex in zip( inJumpIndices , inJumpIndices[ 1 : ] ):
+
+            fromColumn , fromRow = self.model.coordinatesOf( fromIndex )
+            toColumn , toRow     = self.model.coordinatesOf( toIndex )
+
+            directionX = ( toColumn > fromColumn ) - ( toColumn < fromColumn )
+            directionY = ( toRow > fromRow ) - ( toRow < fromRow )
+
+            stepsInt = max( abs( toColumn - fromColumn ) , abs( toRow - fromRow ) )
+
+            pathIndices.extend( self.model.indexOf( fromColumn + directionX * step ,
+                                                    fromRow + directionY * step    )
+                                for step in range( 1 , stepsInt + 1 ) )
+
+        return pathIndices
@@ -0,0 +1,370 @@
+import heapq
+import itertools
+
+import model
+import search
+
+# Cost of cells that cannot be reached.
+# type: float
+INFINITE_COST = float( 'inf' )
+
+class AALPAStarSearch(search.AAAStarSearch):
+
+    # Name displayed when choosing the search algorithm.
+    # type: str
+    NAME = 'LPA*'
+
+    # Keeps costs from previous runs, its result depends on them.
+    # type: bool
+    LOCAL_READS_BOOL = False
+
+    def __init__( self    ,
+                  inModel ):
+        '''
+        Lifelong Planning A*, keeps the search state between runs and
+        after walls change only repairs the part of the search they affect.
+
+        Note:
+            The state is kept while the start and end cells stay the same,
+            changed cells have to be reported through notifyCellChanged.
+            A cancelled search can be resumed by running it again.
+
+        Args:
+            inModel (model.AAGridModel): Grid model to find paths on.
+        '''
+        super( AALPAStarSearch , self ).__init__( inModel )
+
+        self.startIndex = None
+        self.endIndex   = None
+
+        # Cost from the start to each cell found by the last expansion
+        # of the cell, missing cells are unreached.
+        # type: dict[int, int]
+        self.gCosts = {}
+
+        # Cost from the start to each cell through its best neighbour.
+        # type: dict[int, int]
+        self.rhsCosts = {}
+
+        # Current key of each cell of the open set.
+        # type: dict[int, tuple(int, int)]
+        self.openKeys = {}
+
+        # Heap entries of ( key , insertion order , cell index ).
+        # type: list[tuple(tuple(int, int), int, int)]
+        self.openHeap = []
+
+        self.insertionCount = itertools.count()
+
+        # Cells that switched between wall and not wall or changed
+        # terrain cost since the last run.
+        # type: set(int)
+        self.changedIndices = set()
+
+        # Heuristic cost from every cell to the end.
+        # type: array.array|None
+        self.hCosts = None
+
+    def notifyCellChanged( self    ,
+                           inIndex ):
+        '''
+        Report a cell that switched between wall and not wall or
+        changed terrain cost, it is repaired on the next run.
+
+        Args:
+            inIndex (int): Index of the changed cell.
+
+        Returns:
+            None: No return value.
+        '''
+        self.changedIndices.add( inIndex )
+
+    def initialize( self         ,
+                    inStartIndex ,
+                    inEndIndex   ):
+        '''
+        Drop the search state and start a new one between two cells.
+
+        Args:
+            inStartIndex (int): Index of the cell to start from.
+
+            inEndIndex (int): Index of the cell to reach.
+
+        Returns:
+            None: No return value.
+        '''
+        self.startIndex = inStartIndex
+        self.endIndex   = inEndIndex
+
+        self.gCosts   = {}
+        self.rhsCosts = { inStartIndex : 0 }
+        self.openKeys = {}
+        self.openHeap = []
+
+        self.changedIndices.clear()
+
+        self.hCosts = self.model.getHeuristic( inEndIndex )
+
+        self.updateOpenSet( inStartIndex )
+
+    def calculateKey( self    ,
+                      inIndex ):
+        '''
+        Get the priority of a cell in the open set.
+
+        Args:
+            inIndex (int): Index of the cell.
+
+        Returns:
+            tuple(int, int): lowest estimated path cost through the cell
+                             and lowest cost from the start to it.
+        '''
+        cost = min( self.gCosts.get( inIndex , INFINITE_COST )    ,
+                    self.rhsCosts.get( inIndex , INFINITE_COST ) )
+
+        if self.instrumentation:
+            self.instrumentation.countHeuristic()
+
+        return ( cost + self.hCosts[ inIndex ] ,
+                 cost                          )
+
+    def updateOpenSet( self    ,
+                       inIndex ):
+        '''
+        Add a cell to the open set if its costs disagree,
+        remove it otherwise.
+
+        Args:
+            inIndex (int): Index of the cell.
+
+        Returns:
+            None: No return value.
+        '''
+        if self.gCosts.get( inIndex , INFINITE_COST ) == self.rhsCosts.get( inIndex , INFINITE_COST ):
+            self.openKeys.pop( inIndex , None )
+            return
+
+        cellKey = self.calculateKey( inIndex )
+
+        self.openKeys[ inIndex ] = cellKey
+
+        heapq.heappush( self.openHeap , ( cellKey                     ,
+                                          next( self.insertionCount ) ,
+                                          inIndex                     ) )
+
+    def updateCell( self    ,
+                    inIndex ):
+        '''
+        Recompute the cost of reaching a cell through its best neighbour.
+
+        Args:
+            inIndex (int): Index of the cell.
+
+        Returns:
+            None: No return value.
+        '''
+        if inIndex != self.startIndex:
+
+            states = self.model.states
+            gCosts = self.gCosts
+
+            rhsCost = INFINITE_COST
+
+            if states[ inIndex ] != model.WALL_STATE:
+
+                for neighbourIndex , stepCost in self.model.getNeighbourSteps( inIndex ):
+
+                    if states[ neighbourIndex ] == model.WALL_STATE:
+                        continue
+
+                    rhsCost = min( rhsCost , gCosts.get( neighbourIndex , INFINITE_COST ) + stepCost )
+
+            if rhsCost == INFINITE_COST:
+                self.rhsCosts.pop( inIndex , None )
+            else:
+                self.rhsCosts[ inIndex ] = rhsCost
+
+        self.updateOpenSet( inIndex )
+
+    def repairChangedCells( self ):
+        '''
+        Update the cells affected by the cells that changed since
+        the last run.
+
+        Returns:
+            None: No return value.
+        '''
+        for changedIndex in self.changedIndices:
+
+            self.updateCell( changedIndex )
+
+            for neighbourIndex in self.model.getNeighbours( changedIndex ):
+                self.updateCell( neighbourIndex )
+
+        self.changedIndices.clear()
+
+    def getTopKey( self ):
+        '''
+        Drop the outdated entries on top of the open set and get the
+        lowest key left.
+
+        Returns:
+            tuple(int, int)|None: lowest key, None if the open set is empty.
+        '''
+        openHeap = self.openHeap
+
+        while openHeap:
+
+            cellKey , _ , cellIndex = openHeap[ 0 ]
+
+            if self.openKeys.get( cellIndex ) == cellKey:
+                return cellKey
+
+            heapq.heappop( openHeap )
+
+        return None
+
+    def findPath( self                      ,
+                  inStartIndex              ,
+                  inEndIndex                ,
+                  inExploredCallback = None ):
+        '''
+        Find a path between the start and end cell, reusing the state of
+        the previous run if it was between the same cells.
+
+        Args:
+            inStartIndex (int): Index of the cell to start from.
+
+            inEndIndex (int): Index of the cell to reach.
+
+            inExploredCallback (callable|None): Called with the indices
+                                                explored by each expansion
+                                                as soon as they are known.
+
+        Returns:
+            search.AASearchResult: Found path and cells explored by this run.
+        '''
+        result = search.AASearchResult()
+
+        if ( inStartIndex , inEndIndex ) != ( self.startIndex , self.endIndex ):
+            self.initialize( inStartIndex ,
+                             inEndIndex   )
+        else:
+            self.repairChangedCells()
+
+        states   = self.model.states
+        gCosts   = self.gCosts
+        rhsCosts = self.rhsCosts
+
+        searchInstrumentation = self.instrumentation
+
+        while True:
+
+            if self.cancelledBool:
+                result.cancelledBool = True
+                return result
+
+            topKey = self.getTopKey()
+
+            if topKey is None:
+                break
+
+            if ( topKey >= self.calculateKey( inEndIndex ) and
+                 gCosts.get( inEndIndex , INFINITE_COST ) == self.rhsCosts.get( inEndIndex , INFINITE_COST ) ):
+                break
+
+            _ , _ , currentIndex = heapq.heappop( self.openHeap )
+
+            del self.openKeys[ currentIndex ]
+
+            result.expandedNodesInt += 1
+
+            if searchInstrumentation:
+                searchInstrumentation.expand( currentIndex             ,
+                                              len( self.openHeap ) + 1 )
+
+            rhsCost = rhsCosts.get( currentIndex , INFINITE_COST )
+
+            if gCosts.get( currentIndex , INFINITE_COST ) > rhsCost:
+                gCosts[ currentIndex ] = rhsCost
+            else:
+                gCosts.pop( currentIndex , None )
+                self.updateCell( currentIndex )
+
+            exploredIndices = []
+
+            for neighbourIndex in self.model.getNeighbours( currentIndex ):
+
+                if states[ neighbourIndex ] == model.WALL_STATE:
+                    continue
+
+                exploredIndices.append( neighbourIndex )
+
+                if not searchInstrumentation:
+                    self.updateCell( neighbourIndex )
+                    continue
+
+                previousCost = rhsCosts.get( neighbourIndex , INFINITE_COST )
+
+                self.updateCell( neighbourIndex )
+
+                newCost = rhsCosts.get( neighbourIndex , INFINITE_COST )
+
+                if newCost < previousCost:
+                    searchInstrumentation.relax( currentIndex                  ,
+                                                 neighbourIndex                ,
+                                                 newCost                       ,
+                                                 previousCost != INFINITE_COST )
+
+            result.exploredIndices.append( exploredIndices )
+
+            if inExploredCallback:
+                inExploredCallback( exploredIndices )
+
+        result.pathIndices = self.getPath()
+
+        return result
+
+    def getPath( self ):
+        '''
+        Follow the cheapest neighbours from the end cell back to the start.
+
+        Returns:
+            list[int]: Indices of the cells from start to end,
+                       empty if the end cannot be reached.
+        '''
+        gCosts = self.gCosts
+        states = self.model.states
+
+        currentIndex = self.endIndex
+
+        if gCosts.get( currentIndex , INFINITE_COST ) == INFINITE_COST:
+            return []
+
+        pathIndices = [ currentIndex ]
+
+        while currentIndex != self.startIndex:
+
+            bestCost  = INFINITE_COST
+            bestIndex = None
+
+            for neighbourIndex , stepCost in self.model.getNeighbourSteps( currentIndex ):
+
+                if states[ neighbourIndex ] == model.WALL_STATE:
+                    continue
+
+                neighbourCost = gCosts.get( neighbourIndex , INFINITE_COST ) + stepCost
+
+                if neighbourCost < bestCost:
+                    bestCost , bestIndex = neighbourCost , neighbourIndex
+
+            if bestIndex is None:
+                return []
+
+            currentIndex = bestIndex
+
+            pathIndices.append( currentIndex )
+
+        pathIndices.reverse()
+
+        return pathIndices
@@ -0,0 +1,261 @@
+import array
+import mmap
+import os
+import struct
+
+import model
+
+# First bytes of a grid file.
+# type: bytes
+MAGIC_BYTES = b'AAGRID'
+
+# Version of the grid files written by saveModel.
+# type: int
+FORMAT_VERSION_INT = 1
+
+# Layout of the header of a grid file, magic bytes, format version,
+# amount of columns and rows and amount of goals. The goal indices follow
+# as unsigned 32 bit integers, then a byte per cell with its state and a
+# byte per cell with its terrain cost.
+# type: struct.Struct
+HEADER_STRUCT = struct.Struct( '<6sHIII' )
+
+# Extension of the grid files.
+# type: str
+GRID_EXTENSION = '.aagrid'
+
+# Extension of the MovingAI benchmark maps, see importMovingAIMap.
+# type: str
+MOVING_AI_EXTENSION = '.map'
+
+# Characters of the MovingAI maps that can be walked on, any other
+# one is a wall.
+# type: bytes
+MOVING_AI_OPEN_BYTES = b'.GS'
+
+# Terrain cost of the swamp cells of the MovingAI maps.
+# type: int
+MOVING_AI_SWAMP_COST = 5
+
+def createTranslationTable( inValuesMapping ,
+                            inDefaultInt    ):
+    '''
+    Build a table for bytes.translate mapping characters to a value each.
+
+    Args:
+        inValuesMapping (dict[int, int]): Value of each character code.
+
+        inDefaultInt (int): Value of the characters not in inValuesMapping.
+
+    Returns:
+        bytes: translation table.
+    '''
+    table = bytearray( [ inDefaultInt ] ) * 256
+
+    for characterCode , value in inValuesMapping.items():
+        table[ characterCode ] = value
+
+    return bytes( table )
+
+# Cell state of each character of the MovingAI maps.
+# type: bytes
+MOVING_AI_STATES_TABLE = createTranslationTable( dict( ( characterCode , model.BLANK_STATE )
+                                                       for characterCode in bytearray( MOVING_AI_OPEN_BYTES ) ) ,
+                                                 model.WALL_STATE                                                )
+
+# Terrain cost of each character of the MovingAI maps.
+# type: bytes
+MOVING_AI_COSTS_TABLE = createTranslationTable( { ord( 'S' ) : MOVING_AI_SWAMP_COST } ,
+                                                model.DEFAULT_COST                     )
+
+def saveModel( inModel   ,
+               inPathStr ):
+    '''
+    Write the walls, goals and terrain costs of a grid to a grid file.
+
+    Note:
+        Cells displaying a search are saved as blank.
+
+    Args:
+        inModel (model.AAGridModel): Grid model to save,
+                                     grid.AAGrid.model for a grid.
+
+        inPathStr (str): Path of the file to write.
+
+    Returns:
+        None: No return value.
+    '''
+    states = array.array( 'B' , inModel.states )
+
+    for searchIndex in inModel.searchIndices:
+        if states[ searchIndex ] in model.SEARCH_STATES:
+            states[ searchIndex ] = model.BLANK_STATE
+
+    goalIndices = inModel.goalIndices
+
+    with open( inPathStr , 'wb' ) as gridFile:
+
+        gridFile.write( HEADER_STRUCT.pack( MAGIC_BYTES          ,
+                                            FORMAT_VERSION_INT   ,
+                                            inModel.columnsInt   ,
+                                            inModel.rowsInt      ,
+                                            len( goalIndices )   ) )
+
+        gridFile.write( struct.pack( '<{0}I'.format( len( goalIndices ) ) ,
+                                     *goalIndices                         ) )
+
+        states.tofile( gridFile )
+        inModel.costs.tofile( gridFile )
+
+def loadModel( inPathStr         ,
+               inCellSizeInt = 1 ):
+    '''
+    Read a grid file written by saveModel.
+
+    Note:
+        The file is memory mapped and the states and costs are copied
+        from it into the model arrays at once, no Python object is
+        created per cell.
+
+    Args:
+        inPathStr (str): Path of the file to read.
+
+        inCellSizeInt (int): Width and height of a cell.
+
+    Raises:
+        ValueError: The file is not a grid file or is truncated.
+
+    Returns:
+        model.AAGridModel: Grid model stored in the file.
+    '''
+    with open( inPathStr , 'rb' ) as gridFile:
+
+        if not os.fstat( gridFile.fileno() ).st_size:
+            raise ValueError( 'Empty grid file: {0}'.format( inPathStr ) )
+
+        mappedFile = mmap.mmap( gridFile.fileno()          ,
+                                0                          ,
+                                access = mmap.ACCESS_READ  )
+
+        try:
+
+            if len( mappedFile ) < HEADER_STRUCT.size:
+                raise ValueError( 'Truncated grid file: {0}'.format( inPathStr ) )
+
+            magicBytes , versionInt , columnsInt , rowsInt , goalCountInt = HEADER_STRUCT.unpack_from( mappedFile )
+
+            if magicBytes != MAGIC_BYTES:
+                raise ValueError( 'Not a grid file: {0}'.format( inPathStr ) )
+
+            if versionInt != FORMAT_VERSION_INT:
+                raise ValueError( 'Unsupported grid file version {0}: {1}'.format( versionInt ,
+                                                                                   inPathStr  ) )
+
+            aaModel = model.AAGridModel( columnsInt    ,
+                                         rowsInt       ,
+                                         inCellSizeInt )
+
+            statesOffset = HEADER_STRUCT.size + 4 * goalCountInt
+            costsOffset  = statesOffset + aaModel.cellCountInt
+
+            if len( mappedFile ) < costsOffset + aaModel.cellCountInt:
+                raise ValueError( 'Truncated grid file: {0}'.format( inPathStr ) )
+
+            goalIndices = list( struct.unpack_from( '<{0}I'.format( goalCountInt ) ,
+                                                    mappedFile                     ,
+                                                    HEADER_STRUCT.size             ) )
+
+            aaModel.states = array.array( 'B' , mappedFile[ statesOffset : costsOffset ] )
+            aaModel.setCosts( mappedFile[ costsOffset : costsOffset + aaModel.cellCountInt ] )
+
+        finally:
+            mappedFile.close()
+
+    aaModel.setGoalIndices( goalIndices )
+
+    return aaModel
+
+def importMovingAIMap( inPathStr         ,
+                       inCellSizeInt = 1 ):
+    '''
+    Read a map of the MovingAI pathfinding benchmarks,
+    a text header with its height and width followed by a line of
+    characters per row.
+
+    Note:
+        Water cells, only walkable from other water cells, are
+        imported as walls and swamp cells as MOVING_AI_SWAMP_COST.
+
+    Args:
+        inPathStr (str): Path of the .map file to read.
+
+        inCellSizeInt (int): Width and height of a cell.
+
+    Raises:
+        ValueError: The file is not a MovingAI map or is truncated.
+
+    Returns:
+        model.AAGridModel: Grid model of the map.
+    '''
+    with open( inPathStr , 'rb' ) as mapFile:
+        lines = mapFile.read().splitlines()
+
+    headerMapping = {}
+
+    for lineIndex , line in enumerate( lines ):
+
+        fields = line.split()
+
+        if fields == [ b'map' ]:
+            break
+
+        if len( fields ) == 2:
+            headerMapping[ fields[ 0 ] ] = fields[ 1 ]
+
+    else:
+        raise ValueError( 'Not a MovingAI map: {0}'.format( inPathStr ) )
+
+    try:
+        columnsInt = int( headerMapping[ b'width' ] )
+        rowsInt    = int( headerMapping[ b'height' ] )
+    except ( KeyError , ValueError ):
+        raise ValueError( 'Missing map size: {0}'.format( inPathStr ) )
+
+    rowLines = [ line[ : columnsInt ] for line in lines[ lineIndex + 1 : lineIndex + 1 + rowsInt ] ]
+
+    if len( rowLines ) < rowsInt or any( len( rowLine ) < columnsInt for rowLine in rowLines ):
+        raise ValueError( 'Truncated MovingAI map: {0}'.format( inPathStr ) )
+
+    mapBytes = b''.join( rowLines )
+
+    aaModel = model.AAGridModel( columnsInt    ,
+                                 rowsInt       ,
+                                 inCellSizeInt )
+
+    aaModel.states = array.array( 'B' , mapBytes.translate( MOVING_AI_STATES_TABLE ) )
+    aaModel.setCosts( mapBytes.translate( MOVING_AI_COSTS_TABLE ) )
+
+    return aaModel
+
+def loadMap( inPathStr         ,
+             inCellSizeInt = 1 ):
+    '''
+    Read a grid file or a MovingAI map, by the extension of the file.
+
+    Args:
+        inPathStr (str): Path of the file to read.
+
+        inCellSizeInt (int): Width and height of a cell.
+
+    Raises:
+        ValueError: The file is not a grid file or MovingAI map.
+
+    Returns:
+        model.AAGridModel: Grid model of the file.
+    '''
+    if os.path.splitext( inPathStr )[ 1 ].lower() == MOVING_AI_EXTENSION:
+        return importMovingAIMap( inPathStr     ,
+                                  inCellSizeInt )
+
+    return loadModel( inPathStr     ,
+                      inCellSizeInt )
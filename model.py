@@ -0,0 +1,764 @@
+import array
+
+BLANK_STATE      = 0
+
+WALL_STATE       = 1
+
+GOAL_POINT_STATE = 2
+
+EXPLORED_STATE   = 3
+
+PATH_STATE       = 4
+
+# Translation table of the states to reset after a search.
+# type: bytes
+RESET_TABLE = bytearray( range( 256 ) )
+RESET_TABLE[ EXPLORED_STATE ] = BLANK_STATE
+RESET_TABLE[ PATH_STATE ]     = BLANK_STATE
+RESET_TABLE = bytes( RESET_TABLE )
+
+# States displaying a search, set back to blank by a reset.
+# type: tuple(int)
+SEARCH_STATES = ( EXPLORED_STATE ,
+                  PATH_STATE     )
+
+# Parent stored for the start cell of a search.
+# type: int
+NO_PARENT = -1
+
+# Terrain cost of the cells moved through at the straight and diagonal
+# costs, the lowest one keeps the distance an admissible heuristic.
+# type: int
+DEFAULT_COST = 1
+
+# Highest terrain cost of a cell.
+# type: int
+MAX_COST = 9
+
+# Translation table of the states to the bytes of a region mask,
+# 0 for the cells that are not walls nor goals, see
+# AAGridModel.getRegionIndices.
+# type: bytes
+OPEN_REGION_TABLE = bytearray( [ 1 ] ) * 256
+OPEN_REGION_TABLE[ BLANK_STATE ]    = 0
+OPEN_REGION_TABLE[ EXPLORED_STATE ] = 0
+OPEN_REGION_TABLE[ PATH_STATE ]     = 0
+OPEN_REGION_TABLE = bytes( OPEN_REGION_TABLE )
+
+# Translation table of the states to the bytes of a region mask,
+# 0 for the walls.
+# type: bytes
+WALL_REGION_TABLE = bytearray( [ 1 ] ) * 256
+WALL_REGION_TABLE[ WALL_STATE ] = 0
+WALL_REGION_TABLE = bytes( WALL_REGION_TABLE )
+
+# Highest search stamp before the stamps of the cells are cleared.
+# type: int
+MAX_SEARCH_STAMP = 2 ** 32 - 2
+
+class AAGridModel(object):
+
+    # Cells are stored in chunks allocated on demand instead of arrays
+    # of every cell, see chunks.AAChunkedGridModel.
+    # type: bool
+    CHUNKED_BOOL = False
+
+    # Offsets in columns and rows to reach the neighbours of a cell,
+    # in the same order AAGrid.getNeighbours yields them.
+    # type: tuple(tuple(int, int))
+    NEIGHBOUR_OFFSETS = ( (  1 ,  0 ) ,
+                          ( -1 ,  0 ) ,
+                          (  0 ,  1 ) ,
+                          (  0 , -1 ) ,
+                          (  1 ,  1 ) ,
+                          ( -1 ,  1 ) ,
+                          (  1 , -1 ) ,
+                          ( -1 , -1 ) )
+
+    # Cost of moving to a neighbour through a side.
+    # type: int
+    STRAIGHT_COST_INT = 10
+
+    # Cost of moving to a neighbour through a corner.
+    # type: int
+    DIAGONAL_COST_INT = 14
+
+    # Cost of moving to each neighbour, matching NEIGHBOUR_OFFSETS.
+    # type: tuple(int)
+    NEIGHBOUR_COSTS = ( STRAIGHT_COST_INT ,
+                        STRAIGHT_COST_INT ,
+                        STRAIGHT_COST_INT ,
+                        STRAIGHT_COST_INT ,
+                        DIAGONAL_COST_INT ,
+                        DIAGONAL_COST_INT ,
+                        DIAGONAL_COST_INT ,
+                        DIAGONAL_COST_INT )
+
+    def __init__( self             ,
+                  inColumnsInt     ,
+                  inRowsInt        ,
+                  inCellSizeInt = 1 ):
+        '''
+        Compact, Qt free representation of a grid to search paths on.
+        Cells are addressed by a single index, row * columns + column.
+
+        Args:
+            inColumnsInt (int): Amount of cells in X axis.
+
+            inRowsInt (int): Amount of cells in Y axis.
+
+            inCellSizeInt (int): Width and height of a cell.
+        '''
+        self.columnsInt  = inColumnsInt
+        self.rowsInt     = inRowsInt
+        self.cellSizeInt = inCellSizeInt
+
+        # Amount of cells in the grid.
+        # type: int
+        self.cellCountInt = inColumnsInt * inRowsInt
+
+        # Last column and row, cells on them are at the grid borders.
+        # type: int
+        self.lastColumnInt = inColumnsInt - 1
+        self.lastRowInt    = inRowsInt - 1
+
+        # Offsets to add to a cell index to get its neighbours,
+        # matching NEIGHBOUR_OFFSETS.
+        # type: tuple(int)
+        self.neighbourIndexOffsets = tuple( offsetY * inColumnsInt + offsetX
+                                            for offsetX , offsetY in self.NEIGHBOUR_OFFSETS )
+
+        # Index offset and cost of moving to each neighbour.
+        # type: tuple(tuple(int, int))
+        self.neighbourSteps = tuple( zip( self.neighbourIndexOffsets ,
+                                          self.NEIGHBOUR_COSTS       ) )
+
+        # State of every cell, one of the *_STATE values.
+        # type: array.array
+        self.states = self.createCellArray( 'B'         ,
+                                            BLANK_STATE )
+
+        # Terrain cost of every cell, from DEFAULT_COST to MAX_COST.
+        # type: array.array
+        self.costs = self.createCellArray( 'B'          ,
+                                           DEFAULT_COST )
+
+        # Amount of cells with a cost other than DEFAULT_COST,
+        # moves only look at the costs while it is not 0.
+        # type: int
+        self.weightedCellsInt = 0
+
+        # Indices of the cells set as start and destination.
+        # type: list[int]
+        self.goalIndices = []
+
+        # Heuristic cost of every cell to a goal cell, by goal index.
+        # type: dict[int, array.array]
+        self.heuristicsMapping = {}
+
+        # Cells set to one of SEARCH_STATES since the last reset.
+        # type: set(int)
+        self.searchIndices = set()
+
+        # Stamp of the running search, see beginSearch.
+        # type: int
+        self.searchStampInt = 0
+
+        # Search state of each cell, only valid for the cells stamped with
+        # the stamp of the running search. Created by the first search.
+        # type: array.array|None
+        self.searchStamps  = None
+        self.searchCosts   = None
+        self.searchParents = None
+
+    def createCellArray( self           ,
+                         inTypeStr      ,
+                         inDefaultValue ):
+        '''
+        Create the storage of a value per cell, indexed by cell index.
+
+        Args:
+            inTypeStr (str): Type code of the values, see array.array.
+
+            inDefaultValue (int): Value of every cell.
+
+        Returns:
+            array.array: value of each cell.
+        '''
+        return array.array( inTypeStr , [ inDefaultValue ] ) * self.cellCountInt
+
+    def indexOf( self     ,
+                 inColumn ,
+                 inRow    ):
+        '''
+        Get the index of the cell at the given column and row.
+
+        Args:
+            inColumn (int): Column of the cell.
+
+            inRow (int): Row of the cell.
+
+        Returns:
+            int: index of the cell.
+        '''
+        return inRow * self.columnsInt + inColumn
+
+    def coordinatesOf( self    ,
+                       inIndex ):
+        '''
+        Get the column and row of a cell.
+
+        Args:
+            inIndex (int): Index of the cell.
+
+        Returns:
+            tuple(int, int): column and row of the cell.
+        '''
+        row , column = divmod( inIndex , self.columnsInt )
+        return column , row
+
+    def isWall( self    ,
+                inIndex ):
+        '''
+        Check if a cell blocks the movement.
+
+        Args:
+            inIndex (int): Index of the cell.
+
+        Returns:
+            bool: True if the cell is a wall, False otherwise.
+        '''
+        return self.states[ inIndex ] == WALL_STATE
+
+    def setWall( self        ,
+                 inIndex     ,
+                 inWallBool  ):
+        '''
+        Set or unset a cell as wall.
+
+        Args:
+            inIndex (int): Index of the cell.
+
+            inWallBool (bool): True to set as wall, False to set as blank.
+
+        Returns:
+            None: No return value.
+        '''
+        self.states[ inIndex ] = WALL_STATE if inWallBool else BLANK_STATE
+
+    def setCost( self    ,
+                 inIndex ,
+                 inCost  ):
+        '''
+        Set the terrain cost of a cell.
+
+        Args:
+            inIndex (int): Index of the cell.
+
+            inCost (int): Cost, from DEFAULT_COST to MAX_COST.
+
+        Returns:
+            bool: True if the cost changed, False otherwise.
+        '''
+        oldCost = self.costs[ inIndex ]
+
+        if oldCost == inCost:
+            return False
+
+        self.weightedCellsInt += ( inCost != DEFAULT_COST ) - ( oldCost != DEFAULT_COST )
+
+        self.costs[ inIndex ] = inCost
+
+        return True
+
+    def setCosts( self    ,
+                  inCosts ):
+        '''
+        Set the terrain cost of every cell.
+
+        Args:
+            inCosts (bytes|bytearray|array.array): Cost of each cell.
+
+        Returns:
+            None: No return value.
+        '''
+        self.costs = array.array( 'B' , bytearray( inCosts ) )
+
+        self.weightedCellsInt = self.cellCountInt - self.costs.count( DEFAULT_COST )
+
+    def setSearchState( self    ,
+                        inIndex ,
+                        inState ):
+        '''
+        Set the state of a cell, remembering the cells set to one of
+        SEARCH_STATES so resetSearchStates only visits them.
+
+        Args:
+            inIndex (int): Index of the cell.
+
+            inState (int): State to set to, one of the *_STATE values.
+
+        Returns:
+            None: No return value.
+        '''
+        self.states[ inIndex ] = inState
+
+        if inState in SEARCH_STATES:
+            self.searchIndices.add( inIndex )
+
+    def resetSearchStates( self ):
+        '''
+        Set back to blank the cells displaying a search,
+        explored and path states.
+
+        Note:
+            Only the cells in searchIndices are visited, unless they are
+            so many that translating the whole grid at once is faster.
+
+        Returns:
+            list[int]: indices of the cells that were reset.
+        '''
+        states = self.states
+
+        resetIndices = [ cellIndex for cellIndex in self.searchIndices
+                         if states[ cellIndex ] in SEARCH_STATES ]
+
+        self.searchIndices = set()
+
+        if len( resetIndices ) * 32 >= self.cellCountInt:
+            states[ : ] = array.array( 'B' , bytearray( states ).translate( RESET_TABLE ) )
+            return resetIndices
+
+        for cellIndex in resetIndices:
+            states[ cellIndex ] = BLANK_STATE
+
+        return resetIndices
+
+    def beginSearch( self ):
+        '''
+        Start a search using searchStamps, searchCosts and searchParents
+        as its state, the state of previous searches is invalidated by
+        changing the stamp instead of clearing the arrays.
+
+        Note:
+            Only one search can use the arrays of a model at a time.
+
+        Returns:
+            int: stamp of the cells reached by the search,
+                 cells stamped with the next value are closed.
+        '''
+        self.searchStampInt += 2
+
+        if self.searchStamps is None or self.searchStampInt > MAX_SEARCH_STAMP:
+
+            self.searchStampInt = 2
+
+            self.searchStamps  = self.createCellArray( 'I' , 0 )
+            self.searchCosts   = self.createCellArray( 'I' , 0 )
+            self.searchParents = self.createCellArray( 'i' , NO_PARENT )
+
+        return self.searchStampInt
+
+    def setGoalIndices( self          ,
+                        inGoalIndices ):
+        '''
+        Set the cells used as start and destination, the cached
+        heuristics to cells that are not goals anymore are dropped.
+
+        Args:
+            inGoalIndices (list[int]): Indices of the goal cells.
+
+        Returns:
+            None: No return value.
+        '''
+        self.goalIndices = list( inGoalIndices )
+
+        for goalIndex in list( self.heuristicsMapping ):
+            if goalIndex not in self.goalIndices:
+                del self.heuristicsMapping[ goalIndex ]
+
+    def getNeighbours( self    ,
+                       inIndex ):
+        '''
+        Get the indices of the cells around a cell that are inside the grid.
+
+        Args:
+            inIndex (int): Index of the cell to get neighbours from.
+
+        Returns:
+            list[int]: indices of the neighbour cells.
+        '''
+        return [ neighbourIndex for neighbourIndex , _ in self.getNeighbourSteps( inIndex ) ]
+
+    def getNeighbourSteps( self    ,
+                           inIndex ):
+        '''
+        Get the cells around a cell that are inside the grid
+        with the cost of moving to them.
+
+        Note:
+            Moving between two cells costs the straight or diagonal cost
+            times the average terrain cost of both cells, the same both
+            ways. Costs are even so the result stays an integer.
+
+        Args:
+            inIndex (int): Index of the cell to get neighbours from.
+
+        Returns:
+            list[tuple(int, int)]: index and step cost of the neighbour cells.
+        '''
+        row , column = divmod( inIndex , self.columnsInt )
+
+        # Cells away from the borders have all their neighbours inside.
+        if 0 < column < self.lastColumnInt and 0 < row < self.lastRowInt:
+            neighbourSteps = [ ( inIndex + indexOffset , stepCost )
+                               for indexOffset , stepCost in self.neighbourSteps ]
+        else:
+            neighbourSteps = [ ( inIndex + indexOffset , stepCost )
+                               for ( offsetX , offsetY ) , ( indexOffset , stepCost ) in zip( self.NEIGHBOUR_OFFSETS ,
+                                                                                             self.neighbourSteps    )
+                               if ( 0 <= column + offsetX < self.columnsInt and
+                                    0 <= row + offsetY < self.rowsInt          ) ]
+
+        if not self.weightedCellsInt:
+            return neighbourSteps
+
+        costs    = self.costs
+        cellCost = costs[ inIndex ]
+
+        return [ ( neighbourIndex , ( stepCost * ( cellCost + costs[ neighbourIndex ] ) ) >> 1 )
+                 for neighbourIndex , stepCost in neighbourSteps ]
+
+    def getPathCost( self          ,
+                     inPathIndices ):
+        '''
+        Get the cost of moving along a path of neighbour cells.
+
+        Args:
+            inPathIndices (list[int]): Indices of the cells of the path.
+
+        Returns:
+            int: cost of the path, 0 for an empty path.
+        '''
+        pathCost = 0
+
+        for fromIndex , toIndex in zip( inPathIndices , inPathIndices[ 1 : ] ):
+
+            for neighbourIndex , stepCost in self.getNeighbourSteps( fromIndex ):
+
+                if neighbourIndex == toIndex:
+                    pathCost += stepCost
+                    break
+
+        return pathCost
+
+    def distance( self         ,
+                  inFromIndex  ,
+                  inToIndex    ):
+        '''
+        Calculates the distance between two cells.
+
+        Note:
+            Diagonal moves are worth DIAGONAL_COST_INT per cell while
+            other directions are worth STRAIGHT_COST_INT per cell.
+            Terrain costs are ignored, so it never overestimates the
+            cost of a path between the cells.
+
+        Args:
+            inFromIndex (int): Index of the cell to calculate distance from.
+
+            inToIndex (int): Index of the cell to calculate distance to.
+
+        Returns:
+            int: Calculated distance value.
+        '''
+        fromRow , fromColumn = divmod( inFromIndex , self.columnsInt )
+        toRow , toColumn     = divmod( inToIndex , self.columnsInt )
+
+        xDistanceInt = abs( fromColumn - toColumn )
+        yDistanceInt = abs( fromRow - toRow )
+
+        if xDistanceInt > yDistanceInt:
+            xDistanceInt , yDistanceInt = yDistanceInt , xDistanceInt
+
+        return ( self.DIAGONAL_COST_INT * xDistanceInt +
+                 self.STRAIGHT_COST_INT * ( yDistanceInt - xDistanceInt ) )
+
+    def iterateLineIndices( self        ,
+                            inFromIndex ,
+                            inToIndex   ):
+        '''
+        Walk the cells crossed by the segment between the centers of
+        two cells, with Bresenham's algorithm.
+
+        Note:
+            Each cell is a straight or diagonal neighbour of the
+            previous one, so moving along them is a valid path and
+            drawing along them leaves no gaps.
+
+        Args:
+            inFromIndex (int): Index of the cell the segment starts at.
+
+            inToIndex (int): Index of the cell the segment ends at.
+
+        Yields:
+            int: Index of a crossed cell, both ends included.
+        '''
+        row , column     = divmod( inFromIndex , self.columnsInt )
+        toRow , toColumn = divmod( inToIndex , self.columnsInt )
+
+        xDistanceInt = abs( toColumn - column )
+        yDistanceInt = abs( toRow - row )
+
+        stepX = 1 if toColumn > column else -1
+        stepY = self.columnsInt if toRow > row else -self.columnsInt
+
+        errorInt = xDistanceInt - yDistanceInt
+
+        cellIndex = inFromIndex
+
+        yield cellIndex
+
+        while cellIndex != inToIndex:
+
+            doubleErrorInt = 2 * errorInt
+
+            if doubleErrorInt > -yDistanceInt:
+                errorInt  -= yDistanceInt
+                cellIndex += stepX
+
+            if doubleErrorInt < xDistanceInt:
+                errorInt  += xDistanceInt
+                cellIndex += stepY
+
+            yield cellIndex
+
+    def getLineIndices( self        ,
+                        inFromIndex ,
+                        inToIndex   ):
+        '''
+        Get the cells crossed by the segment between the centers of
+        two cells, see iterateLineIndices.
+
+        Args:
+            inFromIndex (int): Index of the cell the segment starts at.
+
+            inToIndex (int): Index of the cell the segment ends at.
+
+        Returns:
+            list[int]: Indices of the crossed cells, both ends included.
+        '''
+        return list( self.iterateLineIndices( inFromIndex , inToIndex ) )
+
+    def getRectIndices( self            ,
+                        inCornerIndex   ,
+                        inOppositeIndex ):
+        '''
+        Get the cells of the rectangle between two opposite corner cells.
+
+        Args:
+            inCornerIndex (int): Index of a corner cell.
+
+            inOppositeIndex (int): Index of the opposite corner cell.
+
+        Returns:
+            list[int]: Indices of the cells of the rectangle, row by row.
+        '''
+        cornerRow , cornerColumn     = divmod( inCornerIndex , self.columnsInt )
+        oppositeRow , oppositeColumn = divmod( inOppositeIndex , self.columnsInt )
+
+        firstColumn = min( cornerColumn , oppositeColumn )
+        lastColumn  = max( cornerColumn , oppositeColumn ) + 1
+
+        rectIndices = []
+
+        for row in range( min( cornerRow , oppositeRow ) ,
+                          max( cornerRow , oppositeRow ) + 1 ):
+            rectIndices.extend( range( row * self.columnsInt + firstColumn ,
+                                       row * self.columnsInt + lastColumn  ) )
+
+        return rectIndices
+
+    def getBrushIndices( self           ,
+                         inIndex        ,
+                         inBrushSizeInt ):
+        '''
+        Get the cells of a square brush centered on a cell.
+
+        Args:
+            inIndex (int): Index of the center cell.
+
+            inBrushSizeInt (int): Width and height of the brush in cells.
+
+        Returns:
+            list[int]: Indices of the cells of the brush inside the grid.
+        '''
+        if inBrushSizeInt <= 1:
+            return [ inIndex ]
+
+        row , column = divmod( inIndex , self.columnsInt )
+
+        beforeInt = ( inBrushSizeInt - 1 ) // 2
+        afterInt  = inBrushSizeInt // 2
+
+        return self.getRectIndices( self.indexOf( max( 0 , column - beforeInt ) ,
+                                                  max( 0 , row - beforeInt )    ) ,
+                                    self.indexOf( min( self.lastColumnInt , column + afterInt ) ,
+                                                  min( self.lastRowInt , row + afterInt )       ) )
+
+    def getRegionIndices( self    ,
+                          inIndex ):
+        '''
+        Get the cells connected to a cell through their sides, walls if
+        the cell is a wall, cells that are not walls nor goals otherwise.
+
+        Note:
+            Scanline fill over a mask of the states built at once with
+            bytearray.translate, the ends of each span are found with
+            bytearray.find and bytearray.rfind instead of a step per cell.
+
+        Args:
+            inIndex (int): Index of the cell to fill from.
+
+        Returns:
+            list[int]: Indices of the cells of the region, empty if the
+                       cell is a goal.
+        '''
+        if self.states[ inIndex ] == GOAL_POINT_STATE:
+            return []
+
+        regionTable = WALL_REGION_TABLE if self.isWall( inIndex ) else OPEN_REGION_TABLE
+
+        # 0 for the cells of the region not filled yet.
+        # type: bytearray
+        mask = bytearray( self.states ).translate( regionTable )
+
+        columnsInt = self.columnsInt
+
+        regionIndices = []
+
+        seedIndices = [ inIndex ]
+
+        while seedIndices:
+
+            seedIndex = seedIndices.pop()
+
+            if mask[ seedIndex ]:
+                continue
+
+            rowStart = seedIndex - seedIndex % columnsInt
+            rowEnd   = rowStart + columnsInt
+
+            spanStart = max( mask.rfind( b'\x01' , rowStart , seedIndex ) + 1 , rowStart )
+            spanEnd   = mask.find( b'\x01' , seedIndex , rowEnd )
+
+            if spanEnd < 0:
+                spanEnd = rowEnd
+
+            mask[ spanStart : spanEnd ] = b'\x01' * ( spanEnd - spanStart )
+
+            regionIndices.extend( range( spanStart , spanEnd ) )
+
+            # First cell of each run of unfilled cells along the span
+            # in the rows above and below.
+            for rowOffset in ( -columnsInt , columnsInt ):
+
+                neighbourStart = spanStart + rowOffset
+                neighbourEnd   = spanEnd + rowOffset
+
+                if neighbourStart < 0 or neighbourEnd > self.cellCountInt:
+                    continue
+
+                runStart = mask.find( b'\x00' , neighbourStart , neighbourEnd )
+
+                while runStart >= 0:
+
+                    seedIndices.append( runStart )
+
+                    runEnd = mask.find( b'\x01' , runStart , neighbourEnd )
+
+                    if runEnd < 0:
+                        break
+
+                    runStart = mask.find( b'\x00' , runEnd , neighbourEnd )
+
+        return regionIndices
+
+    def getHeuristic( self        ,
+                      inGoalIndex ):
+        '''
+        Get the distance of every cell to a cell, computed for the
+        whole grid at once. Cached while the cell is one of goalIndices.
+
+        Note:
+            Rows at the same distance from the goal share their values,
+            so each distinct row is only computed once.
+
+        Args:
+            inGoalIndex (int): Index of the cell to calculate distances to.
+
+        Returns:
+            array.array: distance of each cell to the goal, by cell index.
+        '''
+        heuristic = self.heuristicsMapping.get( inGoalIndex )
+
+        if heuristic is not None:
+            return heuristic
+
+        goalRow , goalColumn = divmod( inGoalIndex , self.columnsInt )
+
+        xDistances = [ abs( column - goalColumn ) for column in range( self.columnsInt ) ]
+
+        diagonalExtraCost = self.DIAGONAL_COST_INT - 2 * self.STRAIGHT_COST_INT
+
+        # Distances of the cells of a row by its distance to the goal row.
+        # type: dict[int, array.array]
+        rowsMapping = {}
+
+        heuristic = array.array( 'I' )
+
+        for row in range( self.rowsInt ):
+
+            yDistanceInt = abs( row - goalRow )
+
+            rowHeuristic = rowsMapping.get( yDistanceInt )
+
+            if rowHeuristic is None:
+                rowHeuristic = array.array( 'I' , [ self.STRAIGHT_COST_INT * ( xDistanceInt + yDistanceInt ) +
+                                                    diagonalExtraCost * min( xDistanceInt , yDistanceInt )
+                                                    for xDistanceInt in xDistances ] )
+                rowsMapping[ yDistanceInt ] = rowHeuristic
+
+            heuristic.extend( rowHeuristic )
+
+        if inGoalIndex in self.goalIndices:
+            self.heuristicsMapping[ inGoalIndex ] = heuristic
+
+        return heuristic
+
+    def getTargetsHeuristic( self            ,
+                             inTargetIndices ):
+        '''
+        Get the lowest distance of every cell to any of some cells,
+        see getHeuristic.
+
+        Args:
+            inTargetIndices (list[int]): Indices of the cells to calculate
+                                         distances to, empty for a
+                                         distance of 0 everywhere.
+
+        Returns:
+            array.array: lowest distance of each cell to a target,
+                         by cell index.
+        '''
+        if not inTargetIndices:
+            return array.array( 'I' , [ 0 ] ) * self.cellCountInt
+
+        heuristic = self.getHeuristic( inTargetIndices[ 0 ] )
+
+        for targetIndex in inTargetIndices[ 1 : ]:
+            heuristic = array.array( 'I' , map( min                              ,
+                                                heuristic                        ,
+                                                self.getHeuristic( targetIndex ) ) )
+
+        return heuristic
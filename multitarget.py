@@ -0,0 +1,242 @@
+import heapq
+import itertools
+
+import model
+import search
+
+class AAMultiTargetResult(search.AASearchResult):
+
+    def __init__( self ):
+        '''
+        Outcome of a search from a start cell to many target cells,
+        pathIndices holds the paths to every reached target one after
+        the other, starting with the nearest one.
+        '''
+        super( AAMultiTargetResult , self ).__init__()
+
+        # Path from the start to each reached target.
+        # type: dict[int, list[int]]
+        self.targetPathsMapping = {}
+
+        # Target with the cheapest path, None if no target was reached.
+        # type: int|None
+        self.nearestIndex = None
+
+class AANearestTargetSearch(search.AAAStarSearch):
+
+    # Name displayed when choosing the search algorithm.
+    # type: str
+    NAME = 'Nearest target'
+
+    # Searches from the first goal to every other goal instead of
+    # from a start to an end goal.
+    # type: bool
+    MULTI_TARGET_BOOL = True
+
+    # Keep expanding until every target is reached.
+    # type: bool
+    ALL_TARGETS_BOOL = False
+
+    # Highest amount of targets to compute the heuristic of, with more
+    # targets computing it costs more than the expansions it saves.
+    # type: int
+    MAX_HEURISTIC_TARGETS_INT = 8
+
+    def __init__( self    ,
+                  inModel ):
+        '''
+        A* search from a start cell to the nearest of many target cells
+        in a single expansion, guided by the distance to the closest
+        target.
+
+        Args:
+            inModel (model.AAGridModel): Grid model to find paths on.
+        '''
+        super( AANearestTargetSearch , self ).__init__( inModel )
+
+    def getHeuristic( self            ,
+                      inTargetIndices ):
+        '''
+        Get the distance of every cell to its closest target.
+
+        Note:
+            Searching for every target needs the exact cost of each one,
+            so the heuristic is 0 everywhere, as it is when there are
+            more than MAX_HEURISTIC_TARGETS_INT targets.
+
+        Args:
+            inTargetIndices (list[int]): Indices of the target cells.
+
+        Returns:
+            array.array|chunks.AADistanceHeuristic: lowest distance of
+                                                   each cell to a target.
+        '''
+        if self.ALL_TARGETS_BOOL or len( inTargetIndices ) > self.MAX_HEURISTIC_TARGETS_INT:
+            return self.model.getTargetsHeuristic( [] )
+
+        return self.model.getTargetsHeuristic( inTargetIndices )
+
+    def findPath( self                      ,
+                  inStartIndex              ,
+                  inTargetIndices           ,
+                  inExploredCallback = None ):
+        '''
+        Find the paths from the start cell to the nearest target,
+        or to every target when ALL_TARGETS_BOOL is True.
+
+        Args:
+            inStartIndex (int): Index of the cell to start from.
+
+            inTargetIndices (int|list[int]): Index of the cells to reach.
+
+            inExploredCallback (callable|None): Called with the indices
+                                                explored by each expansion
+                                                as soon as they are known.
+
+        Returns:
+            AAMultiTargetResult: Found paths and explored cells.
+        '''
+        result = AAMultiTargetResult()
+
+        if isinstance( inTargetIndices , ( list , tuple ) ):
+            inTargetIndices = list( inTargetIndices )
+        else:
+            inTargetIndices = [ inTargetIndices ]
+
+        pendingIndices = set( inTargetIndices )
+
+        if not pendingIndices:
+            return result
+
+        aaModel = self.model
+
+        states = aaModel.states
+
+        openStamp   = aaModel.beginSearch()
+        closedStamp = openStamp + 1
+
+        searchStamps  = aaModel.searchStamps
+        gCosts        = aaModel.searchCosts
+        parentIndices = aaModel.searchParents
+
+        hCosts = self.getHeuristic( inTargetIndices )
+
+        searchInstrumentation = self.instrumentation
+
+        if searchInstrumentation:
+            searchInstrumentation.countHeuristic()
+
+        searchStamps[ inStartIndex ]  = openStamp
+        gCosts[ inStartIndex ]        = 0
+        parentIndices[ inStartIndex ] = model.NO_PARENT
+
+        insertionCount = itertools.count()
+
+        openHeap = [ ( hCosts[ inStartIndex ]  ,
+                       hCosts[ inStartIndex ]  ,
+                       next( insertionCount )  ,
+                       inStartIndex            ) ]
+
+        while openHeap:
+
+            if self.cancelledBool:
+                result.cancelledBool = True
+                return result
+
+            fCost , hCost , _ , currentIndex = heapq.heappop( openHeap )
+
+            if searchStamps[ currentIndex ] != openStamp:
+                continue
+
+            if fCost != gCosts[ currentIndex ] + hCost:
+                continue
+
+            searchStamps[ currentIndex ] = closedStamp
+
+            result.expandedNodesInt += 1
+
+            if searchInstrumentation:
+                searchInstrumentation.expand( currentIndex        ,
+                                              len( openHeap ) + 1 )
+
+            if currentIndex in pendingIndices:
+
+                pendingIndices.discard( currentIndex )
+
+                targetPath = self.retracePath( parentIndices ,
+                                               currentIndex  )
+
+                result.targetPathsMapping[ currentIndex ] = targetPath
+                result.pathIndices.extend( targetPath )
+
+                if result.nearestIndex is None:
+                    result.nearestIndex = currentIndex
+
+                if not self.ALL_TARGETS_BOOL or not pendingIndices:
+                    return result
+
+            exploredIndices = []
+
+            currentCost = gCosts[ currentIndex ]
+
+            for neighbourIndex , stepCost in aaModel.getNeighbourSteps( currentIndex ):
+
+                if states[ neighbourIndex ] == model.WALL_STATE:
+                    continue
+
+                exploredIndices.append( neighbourIndex )
+
+                neighbourStamp = searchStamps[ neighbourIndex ]
+
+                if neighbourStamp == closedStamp:
+                    continue
+
+                newCostToNeighbour = currentCost + stepCost
+
+                if neighbourStamp != openStamp or newCostToNeighbour < gCosts[ neighbourIndex ]:
+
+                    neighbourHCost = hCosts[ neighbourIndex ]
+
+                    if searchInstrumentation:
+                        searchInstrumentation.relax( currentIndex                ,
+                                                     neighbourIndex              ,
+                                                     newCostToNeighbour          ,
+                                                     neighbourStamp == openStamp )
+                        searchInstrumentation.countHeuristic()
+
+                    searchStamps[ neighbourIndex ]  = openStamp
+                    gCosts[ neighbourIndex ]        = newCostToNeighbour
+                    parentIndices[ neighbourIndex ] = currentIndex
+
+                    heapq.heappush( openHeap , ( newCostToNeighbour + neighbourHCost ,
+                                                 neighbourHCost                      ,
+                                                 next( insertionCount )              ,
+                                                 neighbourIndex                      ) )
+
+            result.exploredIndices.append( exploredIndices )
+
+            if inExploredCallback:
+                inExploredCallback( exploredIndices )
+
+        return result
+
+class AAAllTargetsSearch(AANearestTargetSearch):
+
+    # Name displayed when choosing the search algorithm.
+    # type: str
+    NAME = 'All targets'
+
+    # Keep expanding until every target is reached.
+    # type: bool
+    ALL_TARGETS_BOOL = True
+
+    def __init__( self    ,
+                  inModel ):
+        '''
+        Dijkstra search from a start cell to every target cell in a single
+        expansion, stopping once the last reachable target is reached.
+
+        Args:
+            inModel (model.AAGridModel): Grid model to find paths on.
+        '''
+        super( AAAllTargetsSearch , self ).__init__( inModel )
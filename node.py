@@ -1,5 +1,7 @@
 from PyQt5 import QtWidgets, QtCore, QtGui
 
+import model
+
 class AANode(QtWidgets.QGraphicsItem):
     """
     A graphic representation of a node.
@@ -19,15 +21,15 @@ class AANode(QtWidgets.QGraphicsItem):
 
     TEXT_COLOR        = QtGui.QColor( 0 , 200 , 200 , 255 )
 
-    BLANK_STATE      = 0
+    BLANK_STATE      = model.BLANK_STATE
 
-    WALL_STATE       = 1
+    WALL_STATE       = model.WALL_STATE
 
-    GOAL_POINT_STATE = 2
+    GOAL_POINT_STATE = model.GOAL_POINT_STATE
 
-    EXPLORED_STATE   = 3
+    EXPLORED_STATE   = model.EXPLORED_STATE
 
-    PATH_STATE       = 4
+    PATH_STATE       = model.PATH_STATE
 
     STATE_MAPPING    = { BLANK_STATE      : BLANK_COLOR      ,
                          WALL_STATE       : WALL_COLOR       ,
@@ -41,18 +43,30 @@ class AANode(QtWidgets.QGraphicsItem):
     def __init__( self       ,
                   inPosX     ,
                   inPosY     ,
-                  inGridSize ):
+                  inGridSize ,
+                  inModel    ,
+                  inIndex    ):
         '''
-        Check if the current word corresponds to current class.
+        Graphic item displaying a cell of a grid model,
+        the state is read from and written to the model.
 
         Args:
-            inAAString (string.AAString): AAString to check if it's the current type.
+            inPosX (int): Position in X axis to put the node at.
 
-        Returns:
-            bool: True if it matches the class, False otherwise.
+            inPosY (int): Position in Y axis to put the node at.
+
+            inGridSize (int): Size for the Node for width and height.
+
+            inModel (model.AAGridModel): Model storing the state of the node.
+
+            inIndex (int): Index of the cell of the node in the model.
         '''
         super( AANode , self ).__init__()
 
+        self.model     = inModel
+
+        self.cellIndex = inIndex
+
         self._gCost     = 0
 
         self._hCost     = 0
@@ -61,8 +75,6 @@ class AANode(QtWidgets.QGraphicsItem):
 
         self.parentNode = None
 
-        self._currentState = self.BLANK_STATE
-
         self.posX     = inPosX
         self.posY     = inPosY
         self.gridGize = inGridSize
@@ -108,8 +120,8 @@ class AANode(QtWidgets.QGraphicsItem):
         Calculates the distance to another node.
 
         Note:
-            Based on the rule that diagonal moves are worth .14 * Distance
-            while other directions are worth .10 * Distance.
+            Same rule as model.AAGridModel.distance, diagonal moves are
+            worth 14 per node while other directions are worth 10 per node.
 
         Args:
             inNode (int): Node to calculate distance to.
@@ -117,13 +129,8 @@ class AANode(QtWidgets.QGraphicsItem):
         Returns:
             int: Calculated distance value.
         '''
-
-        xDistanceInt = abs( self.posX - inNode.posX )
-        yDistanceInt = abs( self.posY - inNode.posY )
-
-        if xDistanceInt > yDistanceInt:
-            return int( .14 * yDistanceInt + ( ( xDistanceInt - yDistanceInt ) * .10 ) )
-        return int( .14 * xDistanceInt + ( ( yDistanceInt - xDistanceInt ) * .10 ) )
+        return self.model.distance( self.cellIndex   ,
+                                    inNode.cellIndex )
 
     @property
     def fCost( self ):
@@ -282,9 +289,9 @@ class AANode(QtWidgets.QGraphicsItem):
         Gets the current state of the node.
 
         Returns:
-            None.
+            int: current state.
         '''
-        return self._currentState
+        return self.model.states[ self.cellIndex ]
 
     @currentState.setter
     def currentState(self          ,
@@ -298,7 +305,8 @@ class AANode(QtWidgets.QGraphicsItem):
         Returns:
             None.
         '''
-        self._currentState = inNewStateInt
+        self.model.setSearchState( self.cellIndex ,
+                                   inNewStateInt  )
 
         # to call paint.
         self.update()
@@ -0,0 +1,254 @@
+import collections
+
+class AACachedPath(object):
+
+    def __init__( self           ,
+                  inResult       ,
+                  inDependencies ,
+                  inVersionInt   ):
+        '''
+        Result of a search kept by AAPathCache.
+
+        Args:
+            inResult (search.AASearchResult): Result of the search.
+
+            inDependencies (set(int)|None): Indices of the cells the search
+                                            read, None if it may read any
+                                            cell of the grid.
+
+            inVersionInt (int): Version of the grid the result was found at.
+        '''
+        self.result = inResult
+
+        self.dependencies = inDependencies
+
+        # Latest version of the grid the result is known to be valid at,
+        # moved forward by the edits that do not touch its dependencies.
+        # type: int
+        self.versionInt = inVersionInt
+
+class AAPathCache(object):
+
+    # Highest amount of results kept, the least recently used one is
+    # dropped when storing another one.
+    # type: int
+    MAX_ENTRIES_INT = 32
+
+    def __init__( self                              ,
+                  inAAGrid                          ,
+                  inMaxEntriesInt = MAX_ENTRIES_INT ):
+        '''
+        Results of the searches run on a grid by search, start and end
+        cell, so running a search again on an unchanged grid replays its
+        result instead of searching.
+
+        Note:
+            Register notifyCellChanged in grid.AAGrid.cellChangedCallbacks
+            so edits drop the results that depend on the edited cells.
+            Results of searches without
+            search.AAAStarSearch.LOCAL_READS_BOOL are dropped by any edit.
+
+        Args:
+            inAAGrid (grid.AAGrid): Grid the searches run on.
+
+            inMaxEntriesInt (int): Highest amount of results kept.
+        '''
+        self.grid = inAAGrid
+
+        self.maxEntriesInt = inMaxEntriesInt
+
+        # Cached results by search name, start index and end index or
+        # indices, least recently used first.
+        # type: collections.OrderedDict[tuple, AACachedPath]
+        self.entriesMapping = collections.OrderedDict()
+
+        # Keys of the cached results depending on each cell.
+        # type: dict[int, set(tuple)]
+        self.cellKeysMapping = {}
+
+        # Keys of the cached results depending on every cell.
+        # type: set(tuple)
+        self.globalKeys = set()
+
+        # Amount of results found and not found in the cache.
+        # type: int
+        self.hitsInt   = 0
+        self.missesInt = 0
+
+    def getKey( self         ,
+                inPathSearch ,
+                inStartIndex ,
+                inEndIndex   ):
+        '''
+        Get the key of the result of a search.
+
+        Args:
+            inPathSearch (search.AAAStarSearch): Search that ran.
+
+            inStartIndex (int): Index of the cell the search started from.
+
+            inEndIndex (int|list[int]): Index of the cell to reach, indices
+                                        of the target cells for multi
+                                        target searches.
+
+        Returns:
+            tuple: key of the result.
+        '''
+        if isinstance( inEndIndex , list ):
+            inEndIndex = tuple( inEndIndex )
+
+        return ( inPathSearch.NAME ,
+                 inStartIndex      ,
+                 inEndIndex        )
+
+    def get( self         ,
+             inPathSearch ,
+             inStartIndex ,
+             inEndIndex   ):
+        '''
+        Get the cached result of a search.
+
+        Args:
+            inPathSearch (search.AAAStarSearch): Search to run.
+
+            inStartIndex (int): Index of the cell to start from.
+
+            inEndIndex (int|list[int]): Index of the cell to reach, indices
+                                        of the target cells for multi
+                                        target searches.
+
+        Returns:
+            AACachedPath|None: cached result, None if not cached.
+        '''
+        cacheKey = self.getKey( inPathSearch ,
+                                inStartIndex ,
+                                inEndIndex   )
+
+        cachedPath = self.entriesMapping.get( cacheKey )
+
+        if cachedPath is None:
+            self.missesInt += 1
+            return None
+
+        self.hitsInt += 1
+
+        # Most recently used go last.
+        del self.entriesMapping[ cacheKey ]
+        self.entriesMapping[ cacheKey ] = cachedPath
+
+        return cachedPath
+
+    def store( self         ,
+               inPathSearch ,
+               inStartIndex ,
+               inEndIndex   ,
+               inResult     ):
+        '''
+        Cache the result of a search, dropping the least recently used
+        result if there are maxEntriesInt already.
+
+        Note:
+            A search with LOCAL_READS_BOOL only reads the cells it
+            expanded and their neighbours. The expanded cells are the
+            start and cells explored by earlier expansions, so its
+            dependencies are the explored cells, the start and their
+            neighbours.
+
+        Args:
+            inPathSearch (search.AAAStarSearch): Search that ran.
+
+            inStartIndex (int): Index of the cell the search started from.
+
+            inEndIndex (int|list[int]): Index of the cell to reach, indices
+                                        of the target cells for multi
+                                        target searches.
+
+            inResult (search.AASearchResult): Result of the search.
+
+        Returns:
+            None: No return value.
+        '''
+        if inResult.cancelledBool:
+            return
+
+        cacheKey = self.getKey( inPathSearch ,
+                                inStartIndex ,
+                                inEndIndex   )
+
+        self.remove( cacheKey )
+
+        dependencies = None
+
+        if inPathSearch.LOCAL_READS_BOOL:
+
+            readIndices = set( [ inStartIndex ] )
+
+            for exploredIndices in inResult.exploredIndices:
+                readIndices.update( exploredIndices )
+
+            dependencies = set( readIndices )
+
+            getNeighbours = self.grid.model.getNeighbours
+
+            for readIndex in readIndices:
+                dependencies.update( getNeighbours( readIndex ) )
+
+            for cellIndex in dependencies:
+                self.cellKeysMapping.setdefault( cellIndex , set() ).add( cacheKey )
+
+        else:
+            self.globalKeys.add( cacheKey )
+
+        self.entriesMapping[ cacheKey ] = AACachedPath( inResult             ,
+                                                        dependencies         ,
+                                                        self.grid.versionInt )
+
+        while len( self.entriesMapping ) > self.maxEntriesInt:
+            self.remove( next( iter( self.entriesMapping ) ) )
+
+    def remove( self       ,
+                inCacheKey ):
+        '''
+        Drop a cached result and its entries in the cell index.
+
+        Args:
+            inCacheKey (tuple): Key of the result, see getKey.
+
+        Returns:
+            None: No return value.
+        '''
+        cachedPath = self.entriesMapping.pop( inCacheKey , None )
+
+        if cachedPath is None:
+            return
+
+        if cachedPath.dependencies is None:
+            self.globalKeys.discard( inCacheKey )
+            return
+
+        for cellIndex in cachedPath.dependencies:
+
+            cellKeys = self.cellKeysMapping[ cellIndex ]
+            cellKeys.discard( inCacheKey )
+
+            if not cellKeys:
+                del self.cellKeysMapping[ cellIndex ]
+
+    def notifyCellChanged( self    ,
+                           inIndex ):
+        '''
+        Drop the results depending on a cell that switched between
+        wall and not wall or changed terrain cost, the other results
+        stay valid at the new version of the grid.
+
+        Args:
+            inIndex (int): Index of the changed cell.
+
+        Returns:
+            None: No return value.
+        '''
+        for cacheKey in list( self.cellKeysMapping.get( inIndex , () ) ) + list( self.globalKeys ):
+            self.remove( cacheKey )
+
+        for cachedPath in self.entriesMapping.values():
+            cachedPath.versionInt = self.grid.versionInt
@@ -1,106 +1,347 @@
-import node
+import time
 
-class AAPathFinder(object):
+from PyQt5 import QtCore
 
-    def __init__( self     ,
-                  inAAGrid ,
-                  inView   ):
+import anyangle
+import bidirectional
+import hpa
+import instrumentation
+import jps
+import lpastar
+import multitarget
+import node
+import search
+import worker
+
+# Search algorithms to choose from.
+# type: tuple(type)
+SEARCH_CLASSES = ( search.AAAStarSearch                ,
+                   jps.AAJumpPointSearch               ,
+                   bidirectional.AABidirectionalSearch ,
+                   lpastar.AALPAStarSearch             ,
+                   hpa.AAHierarchicalSearch            ,
+                   anyangle.AAThetaStarSearch          ,
+                   anyangle.AALazyThetaStarSearch      ,
+                   multitarget.AANearestTargetSearch   ,
+                   multitarget.AAAllTargetsSearch      )
+
+class AAPathFinder(QtCore.QObject):
+
+    def __init__( self                     ,
+                  inAAGrid                 ,
+                  inView                   ,
+                  inPathSearch      = None ,
+                  inInstrumentation = None ,
+                  inPathCache       = None ):
         '''
         Class to handle finding the path between the start nodes using
-        A* search algorithm.
+        A* search algorithm and displaying the result on the nodes.
+
+        Note:
+            The search runs on the Qt free model of the grid,
+            see search.AAAStarSearch. With a view it runs in a thread and
+            the explored nodes are displayed while the search goes on.
 
         Args:
             inAAGrid (grid.AAGrid): Grid to explore nodes from.
 
-            inView (view.View): View to handle delay displaying
-                                of the algorithm progress
+            inView (view.View|None): View to handle delay displaying
+                                     of the algorithm progress,
+                                     None to search without displaying it.
+
+            inPathSearch (search.AAAStarSearch|None): Search algorithm to run,
+                                                      an instance of one of
+                                                      SEARCH_CLASSES, None
+                                                      for a new A* search.
+
+            inInstrumentation (instrumentation.AASearchInstrumentation|None):
+                Counters, phase timings and hooks to fill while finding
+                the path, None to run without them.
+
+            inPathCache (pathcache.AAPathCache|None): Results of previous
+                                                      searches to replay
+                                                      instead of searching
+                                                      and to store the result
+                                                      in, None to always
+                                                      search.
         '''
+        super( AAPathFinder , self ).__init__()
+
         self.view = inView
 
         self.grid = inAAGrid
 
-        if len(self.grid.goalNodes) != 2:
-            print 'Need at least start and end point.'
+        # Search algorithm to run, kept between path finders by searches
+        # that reuse their state, see lpastar.AALPAStarSearch.
+        # type: search.AAAStarSearch
+        self.pathSearch = inPathSearch or search.AAAStarSearch( self.grid.model )
+
+        # Counters, timings and hooks filled while finding the path.
+        # type: instrumentation.AASearchInstrumentation|None
+        self.instrumentation = inInstrumentation
+
+        self.pathSearch.instrumentation = inInstrumentation
+
+        # Results of previous searches on the grid.
+        # type: pathcache.AAPathCache|None
+        self.pathCache = inPathCache
+
+        # Amount of nodes taken out of the open set during the search.
+        # type: int
+        self.expandedNodesInt = 0
+
+        # Indices of the nodes of the found path from start to end,
+        # empty if not found.
+        # type: list[int]
+        self.pathIndices = []
+
+        # Thread running the search when displaying it in a view.
+        # type: worker.AASearchThread|None
+        self.searchThread = None
+
+        # True once the search was cancelled, its results are ignored.
+        # type: bool
+        self.cancelledBool = False
+
+        goalIndices = self.grid.model.goalIndices
+
+        if len( goalIndices ) < 2 or ( len( goalIndices ) > 2 and not self.pathSearch.MULTI_TARGET_BOOL ):
+            print( 'Need at least start and end point.' )
             return
 
-        self.startNode , self.endNode = self.grid.goalNodes
+        self.startIndex = goalIndices[ 0 ]
+
+        # Index of the cell to reach, or of every target cell
+        # for multi target searches.
+        # type: int|list[int]
+        self.endIndex = goalIndices[ 1 : ] if self.pathSearch.MULTI_TARGET_BOOL else goalIndices[ 1 ]
 
         self.findPath()
 
     def findPath( self ):
         '''
         Find a path between the start and end Node through
-        A* search algorithm.
+        the search algorithm.
 
         Returns:
             None: No return value.
         '''
-        openNodes = []
-        closedNodes = set()
-        openNodes.append( self.startNode )
+        if self.pathSearch.MULTI_TARGET_BOOL:
 
-        while len(openNodes) > 0:
+            # Searching for unreachable targets would expand every
+            # reachable cell.
+            self.endIndex = [ targetIndex for targetIndex in self.endIndex
+                              if self.grid.components.isConnected( self.startIndex ,
+                                                                   targetIndex     ) ]
 
-            currentNode = openNodes[ 0 ]
-
-            for aaNode in openNodes:
+            if not self.endIndex:
+                self.finishSearch( search.AASearchResult() )
+                return
 
-                if aaNode is currentNode:
-                    continue
+        elif not self.grid.components.isConnected( self.startIndex ,
+                                                   self.endIndex   ):
+            self.finishSearch( search.AASearchResult() )
+            return
 
-                if aaNode.fCost <= currentNode.fCost:
-                    if aaNode.hCost < currentNode.hCost:
-                        currentNode = aaNode
+        if self.pathCache:
 
-            openNodes.remove(currentNode)
-            closedNodes.add(currentNode)
+            cachedPath = self.pathCache.get( self.pathSearch ,
+                                             self.startIndex ,
+                                             self.endIndex   )
 
-            if currentNode == self.endNode:
-                self.retracePath( self.endNode )
+            if cachedPath:
+                self.replayCachedPath( cachedPath )
                 return
 
-            neighborsToExploreWithDelay = []
+        # The search may have been cancelled by a previous path finder.
+        self.pathSearch.cancelledBool = False
 
-            for neighbourNode in self.grid.getNeighbours( currentNode ):
+        if not self.view:
 
-                if neighbourNode.currentState == node.AANode.WALL_STATE:
-                    continue
+            if self.instrumentation:
+                result = self.instrumentation.runSearch( self.pathSearch ,
+                                                         self.startIndex ,
+                                                         self.endIndex   )
+            else:
+                result = self.pathSearch.findPath( self.startIndex ,
+                                                   self.endIndex   )
 
-                neighborsToExploreWithDelay.append( neighbourNode.setToExplored )
+            self.storeResult( result )
+            self.finishSearch( result )
+            return
 
-                if neighbourNode in closedNodes:
-                    continue
+        self.searchThread = worker.AASearchThread( self.pathSearch ,
+                                                   self.startIndex ,
+                                                   self.endIndex   )
 
-                newCostToNeighbour = currentNode.gCost + currentNode.distanceTo( neighbourNode )
+        self.searchThread.exploredBatchReady.connect( self.displayExplored )
+        self.searchThread.searchFinished.connect( self.storeResult )
+        self.searchThread.searchFinished.connect( self.finishSearch )
 
-                if newCostToNeighbour < neighbourNode.gCost or neighbourNode not in openNodes:
+        self.searchThread.start()
 
-                    neighbourNode.gCost = newCostToNeighbour
-                    neighbourNode.hCost = neighbourNode.distanceTo( self.endNode )
-                    neighbourNode.parentNode = currentNode
+    def isRunning( self ):
+        '''
+        Check if the search is still running.
 
-                    if neighbourNode not in openNodes:
-                        openNodes.append( neighbourNode )
+        Returns:
+            bool: True if the search thread is running, False otherwise.
+        '''
+        return bool( self.searchThread and self.searchThread.isRunning() )
 
-            self.view.startTimer( neighborsToExploreWithDelay )
+    def cancel( self ):
+        '''
+        Stop the search, explored nodes and results that
+        were not displayed yet are ignored.
 
-    def retracePath( self   ,
-                     inNode ):
+        Returns:
+            None: No return value.
+        '''
+        self.cancelledBool = True
+
+        if self.searchThread:
+            self.searchThread.cancel()
+
+    @QtCore.pyqtSlot( object )
+    def displayExplored( self                   ,
+                         inExploredIndicesBatch ):
+        '''
+        Display with a delay the nodes explored by a batch of expansions.
+
+        Args:
+            inExploredIndicesBatch (list[list[int]]): Indices explored by
+                                                      each expansion.
+
+        Returns:
+            None: No return value.
+        '''
+        if self.cancelledBool or not self.view:
+            return
+
+        startTime = time.time()
+
+        for exploredIndices in inExploredIndicesBatch:
+            self.view.displayStates( exploredIndices           ,
+                                     node.AANode.EXPLORED_STATE )
+
+        if self.instrumentation:
+            self.instrumentation.addPhaseSeconds( instrumentation.PLAYBACK_PHASE ,
+                                                  time.time() - startTime        )
+
+    def replayCachedPath( self         ,
+                          inCachedPath ):
+        '''
+        Display at once the explored nodes and path of a cached result.
+
+        Args:
+            inCachedPath (pathcache.AACachedPath): Cached result to replay.
+
+        Returns:
+            None: No return value.
+        '''
+        result = inCachedPath.result
+
+        self.expandedNodesInt = result.expandedNodesInt
+        self.pathIndices      = result.pathIndices
+
+        if not self.view:
+            return
+
+        startTime = time.time()
+
+        indexStates = [ ( exploredIndex , node.AANode.EXPLORED_STATE )
+                        for exploredIndices in result.exploredIndices
+                        for exploredIndex in exploredIndices ]
+
+        indexStates.extend( ( pathIndex , node.AANode.PATH_STATE ) for pathIndex in result.pathIndices )
+
+        self.view.updateNodes( self.grid.applyStates( indexStates ) )
+        self.view.displayWaypoints( result.waypointIndices )
+
+        messages = [] if result.foundBool else [ 'No path between the goal nodes.' ]
+
+        if self.instrumentation:
+
+            self.instrumentation.addPhaseSeconds( instrumentation.PLAYBACK_PHASE ,
+                                                  time.time() - startTime        )
+
+            messages.append( 'Replayed the cached result, valid at grid version {0}.'.format( inCachedPath.versionInt ) )
+            messages.append( self.instrumentation.formatSummary() )
+
+        self.view.setStatusMessage( '\n'.join( messages ) )
+
+    @QtCore.pyqtSlot( object )
+    def storeResult( self     ,
+                     inResult ):
+        '''
+        Keep the result of the search in the path cache.
+
+        Args:
+            inResult (search.AASearchResult): Result of the search.
+
+        Returns:
+            None: No return value.
+        '''
+        if self.pathCache and not self.cancelledBool:
+            self.pathCache.store( self.pathSearch ,
+                                  self.startIndex ,
+                                  self.endIndex   ,
+                                  inResult        )
+
+    @QtCore.pyqtSlot( object )
+    def finishSearch( self     ,
+                      inResult ):
+        '''
+        Store the result of the search and display the path.
+
+        Args:
+            inResult (search.AASearchResult): Result of the search.
+
+        Returns:
+            None: No return value.
+        '''
+        if self.cancelledBool or inResult.cancelledBool:
+            return
+
+        self.expandedNodesInt = inResult.expandedNodesInt
+
+        if inResult.foundBool:
+            self.retracePath( inResult.pathIndices )
+
+        if self.view:
+
+            self.view.displayWaypoints( inResult.waypointIndices )
+
+            messages = [] if inResult.foundBool else [ 'No path between the goal nodes.' ]
+
+            if self.instrumentation:
+                messages.append( self.instrumentation.formatSummary() )
+
+            self.view.setStatusMessage( '\n'.join( messages ) )
+
+    def retracePath( self      ,
+                     inIndices ):
         '''
         After a path has been found from the start to the end node
-        a singly-linked list is accesible through starting from the end node,
-        Display the path with a delay.
+        display the path with a delay.
 
         Args:
-            inNode (node.AANode): End Node to start retracing the found path.
+            inIndices (list[int]): Indices of the nodes of the path
+                                   from start to end.
 
         Returns:
             None: No return value.
         '''
-        parentLinkedList = []
+        self.pathIndices = inIndices
+
+        if not self.view:
+            return
+
+        startTime = time.time()
 
-        while inNode:
-            parentLinkedList.append( inNode )
-            inNode = inNode.parentNode
+        self.view.displayStates( self.pathIndices       ,
+                                 node.AANode.PATH_STATE )
 
-        self.view.startTimer( [ aaNode.setToPath for aaNode in reversed( parentLinkedList ) ] )
+        if self.instrumentation:
+            self.instrumentation.addPhaseSeconds( instrumentation.PLAYBACK_PHASE ,
+                                                  time.time() - startTime        )
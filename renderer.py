@@ -0,0 +1,419 @@
+from PyQt5 import QtWidgets, QtCore, QtGui
+
+import model
+import node
+
+class AAGridItem(QtWidgets.QGraphicsItem):
+    """
+    A single graphic item drawing every cell of a grid.
+    """
+
+    # Draw the borders of the cells over them.
+    # type: bool
+    DRAW_BORDERS_BOOL = True
+
+    def __init__( self   ,
+                  inGrid ):
+        '''
+        Graphic item drawing the cells of a grid from the states stored
+        in its model, through an image with one pixel per cell.
+
+        Note:
+            Only the cells inside the exposed rectangle are copied
+            into an image of their size and drawn, so grids far larger
+            than the window can be panned over. Repaint changed cells by
+            updating their rectangle, see grid.AAGrid.getCellsRect.
+
+        Args:
+            inGrid (grid.AAGrid): Grid to draw.
+        '''
+        super( AAGridItem , self ).__init__()
+
+        self.grid = inGrid
+
+        self.setFlag( QtWidgets.QGraphicsItem.ItemUsesExtendedStyleOption ,
+                      True                                                )
+
+        # Color of each value of the cells, see getColorTable.
+        # type: list[int]
+        self.colorTable = self.getColorTable()
+
+        self.pen = QtGui.QPen()
+        self.pen.setStyle( QtCore.Qt.SolidLine )
+        self.pen.setWidth( 1 )
+        self.pen.setCosmetic( True )
+        self.pen.setColor( node.AANode.BORDER_COLOR )
+
+    def getColorTable( self ):
+        '''
+        Get the color of each value of the cells.
+
+        Returns:
+            list[int]: rgba color of each value.
+        '''
+        return [ node.AANode.STATE_MAPPING[ state ].rgba()
+                 for state in sorted( node.AANode.STATE_MAPPING ) ]
+
+    def getCellValues( self ):
+        '''
+        Get the value of each cell to draw with the color table.
+
+        Returns:
+            array.array: value of each cell, by cell index.
+        '''
+        return self.grid.model.states
+
+    def boundingRect( self ):
+        '''
+        Reimplementation of boundingRect
+        '''
+        return QtCore.QRectF( 0                                                    ,
+                              0                                                    ,
+                              self.grid.model.columnsInt * self.grid.NODE_SIZE_INT ,
+                              self.grid.model.rowsInt * self.grid.NODE_SIZE_INT    )
+
+    def getCellsRange( self     ,
+                       inRect   ):
+        '''
+        Get the columns and rows of the cells inside a rectangle.
+
+        Args:
+            inRect (QtCore.QRectF): Rectangle in item coordinates.
+
+        Returns:
+            tuple(int, int, int, int): first column, first row, last column
+                                       and last row, last ones excluded.
+        '''
+        nodeSize = self.grid.NODE_SIZE_INT
+
+        aaModel = self.grid.model
+
+        firstColumn = max( 0 , int( inRect.left() ) // nodeSize )
+        firstRow    = max( 0 , int( inRect.top() ) // nodeSize )
+        lastColumn  = min( aaModel.columnsInt , int( inRect.right() ) // nodeSize + 1 )
+        lastRow     = min( aaModel.rowsInt , int( inRect.bottom() ) // nodeSize + 1 )
+
+        return firstColumn , firstRow , lastColumn , lastRow
+
+    def createImage( self          ,
+                     inFirstColumn ,
+                     inFirstRow    ,
+                     inLastColumn  ,
+                     inLastRow     ):
+        '''
+        Create an image with the values of a block of cells.
+
+        Args:
+            inFirstColumn (int): First column of the block.
+
+            inFirstRow (int): First row of the block.
+
+            inLastColumn (int): Column after the block.
+
+            inLastRow (int): Row after the block.
+
+        Returns:
+            QtGui.QImage: image with the value of each cell of the block
+                          as color index.
+        '''
+        states = self.getCellValues()
+
+        columnsInt = self.grid.model.columnsInt
+
+        image = QtGui.QImage( inLastColumn - inFirstColumn ,
+                              inLastRow - inFirstRow       ,
+                              QtGui.QImage.Format_Indexed8 )
+
+        image.setColorTable( self.colorTable )
+
+        bytesPerLine = image.bytesPerLine()
+
+        imageBits = image.bits()
+        imageBits.setsize( image.sizeInBytes() )
+
+        for row in range( inFirstRow , inLastRow ):
+
+            rowIndex  = row * columnsInt
+            lineIndex = ( row - inFirstRow ) * bytesPerLine
+
+            imageBits[ lineIndex : lineIndex + inLastColumn - inFirstColumn ] = \
+                states[ rowIndex + inFirstColumn : rowIndex + inLastColumn ].tobytes()
+
+        return image
+
+    def paint( self    ,
+               painter ,
+               option  ,
+               widget  ):
+        '''
+        Reimplementation of the paint method, draw the cells inside
+        the exposed rectangle depending of their value, their state
+        unless getCellValues is reimplemented.
+
+        Returns:
+            None: No return value.
+        '''
+        firstColumn , firstRow , lastColumn , lastRow = self.getCellsRange( option.exposedRect )
+
+        if firstColumn >= lastColumn or firstRow >= lastRow:
+            return
+
+        image = self.createImage( firstColumn ,
+                                  firstRow    ,
+                                  lastColumn  ,
+                                  lastRow     )
+
+        nodeSize = self.grid.NODE_SIZE_INT
+
+        # Cells are scaled up from single pixels, keep their edges sharp.
+        painter.setRenderHint( QtGui.QPainter.SmoothPixmapTransform , False )
+        painter.setRenderHint( QtGui.QPainter.Antialiasing , False )
+
+        targetRect = QtCore.QRectF( firstColumn * nodeSize                   ,
+                                    firstRow * nodeSize                      ,
+                                    ( lastColumn - firstColumn ) * nodeSize  ,
+                                    ( lastRow - firstRow ) * nodeSize        )
+
+        painter.drawImage( targetRect ,
+                           image      )
+
+        if not self.DRAW_BORDERS_BOOL:
+            return
+
+        painter.setPen( self.pen )
+
+        painter.drawLines( [ QtCore.QLineF( column * nodeSize    ,
+                                            targetRect.top()     ,
+                                            column * nodeSize    ,
+                                            targetRect.bottom()  )
+                             for column in range( firstColumn , lastColumn + 1 ) ] +
+                           [ QtCore.QLineF( targetRect.left()    ,
+                                            row * nodeSize       ,
+                                            targetRect.right()   ,
+                                            row * nodeSize       )
+                             for row in range( firstRow , lastRow + 1 ) ] )
+
+class AACostItem(AAGridItem):
+    """
+    A single graphic item drawing the terrain cost of every cell of a grid.
+    """
+
+    # Draw the borders of the cells over them.
+    # type: bool
+    DRAW_BORDERS_BOOL = False
+
+    # Color of the highest cost, lower costs are more transparent.
+    # type: QtGui.QColor
+    COST_COLOR = QtGui.QColor( 150 , 100 , 40 , 200 )
+
+    def __init__( self   ,
+                  inGrid ):
+        '''
+        Graphic item drawing over the cells of a grid their terrain cost,
+        cells at model.DEFAULT_COST are left transparent.
+
+        Args:
+            inGrid (grid.AAGrid): Grid to draw the costs of.
+        '''
+        super( AACostItem , self ).__init__( inGrid )
+
+    def getColorTable( self ):
+        '''
+        Reimplementation of getColorTable, the color of each cost.
+
+        Returns:
+            list[int]: rgba color of each cost.
+        '''
+        colorTable = []
+
+        for cost in range( model.MAX_COST + 1 ):
+
+            costColor = QtGui.QColor( self.COST_COLOR )
+            costColor.setAlpha( max( 0 , cost - model.DEFAULT_COST ) * self.COST_COLOR.alpha() //
+                                ( model.MAX_COST - model.DEFAULT_COST ) )
+
+            colorTable.append( costColor.rgba() )
+
+        return colorTable
+
+    def getCellValues( self ):
+        '''
+        Reimplementation of getCellValues, the cost of each cell.
+
+        Returns:
+            array.array: cost of each cell, by cell index.
+        '''
+        return self.grid.model.costs
+
+class AAFlowFieldItem(QtWidgets.QGraphicsItem):
+    """
+    A single graphic item drawing the flow field of a grid as a heatmap.
+    """
+
+    # Amount of colors of the heatmap, from the goal to the farthest cell.
+    # type: int
+    LEVELS_INT = 255
+
+    # Color of the cells next to the goal and of the farthest cells.
+    # type: QtGui.QColor
+    NEAR_COLOR = QtGui.QColor( 250 , 220 , 70 , 170 )
+    FAR_COLOR  = QtGui.QColor( 70 , 70 , 200 , 170 )
+
+    def __init__( self   ,
+                  inGrid ):
+        '''
+        Graphic item drawing over the cells of a grid the cost to reach
+        the goal of its flow field, through an image with one pixel per
+        cell. Cells that cannot reach the goal are left transparent.
+
+        Note:
+            Call updateImage after building the flow field again.
+
+        Args:
+            inGrid (grid.AAGrid): Grid to draw the flow field of,
+                                  see grid.AAGrid.flowField.
+        '''
+        super( AAFlowFieldItem , self ).__init__()
+
+        self.grid = inGrid
+
+        self.setFlag( QtWidgets.QGraphicsItem.ItemUsesExtendedStyleOption ,
+                      True                                                )
+
+        # Color of each level followed by the transparent unreached color.
+        # type: list[int]
+        self.colorTable = [ self.getLevelColor( level ).rgba() for level in range( self.LEVELS_INT ) ]
+        self.colorTable.append( QtGui.QColor( 0 , 0 , 0 , 0 ).rgba() )
+
+        # Image with the heat level of each cell as color index.
+        # type: QtGui.QImage|None
+        self.image = None
+
+        self.updateImage()
+
+    def getLevelColor( self    ,
+                       inLevel ):
+        '''
+        Blend between NEAR_COLOR and FAR_COLOR for a heat level.
+
+        Args:
+            inLevel (int): Level, from 0 to LEVELS_INT - 1.
+
+        Returns:
+            QtGui.QColor: color of the level.
+        '''
+        ratio = float( inLevel ) / ( self.LEVELS_INT - 1 )
+
+        return QtGui.QColor( *[ int( nearValue + ( farValue - nearValue ) * ratio )
+                                for nearValue , farValue in zip( self.NEAR_COLOR.getRgb() ,
+                                                                 self.FAR_COLOR.getRgb()  ) ] )
+
+    def updateImage( self ):
+        '''
+        Copy the heat levels of the flow field into the image and repaint.
+
+        Returns:
+            None: No return value.
+        '''
+        aaModel = self.grid.model
+
+        levels = bytes( self.grid.flowField.getHeatLevels( self.LEVELS_INT ) )
+
+        if len( levels ) != aaModel.cellCountInt:
+            levels = bytes( bytearray( [ self.LEVELS_INT ] ) * aaModel.cellCountInt )
+
+        # The image does not own the data, copy it to keep it valid.
+        self.image = QtGui.QImage( levels                       ,
+                                   aaModel.columnsInt           ,
+                                   aaModel.rowsInt              ,
+                                   aaModel.columnsInt           ,
+                                   QtGui.QImage.Format_Indexed8 ).copy()
+
+        self.image.setColorTable( self.colorTable )
+
+        self.update()
+
+    def boundingRect( self ):
+        '''
+        Reimplementation of boundingRect
+        '''
+        return QtCore.QRectF( 0                                                    ,
+                              0                                                    ,
+                              self.grid.model.columnsInt * self.grid.NODE_SIZE_INT ,
+                              self.grid.model.rowsInt * self.grid.NODE_SIZE_INT    )
+
+    def paint( self    ,
+               painter ,
+               option  ,
+               widget  ):
+        '''
+        Reimplementation of the paint method, draw the heat level of the
+        cells inside the exposed rectangle.
+
+        Returns:
+            None: No return value.
+        '''
+        nodeSize = self.grid.NODE_SIZE_INT
+
+        exposedRect = option.exposedRect.intersected( self.boundingRect() )
+
+        if exposedRect.isEmpty():
+            return
+
+        painter.setRenderHint( QtGui.QPainter.SmoothPixmapTransform , False )
+
+        painter.drawImage( exposedRect                                          ,
+                           self.image                                           ,
+                           QtCore.QRectF( exposedRect.left() / nodeSize   ,
+                                          exposedRect.top() / nodeSize    ,
+                                          exposedRect.width() / nodeSize  ,
+                                          exposedRect.height() / nodeSize ) )
+
+class AAPathLineItem(QtWidgets.QGraphicsPathItem):
+    """
+    A single graphic item drawing a path as straight segments.
+    """
+
+    # Color of the segments.
+    # type: QtGui.QColor
+    LINE_COLOR = QtGui.QColor( 250 , 220 , 70 , 255 )
+
+    # Width of the segments in pixels, whatever the zoom.
+    # type: int
+    LINE_WIDTH_INT = 3
+
+    def __init__( self              ,
+                  inGrid            ,
+                  inWaypointIndices ):
+        '''
+        Graphic item drawing over the cells of a grid the segments
+        between the centers of the waypoints of a path,
+        see search.AASearchResult.waypointIndices.
+
+        Args:
+            inGrid (grid.AAGrid): Grid the path was found on.
+
+            inWaypointIndices (list[int]): Indices of the corners of the
+                                           path from start to end.
+        '''
+        super( AAPathLineItem , self ).__init__()
+
+        nodeSize = inGrid.NODE_SIZE_INT
+
+        points = [ QtCore.QPointF( ( column + 0.5 ) * nodeSize ,
+                                   ( row + 0.5 ) * nodeSize    )
+                   for column , row in ( inGrid.model.coordinatesOf( waypointIndex )
+                                         for waypointIndex in inWaypointIndices      ) ]
+
+        linePath = QtGui.QPainterPath()
+        linePath.addPolygon( QtGui.QPolygonF( points ) )
+
+        self.setPath( linePath )
+
+        pen = QtGui.QPen( self.LINE_COLOR )
+        pen.setWidth( self.LINE_WIDTH_INT )
+        pen.setCosmetic( True )
+        pen.setCapStyle( QtCore.Qt.RoundCap )
+        pen.setJoinStyle( QtCore.Qt.RoundJoin )
+
+        self.setPen( pen )
@@ -0,0 +1,281 @@
+import heapq
+import itertools
+import time
+
+import instrumentation
+import model
+
+class AASearchResult(object):
+
+    def __init__( self ):
+        '''
+        Outcome of a search on a model.AAGridModel.
+        '''
+        # Indices of the cells of the path from start to end,
+        # empty if there is no path.
+        # type: list[int]
+        self.pathIndices = []
+
+        # Indices of the cells where the path turns, start and end
+        # included, for searches moving in straight segments at any
+        # angle, empty otherwise.
+        # type: list[int]
+        self.waypointIndices = []
+
+        # Indices of the cells explored by each expansion, in search order.
+        # type: list[list[int]]
+        self.exploredIndices = []
+
+        # Amount of cells taken out of the open set during the search.
+        # type: int
+        self.expandedNodesInt = 0
+
+        # True if the search was cancelled before finishing.
+        # type: bool
+        self.cancelledBool = False
+
+    @property
+    def foundBool( self ):
+        '''
+        Check if a path was found.
+
+        Returns:
+            bool: True if a path was found, False otherwise.
+        '''
+        return bool( self.pathIndices )
+
+class AAAStarSearch(object):
+
+    # Name displayed when choosing the search algorithm.
+    # type: str
+    NAME = 'A*'
+
+    # Searches from the first goal to every other goal instead of
+    # from a start to an end goal.
+    # type: bool
+    MULTI_TARGET_BOOL = False
+
+    # Only reads the cells it explores and their neighbours, so its
+    # result stays the same while no other cell changes,
+    # see pathcache.AAPathCache.
+    # type: bool
+    LOCAL_READS_BOOL = True
+
+    def __init__( self    ,
+                  inModel ):
+        '''
+        A* search algorithm running on the cells of a grid model,
+        does not need any Qt object.
+
+        Args:
+            inModel (model.AAGridModel): Grid model to find paths on.
+        '''
+        self.model = inModel
+
+        # Set from another thread to stop a running search.
+        # type: bool
+        self.cancelledBool = False
+
+        # Counters, timings and hooks of the searches, None to run
+        # without them, see pathfinding.AAPathFinder.
+        # type: instrumentation.AASearchInstrumentation|None
+        self.instrumentation = None
+
+    def cancel( self ):
+        '''
+        Stop the running search, it will return its partial result.
+
+        Returns:
+            None: No return value.
+        '''
+        self.cancelledBool = True
+
+    def notifyCellChanged( self    ,
+                           inIndex ):
+        '''
+        Called after a cell switched between wall and not wall or
+        changed terrain cost, searches keeping state between runs
+        update it.
+
+        Args:
+            inIndex (int): Index of the changed cell.
+
+        Returns:
+            None: No return value.
+        '''
+        pass
+
+    def findPath( self                      ,
+                  inStartIndex              ,
+                  inEndIndex                ,
+                  inExploredCallback = None ):
+        '''
+        Find a path between the start and end cell.
+
+        Note:
+            The open set is a binary heap keyed on ( fCost , hCost ) so ties
+            on fCost are broken on the lowest hCost. Improved costs push
+            a new entry and the outdated one is skipped when popped.
+            Costs and parents are kept in the search arrays of the model,
+            see model.AAGridModel.beginSearch.
+
+        Args:
+            inStartIndex (int): Index of the cell to start from.
+
+            inEndIndex (int): Index of the cell to reach.
+
+            inExploredCallback (callable|None): Called with the indices
+                                                explored by each expansion
+                                                as soon as they are known.
+
+        Returns:
+            search.AASearchResult: Found path and explored cells.
+        '''
+        result = AASearchResult()
+
+        aaModel = self.model
+
+        states = aaModel.states
+
+        # Cells reached by this search are stamped with openStamp, the
+        # closed ones with closedStamp, other stamps are from old searches.
+        openStamp   = aaModel.beginSearch()
+        closedStamp = openStamp + 1
+
+        searchStamps = aaModel.searchStamps
+
+        # Cost from the start to each reached cell.
+        # type: array.array
+        gCosts = aaModel.searchCosts
+
+        # Cell each reached cell was reached from.
+        # type: array.array
+        parentIndices = aaModel.searchParents
+
+        # Heuristic cost from every cell to the end.
+        # type: array.array
+        hCosts = aaModel.getHeuristic( inEndIndex )
+
+        searchInstrumentation = self.instrumentation
+
+        if searchInstrumentation:
+            searchInstrumentation.countHeuristic()
+
+        searchStamps[ inStartIndex ]  = openStamp
+        gCosts[ inStartIndex ]        = 0
+        parentIndices[ inStartIndex ] = model.NO_PARENT
+
+        insertionCount = itertools.count()
+
+        openHeap = [ ( hCosts[ inStartIndex ]  ,
+                       hCosts[ inStartIndex ]  ,
+                       next( insertionCount )  ,
+                       inStartIndex            ) ]
+
+        while openHeap:
+
+            if self.cancelledBool:
+                result.cancelledBool = True
+                return result
+
+            fCost , hCost , _ , currentIndex = heapq.heappop( openHeap )
+
+            if searchStamps[ currentIndex ] != openStamp:
+                continue
+
+            # Outdated entry, the cell was pushed again with a lower cost.
+            if fCost != gCosts[ currentIndex ] + hCost:
+                continue
+
+            searchStamps[ currentIndex ] = closedStamp
+
+            result.expandedNodesInt += 1
+
+            if searchInstrumentation:
+                searchInstrumentation.expand( currentIndex        ,
+                                              len( openHeap ) + 1 )
+
+            if currentIndex == inEndIndex:
+                result.pathIndices = self.retracePath( parentIndices ,
+                                                       inEndIndex    )
+                return result
+
+            exploredIndices = []
+
+            currentCost = gCosts[ currentIndex ]
+
+            for neighbourIndex , stepCost in aaModel.getNeighbourSteps( currentIndex ):
+
+                if states[ neighbourIndex ] == model.WALL_STATE:
+                    continue
+
+                exploredIndices.append( neighbourIndex )
+
+                neighbourStamp = searchStamps[ neighbourIndex ]
+
+                if neighbourStamp == closedStamp:
+                    continue
+
+                newCostToNeighbour = currentCost + stepCost
+
+                if neighbourStamp != openStamp or newCostToNeighbour < gCosts[ neighbourIndex ]:
+
+                    neighbourHCost = hCosts[ neighbourIndex ]
+
+                    if searchInstrumentation:
+                        searchInstrumentation.relax( currentIndex                ,
+                                                     neighbourIndex              ,
+                                                     newCostToNeighbour          ,
+                                                     neighbourStamp == openStamp )
+                        searchInstrumentation.countHeuristic()
+
+                    searchStamps[ neighbourIndex ]  = openStamp
+                    gCosts[ neighbourIndex ]        = newCostToNeighbour
+                    parentIndices[ neighbourIndex ] = currentIndex
+
+                    heapq.heappush( openHeap , ( newCostToNeighbour + neighbourHCost ,
+                                                 neighbourHCost                      ,
+                                                 next( insertionCount )              ,
+                                                 neighbourIndex                      ) )
+
+            result.exploredIndices.append( exploredIndices )
+
+            if inExploredCallback:
+                inExploredCallback( exploredIndices )
+
+        return result
+
+    def retracePath( self            ,
+                     inParentIndices ,
+                     inEndIndex      ):
+        '''
+        Follow the parents from the end cell back to the start cell.
+
+        Args:
+            inParentIndices (array.array|dict[int, int]): Parent of each
+                                                          reached cell,
+                                                          model.NO_PARENT
+                                                          for the start.
+
+            inEndIndex (int): Index of the cell the path ends at.
+
+        Returns:
+            list[int]: Indices of the cells from start to end.
+        '''
+        startTime = time.time()
+
+        pathIndices = []
+
+        currentIndex = inEndIndex
+
+        while currentIndex != model.NO_PARENT:
+            pathIndices.append( currentIndex )
+            currentIndex = inParentIndices[ currentIndex ]
+
+        pathIndices.reverse()
+
+        if self.instrumentation:
+            self.instrumentation.addPhaseSeconds( instrumentation.RETRACE_PHASE ,
+                                                  time.time() - startTime       )
+
+        return pathIndices
@@ -0,0 +1,105 @@
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert( 0 , os.path.dirname( os.path.dirname( os.path.abspath( __file__ ) ) ) )
+
+import chunks
+import grid
+import model
+
+def isReachable( inModel     ,
+                 inFromIndex ,
+                 inToIndex   ):
+    '''
+    Check if a cell can reach another one with a flood fill.
+
+    Args:
+        inModel (model.AAGridModel): Grid model of the cells.
+
+        inFromIndex (int): Index of a cell.
+
+        inToIndex (int): Index of the other cell.
+
+    Returns:
+        bool: True if a path exists, False otherwise.
+    '''
+    if inModel.isWall( inFromIndex ) or inModel.isWall( inToIndex ):
+        return False
+
+    reachedIndices = set( [ inFromIndex ] )
+    pendingIndices = [ inFromIndex ]
+
+    while pendingIndices:
+
+        for neighbourIndex in inModel.getNeighbours( pendingIndices.pop() ):
+
+            if neighbourIndex in reachedIndices or inModel.isWall( neighbourIndex ):
+                continue
+
+            reachedIndices.add( neighbourIndex )
+            pendingIndices.append( neighbourIndex )
+
+    return inToIndex in reachedIndices
+
+class AAComponentLabelsTest(unittest.TestCase):
+
+    # Random grids edited and checked for each model class.
+    # type: int
+    GRIDS_INT = 300
+
+    def checkBulkEdits( self         ,
+                        inModelClass ):
+        '''
+        Paint random lines and rectangles of walls and blank cells
+        through grid.AAGrid.setWallStates and compare the component
+        labels with a flood fill after each edit.
+
+        Args:
+            inModelClass (type): Grid model class to check.
+
+        Returns:
+            None: No return value.
+        '''
+        randomGenerator = random.Random( 7 )
+
+        for _ in range( self.GRIDS_INT ):
+
+            aaModel = inModelClass( randomGenerator.randint( 3 , 30 ) ,
+                                    randomGenerator.randint( 3 , 30 ) )
+
+            aaGrid = grid.AAGrid( inModel = aaModel )
+
+            # Label the grid so the edits update the labels.
+            aaGrid.components.isConnected( 0 , 0 )
+
+            for _ in range( 4 ):
+
+                cornerIndex   = randomGenerator.randrange( aaModel.cellCountInt )
+                oppositeIndex = randomGenerator.randrange( aaModel.cellCountInt )
+
+                if randomGenerator.random() < 0.5:
+                    editIndices = aaModel.getRectIndices( cornerIndex , oppositeIndex )
+                else:
+                    editIndices = aaModel.getLineIndices( cornerIndex , oppositeIndex )
+
+                aaGrid.setWallStates( editIndices[ : grid.AAGrid.MAX_RELABEL_CELLS_INT ] ,
+                                      randomGenerator.random() < 0.7                    )
+
+                for _ in range( 5 ):
+
+                    fromIndex = randomGenerator.randrange( aaModel.cellCountInt )
+                    toIndex   = randomGenerator.randrange( aaModel.cellCountInt )
+
+                    self.assertEqual( aaGrid.components.isConnected( fromIndex , toIndex ) ,
+                                      isReachable( aaModel , fromIndex , toIndex )         )
+
+    def test_bulkEdits( self ):
+        self.checkBulkEdits( model.AAGridModel )
+
+    def test_chunkedBulkEdits( self ):
+        self.checkBulkEdits( chunks.AAChunkedGridModel )
+
+if __name__ == '__main__':
+    unittest.main()
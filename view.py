@@ -1,17 +1,88 @@
 from PyQt5 import QtCore, QtWidgets, QtGui
 
+import animation
+import generators
+import instrumentation
+import lpastar
+import mapio
+import model
 import node
+import pathcache
 import pathfinding
 import grid
+import renderer
+import search
 
 class View(QtWidgets.QGraphicsView):
 
     MOUSE_DRAG_STATE = 0
 
-    def __init__( self          ,
-                  parent = None ):
+    MOUSE_PAN_STATE  = 1
+
+    MOUSE_COST_STATE = 2
+
+    MOUSE_RECT_STATE = 3
+
+    # Largest brush, in cells per side.
+    # type: int
+    MAX_BRUSH_SIZE_INT = 9
+
+    # Pixels the view moves by with each arrow key press.
+    # type: int
+    PAN_STEP_INT = 200
+
+    # Direction the view moves to with each arrow key.
+    # type: dict[int, tuple(int, int)]
+    PAN_KEYS_MAPPING = { QtCore.Qt.Key_Left  : ( -1 ,  0 ) ,
+                         QtCore.Qt.Key_Right : (  1 ,  0 ) ,
+                         QtCore.Qt.Key_Up    : (  0 , -1 ) ,
+                         QtCore.Qt.Key_Down  : (  0 ,  1 ) }
+
+    # Draw each cell with its own node.AANode item.
+    NODE_RENDER_MODE  = 0
+
+    # Draw every cell with a single renderer.AAGridItem,
+    # for grids too large for an item per cell.
+    TILED_RENDER_MODE = 1
+
+    # Most cells to draw with NODE_RENDER_MODE, larger grids are
+    # always drawn with TILED_RENDER_MODE.
+    # type: int
+    MAX_NODE_CELLS_INT = 100000
+
+    # Filter of the file dialogs to save and open grids.
+    # type: str
+    GRID_FILE_FILTER = 'Grid files (*{0})'.format( mapio.GRID_EXTENSION )
+
+    # Filter of the file dialog to open grids, also taking MovingAI maps.
+    # type: str
+    MAP_FILE_FILTER = 'Maps (*{0} *{1})'.format( mapio.GRID_EXTENSION      ,
+                                                 mapio.MOVING_AI_EXTENSION )
+
+    def __init__( self                                ,
+                  parent          = None              ,
+                  inColumnsInt    = None              ,
+                  inRowsInt       = None              ,
+                  inRenderModeInt = NODE_RENDER_MODE  ,
+                  inModel         = None              ):
         '''
         View Widget to display the nodes and handle all mouse and key events.
+
+        Args:
+            parent (QtWidgets.QWidget|None): Parent widget.
+
+            inColumnsInt (int|None): Amount of nodes in X axis,
+                                     None for the default grid width.
+
+            inRowsInt (int|None): Amount of nodes in Y axis,
+                                  None for the default grid height.
+
+            inRenderModeInt (int): How to draw the nodes, one of the
+                                   *_RENDER_MODE values.
+
+            inModel (model.AAGridModel|None): Model of the grid to display,
+                                              as read by mapio.loadMap,
+                                              None for a blank grid.
         '''
 
         super( View , self ).__init__( parent )
@@ -25,18 +96,80 @@ class View(QtWidgets.QGraphicsView):
         # type: bool
         self.dragPaintWallsBool = False
 
-        # Set to store nodes to avoid multiple switching in
-        # same mouseDrag event.
-        # type: set(node.AANode)
-        self.nodeHashesToSwitch = set()
+        # Node under the mouse at the last mouse event of a stroke,
+        # the next event paints the line from it.
+        # type: int|None
+        self.lastDragIndex = None
+
+        # Width and height in nodes of the brush painting walls and
+        # terrain costs, chosen with the bracket keys.
+        # type: int
+        self.brushSizeInt = 1
+
+        # Node the right button was pressed on, corner of the
+        # rectangle to fill.
+        # type: int|None
+        self.rectStartIndex = None
+
+        # Outline of the rectangle dragged with the right button.
+        # type: QtWidgets.QGraphicsRectItem|None
+        self.rectItem = None
+
+        # Last mouse position while panning the view.
+        # type: QtCore.QPoint|None
+        self.lastPanPos = None
+
+        # Path finder of the last search, to cancel it if still running.
+        # type: pathfinding.AAPathFinder|None
+        self.pathFinder = None
+
+        # Message displayed over the grid, hidden while empty.
+        # type: QtWidgets.QLabel
+        self.statusLabel = QtWidgets.QLabel( self )
+        self.statusLabel.setStyleSheet( 'QLabel { color : rgb( 0 , 200 , 200 ) ;'
+                                        ' background-color : rgba( 0 , 0 , 0 , 150 ) ;'
+                                        ' padding : 4px ; }' )
+        self.statusLabel.move( 10 , 10 )
+        self.statusLabel.hide()
+
+        # Index in pathfinding.SEARCH_CLASSES of the search algorithm to run.
+        # type: int
+        self.searchClassIndex = 0
+
+        # Replan the path with each wall or goal change while True.
+        # type: bool
+        self.liveReplanBool = False
+
+        # Index in generators.GENERATORS of the last generated map and
+        # seed it was generated from, the next one uses the following.
+        # type: int
+        self.generatorIndex   = -1
+        self.generatorSeedInt = 0
 
-        # Functions to execute with a delay using QTimer.
-        # type: list(function)
-        self.functionsToExecute = []
+        # Terrain cost painted by dragging with Shift pressed,
+        # chosen with the number keys.
+        # type: int
+        self.paintCostInt = model.MAX_COST
 
-        self.timer = QtCore.QTimer()
+        # Display of the terrain costs, created once a cost is painted.
+        # type: renderer.AACostItem|None
+        self.costItem = None
 
-        self.timer.timeout.connect( self.doWithDelay )
+        # Heatmap of the flow field of the last goal, None while hidden.
+        # type: renderer.AAFlowFieldItem|None
+        self.flowFieldItem = None
+
+        # Segments of the last path found by an any angle search,
+        # None while there is none.
+        # type: renderer.AAPathLineItem|None
+        self.pathLineItem = None
+
+        # Counters and timings of the searches displayed once they
+        # finish, None while hidden.
+        # type: instrumentation.AASearchInstrumentation|None
+        self.instrumentation = None
+
+        self.updateWindowTitle()
 
         self.setRenderHint( QtGui.QPainter.Antialiasing  ,
                             True                         )
@@ -48,57 +181,391 @@ class View(QtWidgets.QGraphicsView):
         self.setHorizontalScrollBarPolicy( QtCore.Qt.ScrollBarAlwaysOff )
         self.setVerticalScrollBarPolicy( QtCore.Qt.ScrollBarAlwaysOff )
 
-        self.grid = grid.AAGrid()
+        # How to draw the nodes, one of the *_RENDER_MODE values.
+        # type: int
+        self.renderModeInt = inRenderModeInt
+
+        aaGrid = grid.AAGrid( inColumnsInt ,
+                              inRowsInt    ,
+                              inModel      )
+
+        # Displays the progress of the searches frame by frame.
+        # type: animation.AAAnimationScheduler
+        self.scheduler = animation.AAAnimationScheduler( aaGrid ,
+                                                         self   )
+        self.scheduler.frameApplied.connect( self.updateNodes )
+
+        self.setGrid( aaGrid )
+
+    def setGrid( self      ,
+                 inAAGrid  ):
+        '''
+        Display a grid, replacing the current one with its searches
+        and scene.
+
+        Note:
+            Grids over MAX_NODE_CELLS_INT cells are drawn with
+            TILED_RENDER_MODE whatever renderModeInt is.
+
+        Args:
+            inAAGrid (grid.AAGrid): Grid to display.
+
+        Returns:
+            None: No return value.
+        '''
+        self.cancelSearch()
+
+        self.grid = inAAGrid
+
+        self.scheduler.grid = inAAGrid
+
+        self.costItem      = None
+        self.flowFieldItem = None
+
+        # One search of each of pathfinding.SEARCH_CLASSES, kept for the
+        # whole life of the grid so they can reuse state between runs.
+        # type: list[search.AAAStarSearch]
+        self.pathSearches = [ searchClass( self.grid.model ) for searchClass in pathfinding.SEARCH_CLASSES ]
+
+        for pathSearch in self.pathSearches:
+            self.grid.cellChangedCallbacks.append( pathSearch.notifyCellChanged )
+
+        # Results of the searches run with Ctrl, replayed while the
+        # cells they depend on do not change.
+        # type: pathcache.AAPathCache
+        self.pathCache = pathcache.AAPathCache( self.grid )
+        self.grid.cellChangedCallbacks.append( self.pathCache.notifyCellChanged )
+
+        # Incremental search repairing the path when live replanning.
+        # type: lpastar.AALPAStarSearch
+        self.replanSearch = self.pathSearches[ pathfinding.SEARCH_CLASSES.index( lpastar.AALPAStarSearch ) ]
+
+        self.grid.setMaxGoals( None if pathfinding.SEARCH_CLASSES[ self.searchClassIndex ].MULTI_TARGET_BOOL else 2 )
+
+        nodeSize = self.grid.NODE_SIZE_INT
 
         currentScene = QtWidgets.QGraphicsScene( self )
-        currentScene.setSceneRect( 0                    ,
-                                   0                    ,
-                                   self.grid.WIDTH_INT  ,
-                                   self.grid.HEIGHT_INT )
+        currentScene.setSceneRect( 0                                     ,
+                                   0                                     ,
+                                   self.grid.model.columnsInt * nodeSize ,
+                                   self.grid.model.rowsInt * nodeSize    )
+
+        previousScene = self.scene()
+
         self.setScene( currentScene )
 
-        for gridX in xrange( int( self.scene().sceneRect().left()  ) ,
-                             int( self.scene().sceneRect().right() ) ,
-                             self.grid.NODE_SIZE_INT                 ):
+        if previousScene:
+            previousScene.deleteLater()
+
+        if self.grid.model.weightedCellsInt:
+            self.showCosts()
+
+        if ( self.renderModeInt == self.TILED_RENDER_MODE or
+             self.grid.model.cellCountInt > self.MAX_NODE_CELLS_INT ):
+            currentScene.setItemIndexMethod( QtWidgets.QGraphicsScene.NoIndex )
+            currentScene.addItem( renderer.AAGridItem( self.grid ) )
+            return
+
+        for gridX in range( 0                                     ,
+                            self.grid.model.columnsInt * nodeSize ,
+                            nodeSize                              ):
+
+            for gridY in range( 0                                  ,
+                                self.grid.model.rowsInt * nodeSize ,
+                                nodeSize                           ):
+
+                self.createNode( gridX    ,
+                                 gridY    ,
+                                 nodeSize )
+
+    def saveGrid( self      ,
+                  inPathStr ):
+        '''
+        Save the walls, goals and terrain costs of the grid to a file.
+
+        Args:
+            inPathStr (str): Path of the grid file to write.
+
+        Returns:
+            None: No return value.
+        '''
+        try:
+            mapio.saveModel( self.grid.model ,
+                             inPathStr       )
+        except ( IOError , OSError ) as error:
+            self.setStatusMessage( 'Could not save {0}: {1}'.format( inPathStr , error ) )
+            return
+
+        self.setStatusMessage( 'Saved {0}'.format( inPathStr ) )
+
+    def loadGrid( self      ,
+                  inPathStr ):
+        '''
+        Replace the grid with the one of a grid file or MovingAI map.
+
+        Args:
+            inPathStr (str): Path of the file to read, see mapio.loadMap.
 
-            for gridY in xrange( int( self.scene().sceneRect().top()    ) ,
-                                 int( self.scene().sceneRect().bottom() ) ,
-                                 self.grid.NODE_SIZE_INT                  ):
+        Returns:
+            None: No return value.
+        '''
+        try:
+            aaModel = mapio.loadMap( inPathStr               ,
+                                     grid.AAGrid.NODE_SIZE_INT )
+        except ( IOError , OSError , ValueError ) as error:
+            self.setStatusMessage( 'Could not load {0}: {1}'.format( inPathStr , error ) )
+            return
 
-                self.createNode( gridX                   ,
-                                 gridY                   ,
-                                 self.grid.NODE_SIZE_INT )
+        self.setGrid( grid.AAGrid( inModel = aaModel ) )
 
-    def doWithDelay( self ):
+        self.setStatusMessage( 'Loaded {0}'.format( inPathStr ) )
+
+    def generateGrid( self ):
         '''
-        Execute from a list of functions with a delay.
-        It will stop after the list is empty.
+        Replace the grid with a map of the next generator of
+        generators.GENERATORS, the same size as the current grid.
+        Cycling back to the first generator moves to the next seed.
 
         Returns:
             None: No return value.
         '''
-        if self.functionsToExecute:
-            func = self.functionsToExecute[ 0 ]
-            self.functionsToExecute.remove(func)
-            func()
+        if self.grid.model.CHUNKED_BOOL:
+            self.setStatusMessage( 'Maps are only generated for grids stored in a single block.' )
             return
 
-        self.timer.stop()
+        self.generatorIndex = ( self.generatorIndex + 1 ) % len( generators.GENERATORS )
+
+        if self.generatorIndex == 0:
+            self.generatorSeedInt += 1
+
+        generatorStr = generators.GENERATORS[ self.generatorIndex ]
+
+        aaModel = generators.generateModel( generatorStr                     ,
+                                            self.grid.model.columnsInt       ,
+                                            self.grid.model.rowsInt          ,
+                                            self.generatorSeedInt            ,
+                                            generators.DEFAULT_DENSITY_FLOAT ,
+                                            grid.AAGrid.NODE_SIZE_INT        )
 
-    def startTimer( self        ,
-                    inFunctions ):
+        self.setGrid( grid.AAGrid( inModel = aaModel ) )
+
+        self.setStatusMessage( 'Generated {0} map, seed {1}.'.format( generatorStr          ,
+                                                                      self.generatorSeedInt ) )
+
+    def updateWindowTitle( self ):
+        '''
+        Display the name of the current search algorithm in the window title.
+
+        Returns:
+            None: No return value.
         '''
-        Start the timer to trigger the signal timeOut and start executing from
-        a list of functions with a delay,
+        searchClass = pathfinding.SEARCH_CLASSES[ self.searchClassIndex ]
+
+        titleStr = 'aaGridEditor - {0}'.format( searchClass.NAME )
+
+        if self.liveReplanBool:
+            titleStr += ' - Live replanning'
+
+        self.setWindowTitle( titleStr )
+
+    def setStatusMessage( self        ,
+                          inMessageStr ):
+        '''
+        Display a message over the grid.
 
         Args:
-            inFunctions (list(function)): List of functions to add to list.
+            inMessageStr (str): Message to display, empty to hide it.
+
+        Returns:
+            None: No return value.
+        '''
+        self.statusLabel.setText( inMessageStr )
+        self.statusLabel.adjustSize()
+        self.statusLabel.setVisible( bool( inMessageStr ) )
+
+    def displayStates( self      ,
+                       inIndices ,
+                       inState   ):
+        '''
+        Display a state on nodes with a delay, frame by frame.
+
+        Args:
+            inIndices (list[int]): Indices of the nodes.
+
+            inState (int): State to display, one of the node.AANode *_STATE values.
 
         Returns:
              None: No return value.
         '''
-        self.functionsToExecute.extend( inFunctions )
-        self.timer.start( 1 )
+        self.scheduler.schedule( inIndices ,
+                                 inState   )
+
+    def updateNodes( self      ,
+                     inIndices ):
+        '''
+        Repaint the nodes whose state changed in a frame of the
+        scheduler with a single update of the scene.
+
+        Args:
+            inIndices (list[int]): Indices of the changed nodes.
+
+        Returns:
+            None: No return value.
+        '''
+        if not inIndices:
+            return
+
+        self.scene().update( QtCore.QRectF( *self.grid.getCellsRect( inIndices ) ) )
+
+    def cancelSearch( self ):
+        '''
+        Stop the running search and the display of its progress.
+
+        Returns:
+            None: No return value.
+        '''
+        if self.pathFinder:
+            self.pathFinder.cancel()
+            self.pathFinder = None
+
+        self.scheduler.clear()
+
+        self.displayWaypoints( [] )
+
+    def displayWaypoints( self              ,
+                          inWaypointIndices ):
+        '''
+        Draw the segments of a path over the nodes, replacing the
+        segments drawn before.
+
+        Args:
+            inWaypointIndices (list[int]): Indices of the corners of the
+                                           path, see
+                                           search.AASearchResult.waypointIndices,
+                                           empty to only remove the segments.
+
+        Returns:
+            None: No return value.
+        '''
+        if self.pathLineItem:
+            self.pathLineItem.scene().removeItem( self.pathLineItem )
+            self.pathLineItem = None
+
+        if not inWaypointIndices:
+            return
+
+        self.pathLineItem = renderer.AAPathLineItem( self.grid         ,
+                                                     inWaypointIndices )
+        self.pathLineItem.setZValue( 2 )
+
+        self.scene().addItem( self.pathLineItem )
+
+    def cancelRunningSearch( self ):
+        '''
+        Stop the search if it is still running or its progress is still
+        being played back, walls are about to change so its result
+        would be outdated.
+
+        Returns:
+            None: No return value.
+        '''
+        if self.pathFinder and ( self.pathFinder.isRunning() or self.scheduler.isPlaying() ):
+            self.cancelSearch()
+
+    def updateAfterEdit( self ):
+        '''
+        Update the live path and the flow field heatmap after walls
+        or goals changed.
+
+        Returns:
+            None: No return value.
+        '''
+        self.replanPath()
+        self.updateFlowField()
+
+    def updateFlowField( self ):
+        '''
+        Build the flow field of the last goal again and repaint its
+        heatmap, while the heatmap is displayed.
+
+        Returns:
+            None: No return value.
+        '''
+        if not self.flowFieldItem:
+            return
+
+        goalIndices = self.grid.model.goalIndices
+
+        if not goalIndices:
+            self.setStatusMessage( 'Need a goal point for the flow field.' )
+            return
+
+        flowField = self.grid.flowField
+
+        if not flowField.validBool or flowField.goalIndex != goalIndices[ -1 ]:
+            flowField.build( goalIndices[ -1 ] )
+            self.flowFieldItem.updateImage()
+
+    def toggleFlowField( self ):
+        '''
+        Show or hide the heatmap of the flow field of the last goal.
+
+        Returns:
+            None: No return value.
+        '''
+        if self.flowFieldItem:
+            self.scene().removeItem( self.flowFieldItem )
+            self.flowFieldItem = None
+            return
+
+        # The flow field and its heatmap have a value per cell.
+        if self.grid.model.CHUNKED_BOOL:
+            self.setStatusMessage( 'The flow field is only built for grids stored in a single block.' )
+            return
+
+        self.flowFieldItem = renderer.AAFlowFieldItem( self.grid )
+        self.flowFieldItem.setZValue( 1 )
+
+        self.scene().addItem( self.flowFieldItem )
+
+        self.updateFlowField()
+
+    def replanPath( self ):
+        '''
+        Repair the path between the goal nodes after walls or goals
+        changed and display it at once, when live replanning is on.
+
+        Note:
+            Only the reset cells and the new path are repainted.
+
+        Returns:
+            None: No return value.
+        '''
+        if not self.liveReplanBool:
+            return
+
+        self.cancelSearch()
+
+        changedIndices = self.grid.reset()
+
+        if len( self.grid.model.goalIndices ) == 2:
+
+            startIndex , endIndex = self.grid.model.goalIndices
+
+            result = search.AASearchResult()
+
+            if self.grid.components.isConnected( startIndex ,
+                                                 endIndex   ):
+                self.replanSearch.cancelledBool = False
+                result = self.replanSearch.findPath( startIndex ,
+                                                     endIndex   )
+
+            changedIndices.extend( self.grid.applyStates( [ ( pathIndex , node.AANode.PATH_STATE )
+                                                            for pathIndex in result.pathIndices    ] ) )
+
+            self.setStatusMessage( '' if result.foundBool else 'No path between the goal nodes.' )
+
+        self.updateNodes( changedIndices )
 
     def createNode( self       ,
                     posX       ,
@@ -123,11 +590,185 @@ class View(QtWidgets.QGraphicsView):
 
         self.scene().addItem( aaNode )
 
+    def showCosts( self ):
+        '''
+        Display the terrain costs over the nodes, if not displayed yet.
+
+        Returns:
+            None: No return value.
+        '''
+        if self.costItem:
+            return
+
+        self.costItem = renderer.AACostItem( self.grid )
+        self.costItem.setZValue( 0.5 )
+        self.scene().addItem( self.costItem )
+
+    def paintWalls( self       ,
+                    inIndices  ,
+                    inWallBool ):
+        '''
+        Set many nodes as walls or blank with a single repaint.
+
+        Args:
+            inIndices (list[int]): Indices of the nodes.
+
+            inWallBool (bool): True to set as walls, False to set as blank.
+
+        Returns:
+            None: No return value.
+        '''
+        self.cancelRunningSearch()
+
+        changedIndices = self.grid.setWallStates( inIndices  ,
+                                                  inWallBool )
+
+        if changedIndices:
+            self.updateNodes( changedIndices )
+            self.updateAfterEdit()
+
+    def paintCosts( self      ,
+                    inIndices ):
+        '''
+        Set paintCostInt as terrain cost of many nodes with a single repaint.
+
+        Args:
+            inIndices (list[int]): Indices of the nodes.
+
+        Returns:
+            None: No return value.
+        '''
+        costs = self.grid.model.costs
+
+        if all( costs[ nodeIndex ] == self.paintCostInt for nodeIndex in inIndices ):
+            return
+
+        self.cancelRunningSearch()
+
+        self.showCosts()
+
+        self.updateNodes( self.grid.setCellCosts( inIndices         ,
+                                                  self.paintCostInt ) )
+        self.updateAfterEdit()
+
+    def getStrokeIndices( self      ,
+                          inIndex   ):
+        '''
+        Get the nodes covered by the brush moving in a straight line from
+        the node of the last mouse event of the stroke to a node, so fast
+        drags leave no gaps.
+
+        Args:
+            inIndex (int): Index of the node under the mouse.
+
+        Returns:
+            list[int]: indices of the covered nodes.
+        '''
+        aaModel = self.grid.model
+
+        lineIndices = [ inIndex ]
+
+        if self.lastDragIndex is not None:
+            lineIndices = aaModel.getLineIndices( self.lastDragIndex ,
+                                                  inIndex            )
+
+        self.lastDragIndex = inIndex
+
+        if self.brushSizeInt == 1:
+            return lineIndices
+
+        strokeIndices = set()
+
+        for lineIndex in lineIndices:
+            strokeIndices.update( aaModel.getBrushIndices( lineIndex         ,
+                                                           self.brushSizeInt ) )
+
+        return list( strokeIndices )
+
+    def fillRegion( self ):
+        '''
+        Flood fill the region of the node under the mouse, blank nodes
+        become walls and walls become blank.
+
+        Returns:
+            None: No return value.
+        '''
+        scenePos = self.mapToScene( self.mapFromGlobal( QtGui.QCursor.pos() ) )
+
+        nodeIndex = self.grid.getIndexAt( scenePos.x() ,
+                                          scenePos.y() )
+
+        if nodeIndex is None:
+            return
+
+        self.paintWalls( self.grid.model.getRegionIndices( nodeIndex ) ,
+                         not self.grid.model.isWall( nodeIndex )       )
+
+    def updateRectItem( self    ,
+                        inIndex ):
+        '''
+        Draw the outline of the rectangle from the node the right
+        button was pressed on to a node.
+
+        Args:
+            inIndex (int): Index of the node under the mouse.
+
+        Returns:
+            None: No return value.
+        '''
+        if not self.rectItem:
+            pen = QtGui.QPen( node.AANode.TEXT_COLOR )
+            pen.setStyle( QtCore.Qt.DashLine )
+            pen.setCosmetic( True )
+
+            self.rectItem = self.scene().addRect( QtCore.QRectF() ,
+                                                  pen             )
+            self.rectItem.setZValue( 3 )
+
+        self.rectItem.setRect( QtCore.QRectF( *self.grid.getCellsRect( [ self.rectStartIndex ,
+                                                                          inIndex             ] ) ) )
+
+    def panView( self      ,
+                 inOffsetX ,
+                 inOffsetY ):
+        '''
+        Move the visible part of the scene.
+
+        Args:
+            inOffsetX (int): Pixels to move to the right, negative to the left.
+
+            inOffsetY (int): Pixels to move down, negative to move up.
+
+        Returns:
+            None: No return value.
+        '''
+        self.horizontalScrollBar().setValue( self.horizontalScrollBar().value() + inOffsetX )
+        self.verticalScrollBar().setValue( self.verticalScrollBar().value() + inOffsetY )
+
+    def getNodeIndex( self  ,
+                      event ):
+        '''
+        Get the node under the mouse.
+
+        Args:
+            event (QTCore.QEvent).
+
+        Returns:
+            int|None: index of the node, None if outside the grid.
+        '''
+        scenePos = self.mapToScene( event.pos() )
+
+        return self.grid.getIndexAt( scenePos.x() ,
+                                     scenePos.y() )
+
     def mousePressEvent( self  ,
                          event ):
         '''
         Event to execute when any mouse button is pressed.
-        Will handle the setting of walls, removal and goal Nodes.
+        Will handle the setting of walls, removal and goal Nodes,
+        terrain costs by dragging with Shift pressed, rectangles of
+        walls with the right button, the middle button pans the view.
+        Shift has no key handler so pressing it keeps the current path.
 
         Args:
             event (QTCore.QEvent).
@@ -135,10 +776,14 @@ class View(QtWidgets.QGraphicsView):
         Returns:
             None: No return value.
         '''
-        selectedNode  = self.scene().itemAt( self.mapToScene( event.pos() )      ,
-                                                              QtGui.QTransform() )
+        if event.button() == QtCore.Qt.MiddleButton:
+            self.currentMouseState = self.MOUSE_PAN_STATE
+            self.lastPanPos = event.pos()
+            return
+
+        nodeIndex = self.getNodeIndex( event )
 
-        if not isinstance( selectedNode , node.AANode ):
+        if nodeIndex is None:
             return
 
         if ( event.button()    == QtCore.Qt.LeftButton and
@@ -146,14 +791,35 @@ class View(QtWidgets.QGraphicsView):
 
             self.currentMouseState = self.MOUSE_DRAG_STATE
 
-            selectedNode.switchWallState()
+            # Pressing on a wall erases walls, anywhere else paints them.
+            self.dragPaintWallsBool = not self.grid.model.isWall( nodeIndex )
 
-            self.dragPaintWallsBool = bool( selectedNode.currentState )
+            self.paintWalls( self.getStrokeIndices( nodeIndex ) ,
+                             self.dragPaintWallsBool            )
 
         elif ( event.button() == QtCore.Qt.LeftButton  and
                event.modifiers() == QtCore.Qt.AltModifier ):
 
-            self.grid.setGoalNode( selectedNode )
+            self.cancelRunningSearch()
+            self.updateNodes( self.grid.setGoalNode( nodeIndex ) )
+            self.updateAfterEdit()
+
+        elif ( event.button() == QtCore.Qt.LeftButton    and
+               event.modifiers() == QtCore.Qt.ShiftModifier ):
+
+            self.currentMouseState = self.MOUSE_COST_STATE
+
+            self.paintCosts( self.getStrokeIndices( nodeIndex ) )
+
+        elif event.button() == QtCore.Qt.RightButton:
+
+            self.currentMouseState = self.MOUSE_RECT_STATE
+
+            self.dragPaintWallsBool = not self.grid.model.isWall( nodeIndex )
+
+            self.rectStartIndex = nodeIndex
+
+            self.updateRectItem( nodeIndex )
 
     def mouseMoveEvent( self  ,
                         event ):
@@ -163,6 +829,8 @@ class View(QtWidgets.QGraphicsView):
 
         If clicked node was set as wall, it will start setting as walls
         where the mouse passes. same behaviour with blank nodes.
+        The brush is painted along the line from the node of the
+        previous event, with a single repaint per event.
 
         Args:
             event (QTCore.QEvent).
@@ -170,23 +838,33 @@ class View(QtWidgets.QGraphicsView):
         Returns:
             None: No return value.
         '''
-        if self.currentMouseState == self.MOUSE_DRAG_STATE:
+        if self.currentMouseState == self.MOUSE_PAN_STATE:
+
+            panOffset = event.pos() - self.lastPanPos
+            self.lastPanPos = event.pos()
+
+            self.panView( -panOffset.x() ,
+                          -panOffset.y() )
+            return
 
-            selectedNode = self.scene().itemAt( self.mapToScene( event.pos() )  ,
-                                                QtGui.QTransform()              )
+        nodeIndex = self.getNodeIndex( event )
 
-            if not isinstance( selectedNode , node.AANode ):
-                return
+        if nodeIndex is None:
+            return
 
-            if selectedNode in self.nodeHashesToSwitch:
-                return
+        if self.currentMouseState == self.MOUSE_RECT_STATE:
+            self.updateRectItem( nodeIndex )
+            return
 
-            if selectedNode.currentState == self.dragPaintWallsBool:
-                return
+        if nodeIndex == self.lastDragIndex:
+            return
 
-            selectedNode.switchWallState()
+        if self.currentMouseState == self.MOUSE_DRAG_STATE:
+            self.paintWalls( self.getStrokeIndices( nodeIndex ) ,
+                             self.dragPaintWallsBool            )
 
-            self.nodeHashesToSwitch.add( selectedNode )
+        if self.currentMouseState == self.MOUSE_COST_STATE:
+            self.paintCosts( self.getStrokeIndices( nodeIndex ) )
 
     def mouseReleaseEvent( self  ,
                            event ):
@@ -196,6 +874,7 @@ class View(QtWidgets.QGraphicsView):
 
         If clicked node was set as wall, it will start setting as walls
         where the mouse passes. same behaviour with blank nodes.
+        Releasing the right button fills the dragged rectangle.
 
         Args:
             event (QTCore.QEvent).
@@ -203,15 +882,35 @@ class View(QtWidgets.QGraphicsView):
         Returns:
             None: No return value.
         '''
+        if self.currentMouseState == self.MOUSE_RECT_STATE:
+
+            self.scene().removeItem( self.rectItem )
+            self.rectItem = None
+
+            nodeIndex = self.getNodeIndex( event )
+
+            if nodeIndex is not None:
+                self.paintWalls( self.grid.model.getRectIndices( self.rectStartIndex ,
+                                                                 nodeIndex           ) ,
+                                 self.dragPaintWallsBool                                )
+
         self.currentMouseState = None
 
-        self.nodeHashesToSwitch.clear()
+        self.lastPanPos = None
+
+        self.lastDragIndex  = None
+        self.rectStartIndex = None
 
     def keyPressEvent( self  ,
                        event ):
         '''
         Event to execute when any key is pressed.
-        Will handle the start and reset of the pathfinding.
+        Will handle the start of the pathfinding and its reset with
+        Escape, the search algorithm to use, the speed of its display,
+        live replanning while editing walls, the flow field heatmap,
+        the search statistics, the terrain cost to paint, the brush size,
+        flood filling, generating maps, saving and opening grid files
+        and panning the view with the arrow keys.
 
         Args:
             event (QTCore.QEvent).
@@ -220,9 +919,98 @@ class View(QtWidgets.QGraphicsView):
             None: No return value.
         '''
         if event.key() == QtCore.Qt.Key_Control:
-            self.grid.reset()
-            pathfinding.AAPathFinder( self.grid ,
-                                      self      )
+            self.cancelSearch()
+            self.updateNodes( self.grid.reset() )
+
+            if self.instrumentation:
+                self.instrumentation.reset()
+
+            self.pathFinder = pathfinding.AAPathFinder( self.grid                                  ,
+                                                        self                                       ,
+                                                        self.pathSearches[ self.searchClassIndex ] ,
+                                                        self.instrumentation                       ,
+                                                        self.pathCache                             )
+
+        if event.key() == QtCore.Qt.Key_Escape:
+            self.cancelSearch()
+            self.updateNodes( self.grid.reset() )
+            self.setStatusMessage( '' )
+
+        if event.key() == QtCore.Qt.Key_Tab:
+            self.searchClassIndex = ( self.searchClassIndex + 1 ) % len( pathfinding.SEARCH_CLASSES )
+            self.updateWindowTitle()
+
+            # Multi target searches take any amount of goals, the first
+            # one being the start.
+            self.cancelRunningSearch()
+            self.updateNodes( self.grid.setMaxGoals( None if pathfinding.SEARCH_CLASSES[ self.searchClassIndex ].MULTI_TARGET_BOOL else 2 ) )
+
+        if QtCore.Qt.Key_1 <= event.key() <= QtCore.Qt.Key_9:
+            self.paintCostInt = event.key() - QtCore.Qt.Key_0
+            self.setStatusMessage( 'Terrain cost {0}, Shift + drag to paint it, Escape to clear the path.'.format( self.paintCostInt ) )
+
+        if event.key() in ( QtCore.Qt.Key_BracketLeft , QtCore.Qt.Key_BracketRight ):
+            self.brushSizeInt = max( 1 , min( self.MAX_BRUSH_SIZE_INT ,
+                                              self.brushSizeInt + ( 1 if event.key() == QtCore.Qt.Key_BracketRight else -1 ) ) )
+            self.setStatusMessage( 'Brush size {0}.'.format( self.brushSizeInt ) )
+
+        if event.key() == QtCore.Qt.Key_B:
+            self.fillRegion()
+
+        if event.key() == QtCore.Qt.Key_F:
+            self.toggleFlowField()
+
+        if event.key() == QtCore.Qt.Key_G:
+            self.generateGrid()
+
+        if event.key() == QtCore.Qt.Key_I:
+            self.instrumentation = None if self.instrumentation else instrumentation.AASearchInstrumentation()
+            self.setStatusMessage( 'Search statistics {0}.'.format( 'on' if self.instrumentation else 'off' ) )
+
+        if event.key() == QtCore.Qt.Key_S:
+            pathStr , _ = QtWidgets.QFileDialog.getSaveFileName( self                  ,
+                                                                 'Save grid'           ,
+                                                                 ''                    ,
+                                                                 self.GRID_FILE_FILTER )
+            if pathStr:
+                self.saveGrid( pathStr )
+
+        if event.key() == QtCore.Qt.Key_O:
+            pathStr , _ = QtWidgets.QFileDialog.getOpenFileName( self                 ,
+                                                                 'Open grid'          ,
+                                                                 ''                   ,
+                                                                 self.MAP_FILE_FILTER )
+            if pathStr:
+                self.loadGrid( pathStr )
+
+        if event.key() == QtCore.Qt.Key_R:
+            self.liveReplanBool = not self.liveReplanBool
+            self.updateWindowTitle()
+            self.replanPath()
+
+        if event.key() in ( QtCore.Qt.Key_Plus , QtCore.Qt.Key_Equal ):
+            self.scheduler.changeSpeed( 1 )
+
+        if event.key() == QtCore.Qt.Key_Minus:
+            self.scheduler.changeSpeed( -1 )
+
+        if event.key() in self.PAN_KEYS_MAPPING:
+            directionX , directionY = self.PAN_KEYS_MAPPING[ event.key() ]
+            self.panView( directionX * self.PAN_STEP_INT ,
+                          directionY * self.PAN_STEP_INT )
+
+    def closeEvent( self  ,
+                    event ):
+        '''
+        Event to execute when the view is closed,
+        stops the search thread if still running.
+
+        Args:
+            event (QTCore.QEvent).
+
+        Returns:
+            None: No return value.
+        '''
+        self.cancelSearch()
 
-        if event.key() == QtCore.Qt.Key_Shift:
-            self.grid.reset()
+        super( View , self ).closeEvent( event )
@@ -0,0 +1,119 @@
+import time
+
+from PyQt5 import QtCore
+
+class AASearchThread(QtCore.QThread):
+
+    # Emitted with a list of the explored indices of each expansion
+    # done since the previous emission.
+    exploredBatchReady = QtCore.pyqtSignal( object )
+
+    # Emitted with the search.AASearchResult once the search is over.
+    searchFinished     = QtCore.pyqtSignal( object )
+
+    # Seconds to gather explored cells before sending them.
+    # type: float
+    BATCH_INTERVAL_FLOAT = 1.0 / 60
+
+    def __init__( self          ,
+                  inPathSearch  ,
+                  inStartIndex  ,
+                  inEndIndex    ,
+                  parent = None ):
+        '''
+        Thread running a search on a grid model, streaming the
+        explored cells while the search goes on.
+
+        Args:
+            inPathSearch (search.AAAStarSearch): Search algorithm to run,
+                                                 one of the classes of
+                                                 pathfinding.SEARCH_CLASSES.
+
+            inStartIndex (int): Index of the cell to start from.
+
+            inEndIndex (int|list[int]): Index of the cell to reach, indices
+                                        of the target cells for multi
+                                        target searches.
+
+            parent (QtCore.QObject|None): Parent of the thread.
+        '''
+        super( AASearchThread , self ).__init__( parent )
+
+        self.startIndex = inStartIndex
+        self.endIndex   = inEndIndex
+
+        self.pathSearch = inPathSearch
+
+        # Explored indices waiting to be sent.
+        # type: list[list[int]]
+        self.pendingExploredIndices = []
+
+        # Time the last batch was sent at.
+        # type: float
+        self.lastBatchTime = 0.0
+
+    def cancel( self ):
+        '''
+        Stop the search and wait for the thread to finish.
+
+        Returns:
+            None: No return value.
+        '''
+        self.pathSearch.cancel()
+        self.wait()
+
+    def run( self ):
+        '''
+        Reimplementation of run, execute the search in the thread.
+
+        Returns:
+            None: No return value.
+        '''
+        self.lastBatchTime = time.time()
+
+        if self.pathSearch.instrumentation:
+            result = self.pathSearch.instrumentation.runSearch( self.pathSearch         ,
+                                                                self.startIndex         ,
+                                                                self.endIndex           ,
+                                                                self.addExploredIndices )
+        else:
+            result = self.pathSearch.findPath( self.startIndex         ,
+                                               self.endIndex           ,
+                                               self.addExploredIndices )
+
+        self.sendExploredIndices()
+
+        self.searchFinished.emit( result )
+
+    def addExploredIndices( self              ,
+                            inExploredIndices ):
+        '''
+        Gather the explored indices of an expansion and send them
+        once enough time passed since the last batch.
+
+        Args:
+            inExploredIndices (list[int]): Indices explored by an expansion.
+
+        Returns:
+            None: No return value.
+        '''
+        self.pendingExploredIndices.append( inExploredIndices )
+
+        if time.time() - self.lastBatchTime >= self.BATCH_INTERVAL_FLOAT:
+            self.sendExploredIndices()
+
+    def sendExploredIndices( self ):
+        '''
+        Send the gathered explored indices.
+
+        Returns:
+            None: No return value.
+        '''
+        self.lastBatchTime = time.time()
+
+        if not self.pendingExploredIndices or self.pathSearch.cancelledBool:
+            return
+
+        self.exploredBatchReady.emit( self.pendingExploredIndices )
+
+        self.pendingExploredIndices = []